@@ -0,0 +1,189 @@
+"""
+Compares the streaming report parser used by `SynthReport.from_report_dir()`
+against the ElementTree DOM parser it replaced, and times bulk ingestion of
+a synthetic archive of run directories with `SynthReport.scan()`.
+
+Reports are generated with `synth_scaffold.testing.write_report_dir()`, with
+filler loops before the area estimates and RTL ports after them, as in real
+Vitis HLS reports. The DOM parser's time grows with the whole file; the
+streaming parser stops after the area estimates, so the ports cost it
+nothing.
+
+    python benchmarks/bench_report_parser.py
+"""
+
+import os
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from synth_scaffold.synth_scaffold import SynthReport, parse_latency_t, unwrap
+from synth_scaffold.testing import write_report_dir
+
+# (loops, ports) per module report
+SIZES = [(0, 0), (50, 200), (200, 2000), (500, 10000), (1000, 40000)]
+ARCHIVE_RUNS = 500
+ARCHIVE_SIZE = (50, 400)
+WORKER_COUNTS = [1, 2, 4]
+REPEATS = 3
+
+REPORT = SynthReport(
+    part="xczu9eg-ffvb1156-2-e",
+    flow_target="vivado",
+    module_name="gemm_bench",
+    clock_unit="ns",
+    target_clock_period=5.0,
+    target_clock_uncertainty=1.35,
+    achieved_clock_period=3.52,
+    latency_best_case=1234,
+    latency_average_case=1500,
+    latency_worst_case=2048,
+    latency_t_best_case=6.17e-06,
+    latency_t_average_case=7.5e-06,
+    latency_t_worst_case=1.024e-05,
+    resources_lut_used=5210,
+    resources_ff_used=4321,
+    resources_dsp_used=16,
+    resources_bram_used=4,
+    resources_uram_used=0,
+    resources_lut_available=274080,
+    resources_ff_available=548160,
+    resources_dsp_available=2520,
+    resources_bram_available=1824,
+    resources_uram_available=0,
+)
+
+
+def dom_from_report_dir(report_dir: Path) -> SynthReport:
+    # the parser `SynthReport.from_report_dir()` used before streaming
+    xml_csynth = ET.parse(report_dir / "csynth.xml").getroot()
+    instance = unwrap(xml_csynth.find(".//InstancesList/Instance"))
+    module_name = str(unwrap(instance.findtext("ModuleName")))
+
+    root = ET.parse(report_dir / f"{module_name}_csynth.xml").getroot()
+    user_assignments = unwrap(root.find(".//UserAssignments"))
+    performance_est = unwrap(root.find(".//PerformanceEstimates"))
+    timing = unwrap(performance_est.find("SummaryOfTimingAnalysis"))
+    latency = unwrap(performance_est.find("SummaryOfOverallLatency"))
+    area_estimates = unwrap(root.find(".//AreaEstimates"))
+    used = unwrap(area_estimates.find(".//Resources"))
+    available = unwrap(area_estimates.find(".//AvailableResources"))
+
+    def resources(element: ET.Element, kind: str) -> dict[str, int]:
+        return {
+            f"resources_{name.lower()}_{kind}": int(unwrap(element.findtext(tag)))
+            for name, tag in [
+                ("LUT", "LUT"),
+                ("FF", "FF"),
+                ("DSP", "DSP"),
+                ("BRAM", "BRAM_18K"),
+                ("URAM", "URAM"),
+            ]
+        }
+
+    return SynthReport(
+        part=str(unwrap(user_assignments.findtext("Part"))),
+        flow_target=str(unwrap(user_assignments.findtext("FlowTarget"))),
+        module_name=module_name,
+        clock_unit=str(unwrap(user_assignments.findtext("unit"))),
+        target_clock_period=float(
+            unwrap(user_assignments.findtext("TargetClockPeriod"))
+        ),
+        target_clock_uncertainty=float(
+            unwrap(user_assignments.findtext("ClockUncertainty"))
+        ),
+        achieved_clock_period=float(unwrap(timing.findtext("EstimatedClockPeriod"))),
+        latency_best_case=int(unwrap(latency.findtext("Best-caseLatency"))),
+        latency_average_case=int(unwrap(latency.findtext("Average-caseLatency"))),
+        latency_worst_case=int(unwrap(latency.findtext("Worst-caseLatency"))),
+        latency_t_best_case=parse_latency_t(
+            unwrap(latency.findtext("Best-caseRealTimeLatency"))
+        ),
+        latency_t_average_case=parse_latency_t(
+            unwrap(latency.findtext("Average-caseRealTimeLatency"))
+        ),
+        latency_t_worst_case=parse_latency_t(
+            unwrap(latency.findtext("Worst-caseRealTimeLatency"))
+        ),
+        **resources(used, "used"),
+        **resources(available, "available"),
+    )
+
+
+def time_best(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        t_start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t_start)
+    return best
+
+
+def bench_sizes(tmp_dir: Path) -> None:
+    print("Single report (best of 3)")
+    print(
+        f"{'loops':>6} {'ports':>6} {'size (KiB)':>11} {'dom (ms)':>10}"
+        f" {'stream (ms)':>12} {'speedup':>8}"
+    )
+    for n_loops, n_ports in SIZES:
+        report_dir = write_report_dir(
+            tmp_dir / f"size_{n_loops}_{n_ports}" / "syn" / "report",
+            REPORT,
+            n_loops=n_loops,
+            n_ports=n_ports,
+        )
+        size_kib = sum(fp.stat().st_size for fp in report_dir.iterdir()) / 1024
+        assert dom_from_report_dir(report_dir) == REPORT
+        assert SynthReport.from_report_dir(report_dir) == REPORT
+        t_dom = time_best(dom_from_report_dir, report_dir) * 1e3
+        t_stream = time_best(SynthReport.from_report_dir, report_dir) * 1e3
+        print(
+            f"{n_loops:>6} {n_ports:>6} {size_kib:>11.1f} {t_dom:>10.2f}"
+            f" {t_stream:>12.2f} {t_dom / t_stream:>7.1f}x"
+        )
+
+
+def bench_archive(tmp_dir: Path) -> None:
+    archive_dir = tmp_dir / "archive"
+    n_loops, n_ports = ARCHIVE_SIZE
+    for i in range(ARCHIVE_RUNS):
+        write_report_dir(
+            archive_dir / f"run_{i:05d}" / "proj" / "solution" / "syn" / "report",
+            REPORT,
+            n_loops=n_loops,
+            n_ports=n_ports,
+        )
+
+    def dom_scan() -> None:
+        for report_dir in sorted(archive_dir.glob("**/syn/report")):
+            dom_from_report_dir(report_dir)
+
+    print()
+    print(
+        f"Archive of {ARCHIVE_RUNS} runs ({n_loops} loops, {n_ports} ports each,"
+        f" {os.cpu_count()} CPUs)"
+    )
+    print(f"{'loader':>22} {'total (s)':>10} {'runs/s':>8}")
+    rows = [("dom, serial", dom_scan)]
+    for workers in WORKER_COUNTS:
+        rows.append(
+            (
+                f"scan(workers={workers})",
+                lambda w=workers: SynthReport.scan(archive_dir, workers=w),
+            )
+        )
+    assert all(r == REPORT for r in SynthReport.scan(archive_dir, workers=1).values())
+    for label, fn in rows:
+        t = time_best(fn)
+        print(f"{label:>22} {t:>10.2f} {ARCHIVE_RUNS / t:>8.0f}")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_sizes(Path(tmp))
+        bench_archive(Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
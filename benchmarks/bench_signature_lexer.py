@@ -0,0 +1,133 @@
+"""
+Compares the signature lexer used by `SynthScaffold.generate()` against the
+template regex it replaced, on synthetic headers of increasing size.
+
+For each header the target is the last function, which is the worst case
+for both approaches. The lexer's time per KiB stays flat both as the header
+grows and as identifiers get longer; the regex's time per KiB grows with
+identifier length because it retries its return-type group from every
+character of every identifier.
+
+    python benchmarks/bench_signature_lexer.py
+"""
+
+import re
+import time
+from pathlib import Path
+
+from synth_scaffold.lexer import find_function_signature
+
+SIZES = [25, 50, 100, 200, 400, 800]
+IDENT_LENS = [16, 32, 64, 128]
+IDENT_LEN_FUNCTIONS = 100
+REPEATS = 3
+
+
+def build_regex_pattern_from_func(function_name: str) -> re.Pattern:
+    # the pattern `SynthScaffold.generate()` used before the lexer
+    pattern = re.compile(
+        r"(?:template\s*<(?P<template_args>(?s:(?:(?!template).)+))>\s+)?"
+        r"(?P<ret_type>[a-zA-Z_]\w*(?:\s*[&*])*\s+)"
+        + re.escape(pattern=function_name)
+        + r"\s*\((?P<args>[^\)]*)\)",
+        re.MULTILINE,
+    )
+    return pattern
+
+
+def regex_search(source_txt: str, function_name: str) -> bool:
+    source_txt = "\n".join(
+        line for line in source_txt.splitlines() if not line.strip().startswith("//")
+    )
+    pattern = build_regex_pattern_from_func(function_name)
+    return pattern.search(source_txt) is not None
+
+
+def lexer_search(source_txt: str, function_name: str) -> bool:
+    return (
+        find_function_signature(source_txt, function_name, Path("bench.h")) is not None
+    )
+
+
+def synthetic_function(i: int, ident_len: int = 24) -> str:
+    # descriptive names of a few dozen characters are typical of HLS kernels
+    acc = "accumulator_" + "b" * max(0, ident_len - 12)
+    wgt = "weight_tile_" + "w" * max(0, ident_len - 12)
+    return f"""
+/*
+ * Block-parallel kernel number {i}.
+ */
+template <const int IN_SIZE, const int OUT_SIZE, const int BLOCK_SIZE = 1,
+          typename T, typename ACC_T = ap_fixed<32, 16>>
+void kernel_{i}(T input[IN_SIZE], T output[OUT_SIZE],
+                T {wgt}[OUT_SIZE][IN_SIZE]) {{
+#pragma HLS INLINE off
+#pragma HLS array_partition variable = input cyclic factor = BLOCK_SIZE dim = 1
+    // accumulate in a wider type
+    ACC_T {acc}[BLOCK_SIZE];
+    for (int i = 0; i < OUT_SIZE; i += BLOCK_SIZE) {{
+#pragma HLS PIPELINE
+        for (int j = 0; j < IN_SIZE; j++) {{
+            for (int k = 0; k < BLOCK_SIZE; k++) {{
+#pragma HLS unroll
+                {acc}[k] += {wgt}[i + k][j] * input[j];
+            }}
+        }}
+        for (int k = 0; k < BLOCK_SIZE; k++) {{
+            output[i + k] = T({acc}[k]);
+        }}
+    }}
+}}
+"""
+
+
+def time_search(search, source_txt: str, function_name: str) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        t_start = time.perf_counter()
+        found = search(source_txt, function_name)
+        best = min(best, time.perf_counter() - t_start)
+        assert found, f"{search.__name__} did not find {function_name}"
+    return best
+
+
+def print_header(label: str) -> None:
+    print(
+        f"{label:>12} {'size (KiB)':>11} {'regex (ms)':>11} {'regex (ms/KiB)':>15}"
+        f" {'lexer (ms)':>11} {'lexer (ms/KiB)':>15}"
+    )
+
+
+def print_row(label: int, source_txt: str, target: str) -> None:
+    size_kib = len(source_txt) / 1024
+    t_regex = time_search(regex_search, source_txt, target) * 1e3
+    t_lexer = time_search(lexer_search, source_txt, target) * 1e3
+    print(
+        f"{label:>12} {size_kib:>11.1f} {t_regex:>11.2f} {t_regex / size_kib:>15.4f}"
+        f" {t_lexer:>11.2f} {t_lexer / size_kib:>15.4f}"
+    )
+
+
+def main() -> None:
+    print("Header size scaling (identifiers of 24 characters)")
+    print_header("functions")
+    for n_functions in SIZES:
+        source_txt = "#pragma once\n" + "".join(
+            synthetic_function(i) for i in range(n_functions)
+        )
+        print_row(n_functions, source_txt, f"kernel_{n_functions - 1}")
+
+    # the regex retries `[a-zA-Z_]\w*` from every character of every
+    # identifier, which is quadratic in identifier length
+    print()
+    print(f"Identifier length scaling ({IDENT_LEN_FUNCTIONS} functions)")
+    print_header("ident len")
+    for ident_len in IDENT_LENS:
+        source_txt = "#pragma once\n" + "".join(
+            synthetic_function(i, ident_len) for i in range(IDENT_LEN_FUNCTIONS)
+        )
+        print_row(ident_len, source_txt, f"kernel_{IDENT_LEN_FUNCTIONS - 1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Times `ResultStore` queries on a database of synthetic runs: the best
+latency of one target under a LUT budget, the same restricted to a template
+argument value, and a lookup by config key.
+
+    python benchmarks/bench_store.py
+"""
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from synth_scaffold.store import ResultStore
+from synth_scaffold.synth_scaffold import RunInfo, SynthReport, config_key
+
+N_RUNS = 100_000
+N_TARGETS = 20
+BLOCKS = [1, 2, 4, 8, 16, 32]
+DATA_TYPES = ["float", "double", "ap_fixed<16, 8>", "ap_fixed<32, 16>"]
+REPEATS = 20
+
+
+def synthetic_run(rng: random.Random, i: int) -> tuple[dict, SynthReport, RunInfo]:
+    target_fn = f"kernel_{i % N_TARGETS}"
+    block_in, block_out = rng.choice(BLOCKS), rng.choice(BLOCKS)
+    config = {
+        "output_dir": f"/runs/{i}",
+        "target_fn": target_fn,
+        "template_args": {
+            "IN_SIZE": str(rng.choice([64, 128, 256])),
+            "BLOCK_SIZE_IN_": block_in,
+            "BLOCK_SIZE_OUT_": block_out,
+            "T": rng.choice(DATA_TYPES),
+        },
+        "defines": {},
+        "part": "xczu9eg-ffvb1156-2-e",
+        "clock_period": rng.choice([3.33, 5.0]),
+        "unsafe_math": False,
+    }
+    latency = int(200_000 / (block_in * block_out) * rng.uniform(0.8, 1.2)) + 10
+    lut = int(300 * block_in * block_out * rng.uniform(0.8, 1.2))
+    report = SynthReport(
+        part="xczu9eg-ffvb1156-2-e",
+        flow_target="vivado",
+        module_name=target_fn,
+        clock_unit="ns",
+        target_clock_period=config["clock_period"],
+        target_clock_uncertainty=1.35,
+        achieved_clock_period=3.2,
+        latency_worst_case=latency,
+        latency_average_case=latency,
+        latency_best_case=latency,
+        latency_t_worst_case=latency * 5e-9,
+        latency_t_average_case=latency * 5e-9,
+        latency_t_best_case=latency * 5e-9,
+        resources_lut_used=lut,
+        resources_ff_used=lut,
+        resources_dsp_used=block_in * block_out,
+        resources_bram_used=4,
+        resources_uram_used=0,
+        resources_lut_available=274080,
+        resources_ff_available=548160,
+        resources_dsp_available=2520,
+        resources_bram_available=1824,
+        resources_uram_available=0,
+    )
+    return config, report, RunInfo(0, rng.uniform(60, 600))
+
+
+def time_best(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        t_start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t_start)
+    return best
+
+
+def main() -> None:
+    rng = random.Random(0)
+    runs = [synthetic_run(rng, i) for i in range(N_RUNS)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(Path(tmp) / "results.db")
+        t_start = time.perf_counter()
+        store.add_many((c, r, i, "2024.1") for c, r, i in runs)
+        t_insert = time.perf_counter() - t_start
+        print(f"Inserted {N_RUNS} runs in {t_insert:.1f} s")
+
+        key = config_key(runs[N_RUNS // 2][0])
+        queries = [
+            (
+                "best latency, LUT <= 5000",
+                lambda: store.best("kernel_3", max_values={"resources_lut_used": 5000}),
+            ),
+            (
+                "... and T = float",
+                lambda: store.best(
+                    "kernel_3",
+                    params={"T": "float"},
+                    max_values={"resources_lut_used": 5000},
+                ),
+            ),
+            (
+                "lowest LUT, latency <= 1e-4 s",
+                lambda: store.best(
+                    "kernel_3",
+                    metric="resources_lut_used",
+                    max_values={"latency_t_computed_average_case": 1e-4},
+                ),
+            ),
+            (
+                "by config key",
+                lambda: (
+                    store.connection()
+                    .execute("SELECT id FROM runs WHERE config_key = ?", [key])
+                    .fetchall()
+                ),
+            ),
+        ]
+        print(f"{'query':>32} {'time (ms)':>10}")
+        for label, query in queries:
+            print(f"{label:>32} {time_best(query) * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
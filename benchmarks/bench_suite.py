@@ -0,0 +1,251 @@
+"""
+Benchmarks the Python side of SynthScaffold end to end with the stand-in
+`vitis_hls` of `synth_scaffold.fake_vitis_hls`, so it runs without a Vitis
+install:
+
+- `generate()` throughput on scaffolds of a small templated kernel
+- `SynthReport.scan()` throughput on an archive of fake-tool reports
+- `sweep()` scheduling efficiency at increasing job counts: the fraction of
+  the workers' wall time spent inside the tool, and the overhead per job,
+  taken from the sweep's Chrome trace
+
+Results are saved as JSON named after the current commit, and a previous
+results file can be passed to `--compare` to print the change.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --jobs 1 10 100 1000 10000 --workers 8
+    python benchmarks/bench_suite.py --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from synth_scaffold import fake_vitis_hls
+from synth_scaffold.fake_vitis_hls import fake_report
+from synth_scaffold.sweep import sweep
+from synth_scaffold.synth_scaffold import SynthReport, SynthScaffold
+from synth_scaffold.testing import write_report_dir
+
+DIR_RESULTS = Path(__file__).parent / "results"
+
+KERNEL_H = """\
+#pragma once
+
+template <int N, typename T>
+void scale_kernel(T in[N], T out[N]) {
+#pragma HLS INLINE off
+    for (int i = 0; i < N; i++) {
+#pragma HLS PIPELINE II=1
+        out[i] = in[i] * T(2);
+    }
+}
+"""
+
+N_GENERATE = 200
+N_ARCHIVE = 500
+REPEATS = 3
+
+
+def current_commit() -> str:
+    try:
+        p = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return p.stdout.strip()
+
+
+def base_config(source_fp: Path, output_dir: Path) -> dict:
+    return {
+        "input_source_files": [source_fp],
+        "includes": [f'"{source_fp.name}"'],
+        "output_dir": output_dir,
+        "target_fn": "scale_kernel",
+        "template_args": {"N": 64, "T": "float"},
+    }
+
+
+def bench_generate(tmp_dir: Path, source_fp: Path) -> dict:
+    scaffolds = [
+        SynthScaffold.from_config(
+            {
+                **base_config(source_fp, tmp_dir / "generate" / f"run_{i}"),
+                "template_args": {"N": 64 + i, "T": "float"},
+            }
+        )
+        for i in range(N_GENERATE)
+    ]
+    t_start = time.perf_counter()
+    for s in scaffolds:
+        s.generate()
+    t_first = time.perf_counter() - t_start
+
+    # again with every output already up to date
+    t_start = time.perf_counter()
+    for s in scaffolds:
+        s.generate()
+    t_again = time.perf_counter() - t_start
+    return {
+        "first_per_s": N_GENERATE / t_first,
+        "up_to_date_per_s": N_GENERATE / t_again,
+    }
+
+
+def bench_parse(tmp_dir: Path) -> dict:
+    archive_dir = tmp_dir / "archive"
+    rng = random.Random(0)
+    for i in range(N_ARCHIVE):
+        report = fake_report("scale_kernel", "xczu9eg-ffvb1156-2-e", 5.0, rng)
+        write_report_dir(
+            archive_dir / f"run_{i:05d}" / "proj" / "solution" / "syn" / "report",
+            report,
+            n_loops=20,
+            n_ports=200,
+        )
+    best = float("inf")
+    for _ in range(REPEATS):
+        t_start = time.perf_counter()
+        reports = SynthReport.scan(archive_dir, workers=1)
+        best = min(best, time.perf_counter() - t_start)
+    assert all(r is not None for r in reports.values())
+    return {"reports_per_s": N_ARCHIVE / best}
+
+
+def bench_sweep(tmp_dir: Path, source_fp: Path, n_jobs: int, workers: int) -> dict:
+    runs_dir = tmp_dir / f"sweep_{n_jobs}"
+    trace_fp = tmp_dir / f"sweep_{n_jobs}_trace.json"
+    design_space = {"N": list(range(1, n_jobs + 1)), "T": ["float"]}
+
+    t_start = time.perf_counter()
+    n_ok = sum(
+        report is not None
+        for _, report in sweep(
+            base_config(source_fp, runs_dir),
+            design_space,
+            max_workers=workers,
+            trace_fp=trace_fp,
+        )
+    )
+    wall_s = time.perf_counter() - t_start
+
+    events = json.loads(trace_fp.read_text())["traceEvents"]
+    tool_s = sum(e["dur"] for e in events if e["name"] == "vitis_hls") / 1e6
+    job_s = sum(e["dur"] for e in events if e["name"] == "job") / 1e6
+    capacity_s = wall_s * min(workers, n_jobs)
+    return {
+        "jobs_ok": n_ok,
+        "wall_s": wall_s,
+        "jobs_per_s": n_jobs / wall_s,
+        "tool_efficiency": tool_s / capacity_s,
+        "worker_efficiency": job_s / capacity_s,
+        "overhead_per_job_ms": (capacity_s - tool_s) / n_jobs * 1e3,
+    }
+
+
+def print_results(results: dict, baseline: dict | None) -> None:
+    def rows(prefix: str, values: dict):
+        for name, value in values.items():
+            if isinstance(value, dict):
+                yield from rows(f"{prefix}{name}.", value)
+            else:
+                yield f"{prefix}{name}", value
+
+    baseline_rows = dict(rows("", baseline["results"])) if baseline else {}
+    header = f"{'metric':>40} {'value':>12}"
+    if baseline:
+        header += f" {'baseline':>12} {'change':>8}"
+    print(header)
+    for name, value in rows("", results["results"]):
+        line = f"{name:>40} {value:>12.4g}"
+        old = baseline_rows.get(name)
+        if old is not None:
+            change = f"{value / old:.2f}x" if old else "-"
+            line += f" {old:>12.4g} {change:>8}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="Sweep sizes to measure",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Sweep workers (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--runtime",
+        default="uniform:0.02,0.1",
+        help="Fake tool runtime per job, as for FAKE_VITIS_HLS_RUNTIME",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help="Results file (default: benchmarks/results/<commit>.json)",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        default=None,
+        help="Results file of an earlier commit to compare against",
+    )
+    args = parser.parse_args()
+
+    commit = current_commit()
+    results: dict = {
+        "commit": commit,
+        "date": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "workers": args.workers,
+        "runtime": args.runtime,
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        bin_dir = tmp_dir / "bin"
+        fake_vitis_hls.install(bin_dir)
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+        os.environ["FAKE_VITIS_HLS_RUNTIME"] = args.runtime
+        source_fp = tmp_dir / "sources" / "kernel.h"
+        source_fp.parent.mkdir()
+        source_fp.write_text(KERNEL_H)
+
+        results["results"]["generate"] = bench_generate(tmp_dir, source_fp)
+        results["results"]["parse"] = bench_parse(tmp_dir)
+        results["results"]["sweep"] = {
+            str(n_jobs): bench_sweep(tmp_dir, source_fp, n_jobs, args.workers)
+            for n_jobs in args.jobs
+        }
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(results, baseline)
+
+    out_fp = args.out or DIR_RESULTS / f"{commit}.json"
+    out_fp.parent.mkdir(parents=True, exist_ok=True)
+    out_fp.write_text(json.dumps(results, indent=4))
+    print(f"Saved: {out_fp}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,52 @@
-from .synth_scaffold import SynthReport, SynthScaffold, unwrap
+from .batch import run_batch
+from .cache import CacheStats, SynthCache
+from .hierarchy import ReportTree
+from .search import (
+    Objective,
+    RandomSearch,
+    SuccessiveHalving,
+    TPESearch,
+    search,
+)
+from .single_flight import SingleFlight
+from .source_index import SourceIndex
+from .store import ResultStore
+from .surrogate import SurrogateModel
+from .sweep import expand_design_space, sweep
+from .synth_scaffold import (
+    FunctionSignature,
+    SynthReport,
+    SynthScaffold,
+    canonical_config,
+    config_key,
+    unwrap,
+)
+from .table import ReportTable
+from .workers import HlsWorkerPool, WorkerStats
 
-__all__ = ["SynthReport", "SynthScaffold", "unwrap"]
+__all__ = [
+    "CacheStats",
+    "FunctionSignature",
+    "HlsWorkerPool",
+    "Objective",
+    "RandomSearch",
+    "ReportTable",
+    "ReportTree",
+    "ResultStore",
+    "SingleFlight",
+    "SourceIndex",
+    "SuccessiveHalving",
+    "SurrogateModel",
+    "SynthCache",
+    "SynthReport",
+    "SynthScaffold",
+    "TPESearch",
+    "WorkerStats",
+    "canonical_config",
+    "config_key",
+    "expand_design_space",
+    "run_batch",
+    "search",
+    "sweep",
+    "unwrap",
+]
@@ -0,0 +1,149 @@
+"""
+Compressed archives of run directories. A directory `d` is replaced by a
+zip file `d.zip` next to it, and files that were under `d` can still be
+found and read through the paths they had, which is how reports stay
+readable after a run has been archived.
+"""
+
+import os
+import shutil
+import zipfile
+from pathlib import Path
+from typing import IO
+
+ARCHIVE_SUFFIX = ".zip"
+
+
+def archive_path(dir_path: Path) -> Path:
+    """
+    Where `archive_dir()` puts the archive of `dir_path`.
+    """
+    return dir_path.with_name(dir_path.name + ARCHIVE_SUFFIX)
+
+
+def find_archive(fp: Path) -> tuple[Path, str] | None:
+    """
+    The archive that took the place of `fp` or of one of the directories
+    above it, and the member name `fp` has in it, or `None` if there is
+    none.
+    """
+    for path in [fp, *fp.parents]:
+        if not path.name:
+            break
+        archive_fp = archive_path(path)
+        if archive_fp.is_file():
+            return archive_fp, fp.relative_to(path.parent).as_posix()
+    return None
+
+
+def path_exists(fp: Path) -> bool:
+    """
+    Whether `fp` exists on disk or in an archive of a directory above it.
+    """
+    if fp.exists():
+        return True
+    found = find_archive(fp)
+    if found is None:
+        return False
+    archive_fp, member = found
+    try:
+        with zipfile.ZipFile(archive_fp) as zf:
+            zf.getinfo(member)
+    except (KeyError, zipfile.BadZipFile):
+        return False
+    return True
+
+
+def open_path(fp: Path) -> IO[bytes]:
+    """
+    Opens the file `fp` for reading in binary mode, from the archive of a
+    directory above it if it is not on disk. Raises `FileNotFoundError` if
+    it is in neither.
+    """
+    try:
+        return open(fp, "rb")
+    except FileNotFoundError:
+        found = find_archive(fp)
+        if found is None:
+            raise
+    archive_fp, member = found
+    # the member stays readable after the archive is closed
+    with zipfile.ZipFile(archive_fp) as zf:
+        try:
+            return zf.open(member)
+        except KeyError:
+            raise FileNotFoundError(f"File {fp} does not exist") from None
+
+
+def list_files(dir_path: Path) -> list[str]:
+    """
+    Names of the files directly in `dir_path`, on disk or in the archive of
+    it or a directory above it, in sorted order.
+    """
+    if dir_path.is_dir():
+        return sorted(e.name for e in os.scandir(dir_path) if e.is_file())
+    found = find_archive(dir_path)
+    if found is None:
+        return []
+    archive_fp, member = found
+    prefix = member + "/"
+    with zipfile.ZipFile(archive_fp) as zf:
+        names = [
+            name.removeprefix(prefix)
+            for name in zf.namelist()
+            if name.startswith(prefix) and not name.endswith("/")
+        ]
+    return sorted(name for name in names if "/" not in name)
+
+
+def archive_dir(dir_path: Path) -> Path:
+    """
+    Replaces `dir_path` by a compressed archive of it and returns the
+    archive's path. Members are named relative to the directory's parent.
+    The archive is complete on disk before the directory is removed.
+    """
+    archive_fp = archive_path(dir_path)
+    archive_fp_tmp = archive_fp.with_suffix(f".tmp.{os.getpid()}")
+    with zipfile.ZipFile(archive_fp_tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+        for root, _, file_names in os.walk(dir_path):
+            for name in sorted(file_names):
+                fp = Path(root) / name
+                if not fp.is_symlink():
+                    zf.write(fp, fp.relative_to(dir_path.parent).as_posix())
+    os.replace(archive_fp_tmp, archive_fp)
+    shutil.rmtree(dir_path)
+    return archive_fp
+
+
+def unarchive_paths(archive_fp: Path, paths: list[Path]) -> None:
+    """
+    Extracts the files and directories at `paths` (relative to the
+    archive's parent directory) from `archive_fp` back to disk and removes
+    the archive.
+    """
+    prefixes = [p.as_posix() for p in paths]
+    with zipfile.ZipFile(archive_fp) as zf:
+        members = [
+            name
+            for name in zf.namelist()
+            if any(name == p or name.startswith(p + "/") for p in prefixes)
+        ]
+        zf.extractall(archive_fp.parent, members)
+    archive_fp.unlink()
+
+
+def archived_dirs(archive_fp: Path, file_name: str) -> list[Path]:
+    """
+    The directories in `archive_fp` that contain a file called `file_name`,
+    as the paths they had on disk.
+    """
+    try:
+        with zipfile.ZipFile(archive_fp) as zf:
+            names = zf.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return []
+    return sorted(
+        archive_fp.parent / name.removesuffix(file_name).rstrip("/")
+        for name in names
+        if name == file_name or name.endswith("/" + file_name)
+    )
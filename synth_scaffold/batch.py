@@ -0,0 +1,159 @@
+import contextlib
+import re
+import subprocess
+import textwrap
+from pathlib import Path
+
+from .precheck import precheck_all
+from .resources import RssSampler, kill_process_group
+from .synth_scaffold import RunInfo, SynthReport, SynthScaffold, vitis_hls_args
+
+BATCH_MARKER = "SYNTH_SCAFFOLD_BATCH"
+RE_BATCH_MARKER = re.compile(
+    rf"{BATCH_MARKER} (?P<index>\d+) (?P<status>ok|error) (?P<runtime_ms>\d+)"
+)
+
+
+def job_tcl_commands(s: SynthScaffold, index: int, work_dir: Path | None = None) -> str:
+    """
+    TCL commands that synthesize one scaffold in its own project inside
+    `work_dir` (by default its `output_dir`), without exiting the tool.
+
+    The commands run inside `catch`, so a failing config does not take down
+    the session. Afterwards a marker line with `index`, the status and the
+    runtime in milliseconds is printed and flushed.
+    """
+    tcl_script_txt = ""
+    if work_dir is None:
+        work_dir = s.output_dir
+    tcl_script_txt += f"cd {{{work_dir.resolve()}}}\n"
+    tcl_script_txt += "set t_start [clock milliseconds]\n"
+    tcl_script_txt += "if {[catch {\n"
+    tcl_script_txt += textwrap.indent(s.tcl_commands().strip() + "\n", " " * 4)
+    tcl_script_txt += "} err]} {\n"
+    tcl_script_txt += '    puts "ERROR: $err"\n'
+    tcl_script_txt += "    set status error\n"
+    tcl_script_txt += "} else {\n"
+    tcl_script_txt += "    set status ok\n"
+    tcl_script_txt += "}\n"
+    tcl_script_txt += "catch {close_project}\n"
+    tcl_script_txt += (
+        f'puts "{BATCH_MARKER} {index} $status '
+        '[expr {[clock milliseconds] - $t_start}]"\n'
+    )
+    tcl_script_txt += "flush stdout\n"
+    return tcl_script_txt
+
+
+def batch_tcl_script(
+    scaffolds: list[SynthScaffold], work_dirs: list[Path] | None = None
+) -> str:
+    """
+    One TCL script that synthesizes every scaffold in turn with
+    `job_tcl_commands()`, in its entry of `work_dirs` if given, and then
+    exits.
+    """
+    tcl_script_txt = ""
+    for i, s in enumerate(scaffolds):
+        work_dir = work_dirs[i] if work_dirs is not None else None
+        tcl_script_txt += job_tcl_commands(s, i, work_dir)
+        tcl_script_txt += "\n\n"
+    tcl_script_txt += "exit\n"
+    return tcl_script_txt
+
+
+def run_batch(
+    scaffolds: list[SynthScaffold], batch_dir: Path, verbose: bool = False
+) -> list[SynthReport | None]:
+    """
+    Synthesizes many generated scaffolds in a single `vitis_hls` invocation
+    so that tool startup, part loading and license checkout are paid once
+    instead of once per config. Returns one report per scaffold, in order.
+
+    Scaffolds with an up-to-date report or a cache hit are not run, and
+    neither are scaffolds that fail their `precheck`, which are all compiled
+    in parallel before the tool starts. The batch script and the combined
+    log are written to `batch_dir`. Each scaffold's `last_run` gets its own
+    runtime, excluding tool startup, and a return code of 0 or 1 depending
+    on whether its config failed; configs that never ran because the tool
+    died get the tool's return code.
+
+    Scaffolds with a `scratch_dir` are synthesized there as in `run()`. As
+    in `run()`, the tool runs in its own session and is killed if the batch
+    is interrupted.
+    """
+    reports: list[SynthReport | None] = [None] * len(scaffolds)
+    cache_keys: dict[int, str | None] = {}
+    for i, s in enumerate(scaffolds):
+        cache_key, report = s._reuse_result(verbose=verbose)
+        if report is not None:
+            reports[i] = report
+        else:
+            cache_keys[i] = cache_key
+
+    to_run = []
+    precheck_results = precheck_all([scaffolds[i] for i in cache_keys])
+    for i, result in zip(cache_keys, precheck_results):
+        if result is not None:
+            scaffolds[i]._record_precheck(result)
+        if result is None or result.passed:
+            to_run.append(i)
+    if not to_run:
+        return reports
+
+    args = vitis_hls_args("batch.tcl", "batch.log")
+    for i in to_run:
+        scaffolds[i]._clear_project()
+
+    with contextlib.ExitStack() as work_dirs_stack:
+        # reports and logs are copied back from scratch directories when
+        # the stack closes, before they are collected
+        work_dirs = [
+            work_dirs_stack.enter_context(scaffolds[i]._work_dir()) for i in to_run
+        ]
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        (batch_dir / "batch.tcl").write_text(
+            batch_tcl_script([scaffolds[i] for i in to_run], work_dirs)
+        )
+
+        p = subprocess.Popen(
+            args,
+            cwd=batch_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=-1,
+            start_new_session=True,
+        )
+        with RssSampler(p.pid) as rss_sampler:
+            try:
+                stdout, _ = p.communicate()
+            except BaseException:
+                # e.g. Ctrl-C: the tool runs in its own session, so it would
+                # outlive us and keep writing into the output directories
+                kill_process_group(p.pid)
+                p.wait()
+                raise
+
+    outcomes: dict[int, tuple[int, float]] = {}
+    for m in RE_BATCH_MARKER.finditer(stdout.decode(errors="replace")):
+        returncode = 0 if m.group("status") == "ok" else 1
+        outcomes[int(m.group("index"))] = (
+            returncode,
+            int(m.group("runtime_ms")) / 1000,
+        )
+
+    if verbose:
+        print(f"Batch Return Code: {p.returncode}")
+        print(f"Batch Log Path: {batch_dir / 'batch.log'}")
+
+    for j, i in enumerate(to_run):
+        returncode, runtime_s = outcomes.get(j, (p.returncode, 0.0))
+        s = scaffolds[i]
+        s.last_run = RunInfo(
+            returncode=returncode,
+            runtime_s=runtime_s,
+            peak_rss_bytes=rss_sampler.peak_rss_bytes,
+        )
+        reports[i] = s._collect_report(cache_keys[i], verbose=verbose)
+
+    return reports
@@ -0,0 +1,182 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .synth_scaffold import SynthReport
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    seconds_saved: float
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        if total == 0:
+            return None
+        return self.hits / total
+
+    def text_summary(self) -> str:
+        txt = ""
+        txt += f"Hits: {self.hits}\n"
+        txt += f"Misses: {self.misses}\n"
+        if self.hit_rate is not None:
+            txt += f"Hit Rate: {self.hit_rate:.2%}\n"
+        else:
+            txt += "Hit Rate: N/A\n"
+        txt += f"Seconds Saved: {self.seconds_saved:.1f} s\n"
+        txt += f"Entries: {self.entries}\n"
+        txt += f"Size: {self.size_bytes} bytes\n"
+        return txt
+
+
+class SynthCache:
+    """
+    Persistent, content-addressed store of synthesis results.
+
+    Entries are keyed by `SynthScaffold.cache_key()`, a hash over everything
+    that affects synthesis, and hold the `SynthReport` together with the wall
+    time the original run took. Hits and misses are appended to an event log
+    so that statistics survive across processes and sessions.
+
+    Eviction is least-recently-used: a hit refreshes the entry's mtime, and
+    `evict()` drops entries unused for longer than `max_age_s` and then the
+    stalest entries until the cache fits in `max_size_bytes`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_size_bytes: int | None = None,
+        max_age_s: float | None = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.max_age_s = max_age_s
+
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def entries_dir(self) -> Path:
+        return self.cache_dir / "entries"
+
+    @property
+    def events_fp(self) -> Path:
+        return self.cache_dir / "events.log"
+
+    def entry_fp(self, key: str) -> Path:
+        return self.entries_dir / key[:2] / f"{key}.json"
+
+    def _log_event(self, event: str, seconds: float = 0.0) -> None:
+        # O_APPEND writes of a single short line are atomic, so concurrent
+        # workers can share one log without locking
+        with self.events_fp.open("a") as f:
+            f.write(f"{event}\t{seconds}\n")
+
+    def get(self, key: str) -> SynthReport | None:
+        entry_fp = self.entry_fp(key)
+        try:
+            if (
+                self.max_age_s is not None
+                and time.time() - entry_fp.stat().st_mtime > self.max_age_s
+            ):
+                entry_fp.unlink(missing_ok=True)
+            entry = json.loads(entry_fp.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._log_event("miss")
+            return None
+
+        try:
+            os.utime(entry_fp)
+        except FileNotFoundError:
+            # evicted by another process since it was read; still a hit
+            pass
+        self._log_event("hit", float(entry["runtime_s"]))
+        return SynthReport.from_dict(entry["report"])
+
+    def put(self, key: str, report: SynthReport, runtime_s: float) -> None:
+        entry = {
+            "key": key,
+            "created": time.time(),
+            "runtime_s": runtime_s,
+            "report": report.to_dict(),
+        }
+        entry_fp = self.entry_fp(key)
+        entry_fp.parent.mkdir(parents=True, exist_ok=True)
+        entry_fp_tmp = entry_fp.with_suffix(f".tmp.{os.getpid()}")
+        entry_fp_tmp.write_text(json.dumps(entry, indent=4))
+        os.replace(entry_fp_tmp, entry_fp)
+
+        self.evict()
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        entries = []
+        for fp in self.entries_dir.glob("*/*.json"):
+            try:
+                entries.append((fp, fp.stat()))
+            except FileNotFoundError:
+                # removed by a concurrent eviction
+                continue
+        return entries
+
+    def evict(self) -> int:
+        if self.max_age_s is None and self.max_size_bytes is None:
+            return 0
+
+        entries = sorted(self._entries(), key=lambda x: x[1].st_mtime)
+        n_evicted = 0
+
+        if self.max_age_s is not None:
+            now = time.time()
+            kept = []
+            for fp, st in entries:
+                if now - st.st_mtime > self.max_age_s:
+                    fp.unlink(missing_ok=True)
+                    n_evicted += 1
+                else:
+                    kept.append((fp, st))
+            entries = kept
+
+        if self.max_size_bytes is not None:
+            total_size = sum(st.st_size for _, st in entries)
+            for fp, st in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                fp.unlink(missing_ok=True)
+                total_size -= st.st_size
+                n_evicted += 1
+
+        return n_evicted
+
+    def clear(self) -> None:
+        for fp, _ in self._entries():
+            fp.unlink(missing_ok=True)
+        self.events_fp.unlink(missing_ok=True)
+
+    def stats(self) -> CacheStats:
+        hits = 0
+        misses = 0
+        seconds_saved = 0.0
+        if self.events_fp.exists():
+            for line in self.events_fp.read_text().splitlines():
+                event, _, seconds = line.partition("\t")
+                if event == "hit":
+                    hits += 1
+                    seconds_saved += float(seconds)
+                elif event == "miss":
+                    misses += 1
+
+        entries = self._entries()
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            seconds_saved=seconds_saved,
+            entries=len(entries),
+            size_bytes=sum(st.st_size for _, st in entries),
+        )
@@ -0,0 +1,328 @@
+"""
+A stand-in for `vitis_hls` that runs the TCL SynthScaffold generates without
+synthesizing anything, for tests and benchmarks of the Python side.
+
+It understands the commands of `SynthScaffold.tcl_commands()` and the
+`catch` blocks and markers of batch scripts and `-i` sessions. `csynth_design`
+prints the phase markers `PhaseMonitor` follows, sleeps, and writes a
+`csynth.xml`, a `<target>_csynth.xml` and an `autopilot.flow.log` whose
+metrics are a stable function of the scaffold, part and clock, so the same
+config always gets the same report.
+
+Set through environment variables:
+    FAKE_VITIS_HLS_RUNTIME: seconds per `csynth_design`, as a number,
+        "uniform:LOW,HIGH" or "lognormal:MEDIAN,SIGMA" (default: 0)
+    FAKE_VITIS_HLS_FAIL_RATE: fraction of configs that fail (default: 0)
+    FAKE_VITIS_HLS_LOOPS, FAKE_VITIS_HLS_PORTS: filler loops and RTL ports
+        per module report, to make reports as large as real ones
+        (default: 20 and 200)
+
+Runtimes and failures are drawn from a generator seeded by the config, so
+they are repeatable across runs.
+"""
+
+import hashlib
+import math
+import os
+import random
+import re
+import shlex
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from .monitor import PHASES
+from .synth_scaffold import SynthReport
+from .testing import write_report_dir
+
+# output lines matched by `monitor.PHASE_PATTERNS`, and the share of the
+# runtime spent in each phase
+PHASE_LINES = {
+    "elaboration": "INFO: [HLS 200-10] Analyzing design file '{source}' ...",
+    "transformation": "INFO: [HLS 200-111] Starting code transformations ...",
+    "scheduling": "INFO: [HLS 200-111] Starting scheduling ...",
+    "binding": "INFO: [HLS 200-111] Starting binding ...",
+    "rtl_generation": "INFO: [HLS 200-10] Generating RTL for module '{top}'",
+}
+PHASE_SHARES = {
+    "elaboration": 0.2,
+    "transformation": 0.2,
+    "scheduling": 0.3,
+    "binding": 0.2,
+    "rtl_generation": 0.1,
+}
+# command names written to autopilot.flow.log for each phase
+FLOW_LOG_COMMANDS = {
+    "elaboration": "elaborate",
+    "transformation": "transform",
+    "scheduling": "autosched",
+    "binding": "autobind",
+    "rtl_generation": "autoimpl",
+}
+
+# available resources of the default part
+AVAILABLE_RESOURCES = {"lut": 274080, "ff": 548160, "dsp": 2520, "bram": 1824}
+
+RE_CATCH_START = re.compile(r"^if \{\[catch \{$")
+RE_CATCH_END = re.compile(r"^\} (?P<var>\w+)\]\} \{$")
+
+# errors of a failing command, as TCL errors of the real tool: unsupported or
+# malformed commands, missing files and the failures drawn from the fail rate
+COMMAND_ERRORS = (ValueError, KeyError, IndexError, OSError, RuntimeError)
+
+
+def sample_runtime_s(spec: str, rng: random.Random) -> float:
+    """
+    A runtime in seconds drawn from `spec`: a number, "uniform:LOW,HIGH" or
+    "lognormal:MEDIAN,SIGMA".
+    """
+    kind, _, params_txt = spec.partition(":")
+    if not params_txt:
+        return float(kind)
+    params = [float(p) for p in params_txt.split(",")]
+    if kind == "uniform":
+        return rng.uniform(params[0], params[1])
+    if kind == "lognormal":
+        return rng.lognormvariate(math.log(params[0]), params[1])
+    raise ValueError(f"Unknown runtime distribution: {spec}")
+
+
+def fake_report(
+    module_name: str, part: str, clock_period: float, rng: random.Random
+) -> SynthReport:
+    latency = rng.randint(100, 100_000)
+    return SynthReport(
+        part=part,
+        flow_target="vivado",
+        module_name=module_name,
+        clock_unit="ns",
+        target_clock_period=clock_period,
+        target_clock_uncertainty=round(clock_period * 0.27, 2),
+        achieved_clock_period=round(clock_period * rng.uniform(0.5, 1.1), 3),
+        latency_best_case=latency,
+        latency_average_case=latency,
+        latency_worst_case=latency,
+        latency_t_best_case=latency * clock_period * 1e-9,
+        latency_t_average_case=latency * clock_period * 1e-9,
+        latency_t_worst_case=latency * clock_period * 1e-9,
+        resources_lut_used=rng.randint(100, 50_000),
+        resources_ff_used=rng.randint(100, 50_000),
+        resources_dsp_used=rng.randint(0, 200),
+        resources_bram_used=rng.randint(0, 100),
+        resources_uram_used=0,
+        resources_lut_available=AVAILABLE_RESOURCES["lut"],
+        resources_ff_available=AVAILABLE_RESOURCES["ff"],
+        resources_dsp_available=AVAILABLE_RESOURCES["dsp"],
+        resources_bram_available=AVAILABLE_RESOURCES["bram"],
+        resources_uram_available=0,
+    )
+
+
+class FakeSession:
+    """
+    The state of one fake tool session: the open project and solution and
+    the settings made so far.
+    """
+
+    def __init__(self, log_fp: Path | None = None) -> None:
+        self.log_fp = log_fp
+        self.project: str | None = None
+        self.solution: str | None = None
+        self.source_fps: list[Path] = []
+        self.top = "scaffold_fn"
+        self.target_fn: str | None = None
+        self.part = "xczu9eg-ffvb1156-2-e"
+        self.clock_period = 10.0
+        self.variables: dict[str, str] = {}
+
+        self.runtime_spec = os.environ.get("FAKE_VITIS_HLS_RUNTIME", "0")
+        self.fail_rate = float(os.environ.get("FAKE_VITIS_HLS_FAIL_RATE", "0"))
+        self.n_loops = int(os.environ.get("FAKE_VITIS_HLS_LOOPS", "20"))
+        self.n_ports = int(os.environ.get("FAKE_VITIS_HLS_PORTS", "200"))
+
+    def puts(self, line: str) -> None:
+        print(line, flush=True)
+        if self.log_fp is not None:
+            with self.log_fp.open("a") as f:
+                f.write(line + "\n")
+
+    def substitute(self, txt: str) -> str:
+        txt = re.sub(
+            r"\[expr \{\[clock milliseconds\] - \$(\w+)\}\]",
+            lambda m: str(int(time.time() * 1000) - int(self.variables[m.group(1)])),
+            txt,
+        )
+        return re.sub(r"\$(\w+)", lambda m: self.variables.get(m.group(1), ""), txt)
+
+    def execute(self, line: str) -> bool:
+        """
+        Runs one command. Returns `False` on `exit`.
+        """
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return True
+        if line.startswith("puts "):
+            self.puts(self.substitute(line.removeprefix("puts ").strip('"')))
+            return True
+        m = re.fullmatch(r"set (\w+) \[clock milliseconds\]", line)
+        if m is not None:
+            self.variables[m.group(1)] = str(int(time.time() * 1000))
+            return True
+
+        words = [w.strip("{}") for w in shlex.split(line)]
+        match words[0]:
+            case "exit":
+                return False
+            case "cd":
+                os.chdir(words[1])
+            case "open_project":
+                self.project = words[-1]
+                self.source_fps = []
+            case "add_files":
+                self.source_fps.append(Path(words[1]))
+            case "set_top":
+                self.top = words[1]
+            case "open_solution":
+                self.solution = words[-1]
+            case "set_part":
+                self.part = words[1]
+            case "create_clock":
+                self.clock_period = float(words[words.index("-period") + 1])
+            case "set_directive_inline":
+                self.target_fn = words[-1]
+            case "csynth_design":
+                self.csynth_design()
+            case "close_project":
+                self.project = None
+            case "set" | "flush" | "config_compile" | "catch":
+                pass
+            case _:
+                raise ValueError(f"Unsupported command: {words[0]}")
+        return True
+
+    def csynth_design(self) -> None:
+        if self.project is None or self.solution is None:
+            raise ValueError("csynth_design needs an open project and solution")
+        if not self.source_fps or not self.source_fps[0].exists():
+            raise FileNotFoundError("csynth_design needs an existing source file")
+
+        h = hashlib.sha256()
+        for fp in self.source_fps:
+            h.update(fp.read_bytes())
+        h.update(f"{self.part} {self.clock_period} {self.target_fn}".encode())
+        rng = random.Random(h.digest())
+        runtime_s = sample_runtime_s(self.runtime_spec, rng)
+        failed = rng.random() < self.fail_rate
+
+        solution_dir = Path(self.project) / self.solution
+        flow_log_txt = "Execute       csynth_design\n"
+        for phase in PHASES:
+            self.puts(
+                PHASE_LINES[phase].format(source=self.source_fps[0].name, top=self.top)
+            )
+            phase_s = runtime_s * PHASE_SHARES[phase]
+            time.sleep(phase_s)
+            command = FLOW_LOG_COMMANDS[phase]
+            flow_log_txt += f"Execute         {command}\n"
+            flow_log_txt += f"Command         {command} done; {phase_s:.2f} sec.\n"
+            if failed and phase == "scheduling":
+                raise RuntimeError(f"Fake scheduling failure of {self.target_fn}")
+        flow_log_txt += f"Command       csynth_design done; {runtime_s:.2f} sec.\n"
+
+        flow_log_fp = solution_dir / ".autopilot" / "db" / "autopilot.flow.log"
+        flow_log_fp.parent.mkdir(parents=True, exist_ok=True)
+        flow_log_fp.write_text(flow_log_txt)
+        report = fake_report(
+            self.target_fn or self.top, self.part, self.clock_period, rng
+        )
+        write_report_dir(
+            solution_dir / "syn" / "report",
+            report,
+            n_loops=self.n_loops,
+            n_ports=self.n_ports,
+        )
+        self.puts(f"INFO: [HLS 200-111] Finished synthesizing {report.module_name}")
+
+    def run(self, lines: Iterable[str]) -> int:
+        """
+        Runs a script or an interactive session line by line and returns the
+        exit code. `catch` blocks are collected and run as a unit; outside of
+        them the first failing command ends the session with code 1.
+        """
+        block: list[str] | None = None
+        skip_else = False
+        for line in lines:
+            stripped = line.strip()
+            if skip_else:
+                # the error branch and `else` branch after a `catch` block
+                # only set `status`, which has been set already
+                skip_else = stripped != "}"
+                continue
+            if block is not None:
+                m = RE_CATCH_END.match(stripped)
+                if m is None:
+                    block.append(stripped)
+                    continue
+                try:
+                    for command in block:
+                        self.execute(command)
+                except COMMAND_ERRORS as e:
+                    self.variables[m.group("var")] = str(e)
+                    self.variables["status"] = "error"
+                    self.puts(f"ERROR: {e}")
+                else:
+                    self.variables["status"] = "ok"
+                block = None
+                skip_else = True
+                continue
+            if RE_CATCH_START.match(stripped):
+                block = []
+                continue
+            try:
+                if not self.execute(stripped):
+                    return 0
+            except COMMAND_ERRORS as e:
+                self.puts(f"ERROR: {e}")
+                return 1
+        return 0
+
+
+def main(args: list[str] | None = None) -> int:
+    args = list(sys.argv[1:] if args is None else args)
+    log_fp = None
+    if "-l" in args:
+        i = args.index("-l")
+        log_fp = Path(args[i + 1])
+        del args[i : i + 2]
+        log_fp.write_text("")
+    session = FakeSession(log_fp)
+    if "-i" in args:
+        return session.run(sys.stdin)
+    if "-f" in args:
+        args.remove("-f")
+    if not args:
+        print("usage: vitis_hls [-i] [-f] <script.tcl> [-l <log>]", file=sys.stderr)
+        return 2
+    return session.run(Path(args[0]).read_text().splitlines())
+
+
+def install(bin_dir: Path) -> Path:
+    """
+    Writes an executable `vitis_hls` into `bin_dir` that runs this module
+    with the current interpreter. Put `bin_dir` first on PATH to use it.
+    """
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    package_parent = Path(__file__).resolve().parents[1]
+    fp = bin_dir / "vitis_hls"
+    fp.write_text(
+        "#!/bin/sh\n"
+        f'PYTHONPATH="{package_parent}${{PYTHONPATH:+:$PYTHONPATH}}" '
+        f'exec "{sys.executable}" -m synth_scaffold.fake_vitis_hls "$@"\n'
+    )
+    fp.chmod(0o755)
+    return fp
+
+
+if __name__ == "__main__":
+    sys.exit(main())
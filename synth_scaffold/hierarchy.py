@@ -0,0 +1,253 @@
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .archive import path_exists
+from .synth_scaffold import CSYNTH_MODULE_PATTERNS, SynthReport, unwrap
+from .xml_extract import extract_subtrees
+
+HIERARCHY_PATTERN = ("RTLDesignHierarchy", "TopModule")
+LOOPS_PATTERN = ("PerformanceEstimates", "SummaryOfLoopLatency")
+INTERVAL_PATTERNS = {
+    "interval_min": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Interval-min",
+    ),
+    "interval_max": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Interval-max",
+    ),
+}
+
+
+def parse_count(elem: ET.Element | None) -> int | None:
+    """
+    A cycle or iteration count from a report element. Counts given as a
+    `<range><min>...</min><max>...</max></range>` give their maximum; counts
+    that are not numbers, such as "undef" or "-", give `None`.
+    """
+    if elem is None:
+        return None
+    max_text = elem.findtext("range/max")
+    text = max_text if max_text is not None else elem.text
+    try:
+        return int((text or "").strip())
+    except ValueError:
+        return None
+
+
+@dataclass
+class LoopReport:
+    """
+    One entry of a module's loop latency summary, with the loops nested in
+    it.
+    """
+
+    name: str
+    trip_count: int | None
+    latency: int | None
+    pipeline_ii: int | None
+    pipeline_depth: int | None
+    loops: list["LoopReport"] = field(default_factory=list)
+
+    @classmethod
+    def from_element(cls, elem: ET.Element) -> "LoopReport":
+        return cls(
+            name=elem.findtext("Name", elem.tag),
+            trip_count=parse_count(elem.find("TripCount")),
+            latency=parse_count(elem.find("Latency")),
+            pipeline_ii=parse_count(elem.find("PipelineII")),
+            pipeline_depth=parse_count(elem.find("PipelineDepth")),
+            loops=parse_loops(elem),
+        )
+
+
+def parse_loops(elem: ET.Element) -> list[LoopReport]:
+    """
+    The loops directly under `elem`, which is a `SummaryOfLoopLatency` or a
+    loop entry. Loop entries are the children that have a `Name`.
+    """
+    return [LoopReport.from_element(c) for c in elem if c.find("Name") is not None]
+
+
+@dataclass
+class ModuleReport:
+    """
+    The report of one RTL module of a design: its `SynthReport`, initiation
+    interval and loops.
+    """
+
+    report: SynthReport
+    interval_min: int | None
+    interval_max: int | None
+    loops: list[LoopReport]
+
+    @classmethod
+    def from_module_xml(cls, xml_fp: Path, module_name: str) -> "ModuleReport":
+        """
+        Reads a `<module>_csynth.xml` in one streaming pass that stops after
+        the area estimates.
+        """
+        if not path_exists(xml_fp):
+            raise FileNotFoundError(f"File {xml_fp} does not exist")
+        texts, subtrees = extract_subtrees(
+            xml_fp,
+            {**CSYNTH_MODULE_PATTERNS, **INTERVAL_PATTERNS},
+            {"loops": LOOPS_PATTERN},
+        )
+        loops_elem = subtrees.get("loops")
+
+        def interval(key: str) -> int | None:
+            text = texts.get(key)
+            try:
+                return int(text) if text is not None else None
+            except ValueError:
+                return None
+
+        return cls(
+            report=SynthReport.from_module_texts(module_name, texts, xml_fp),
+            interval_min=interval("interval_min"),
+            interval_max=interval("interval_max"),
+            loops=parse_loops(loops_elem) if loops_elem is not None else [],
+        )
+
+
+@dataclass(eq=False)
+class InstanceNode:
+    """
+    An instance of a module in the RTL design hierarchy. Its module's report
+    is read from the report directory the first time it is accessed.
+    """
+
+    instance_name: str
+    module_name: str
+    children: list["InstanceNode"]
+    tree: "ReportTree" = field(repr=False)
+
+    @property
+    def module(self) -> ModuleReport:
+        return self.tree.module(self.module_name)
+
+    @property
+    def report(self) -> SynthReport:
+        return self.module.report
+
+    def walk(self) -> Iterator[tuple[int, "InstanceNode"]]:
+        """
+        This instance and every instance below it, depth-first, with their
+        depth relative to this one.
+        """
+        stack: list[tuple[int, InstanceNode]] = [(0, self)]
+        while stack:
+            depth, node = stack.pop()
+            yield depth, node
+            stack.extend((depth + 1, c) for c in reversed(node.children))
+
+    def find(self, name: str) -> "InstanceNode | None":
+        """
+        The first instance at or below this one whose instance or module name
+        is `name`.
+        """
+        for _, node in self.walk():
+            if name in (node.instance_name, node.module_name):
+                return node
+        return None
+
+
+class ReportTree:
+    """
+    The per-instance reports of one synthesis run.
+
+    Vitis HLS writes a `<module>_csynth.xml` for every RTL module of the
+    design, so the latency, initiation interval, resources and loops of
+    each function called by the target are in the report directory of the
+    target's own run. The instance hierarchy is read from `csynth.xml` up
+    front; each module's report is parsed on first access and shared by all
+    instances of that module.
+    """
+
+    def __init__(self, report_dir: Path, root: ET.Element) -> None:
+        self.report_dir = report_dir
+        self._modules: dict[str, ModuleReport] = {}
+        self.root = self._build(root, unwrap(root.findtext("ModuleName")))
+
+    @classmethod
+    def from_report_dir(cls, report_dir: Path) -> "ReportTree":
+        xml_csynth_fp = report_dir / "csynth.xml"
+        if not path_exists(xml_csynth_fp):
+            raise FileNotFoundError(f"File {xml_csynth_fp} does not exist")
+        _, subtrees = extract_subtrees(xml_csynth_fp, {}, {"top": HIERARCHY_PATTERN})
+        root = subtrees.get("top")
+        if root is None:
+            raise ValueError(f"{xml_csynth_fp} has no RTL design hierarchy")
+        return cls(report_dir, root)
+
+    def _build(self, elem: ET.Element, instance_name: str) -> InstanceNode:
+        children = [
+            self._build(instance, unwrap(instance.findtext("InstName")))
+            for instance in elem.iterfind("InstancesList/Instance")
+        ]
+        return InstanceNode(
+            instance_name=instance_name,
+            module_name=unwrap(elem.findtext("ModuleName")),
+            children=children,
+            tree=self,
+        )
+
+    @property
+    def target(self) -> InstanceNode:
+        """
+        The instance of the synthesized function, the first instance under
+        the scaffold's top module; its report is the one
+        `SynthReport.from_report_dir()` returns.
+        """
+        if not self.root.children:
+            raise ValueError(f"{self.report_dir} has no instances under the top")
+        return self.root.children[0]
+
+    def module(self, module_name: str) -> ModuleReport:
+        if module_name not in self._modules:
+            self._modules[module_name] = ModuleReport.from_module_xml(
+                self.report_dir / f"{module_name}_csynth.xml", module_name
+            )
+        return self._modules[module_name]
+
+    def reports(self) -> dict[str, SynthReport]:
+        """
+        The report of every module under the target, keyed by module name.
+        """
+        return {node.module_name: node.report for _, node in self.target.walk()}
+
+    def text_summary(self) -> str:
+        txt = ""
+        for depth, node in self.target.walk():
+            module = node.module
+            r = module.report
+            indent = "  " * depth
+            txt += f"{indent}{node.instance_name} ({node.module_name})\n"
+            txt += (
+                f"{indent}  Latency: {r.latency_best_case} / "
+                f"{r.latency_average_case} / {r.latency_worst_case} cycles, "
+                f"II: {module.interval_min} / {module.interval_max}\n"
+            )
+            txt += (
+                f"{indent}  LUT: {r.resources_lut_used}, "
+                f"FF: {r.resources_ff_used}, DSP: {r.resources_dsp_used}, "
+                f"BRAM: {r.resources_bram_used}, URAM: {r.resources_uram_used}\n"
+            )
+            loop_stack = [(1, loop) for loop in reversed(module.loops)]
+            while loop_stack:
+                loop_depth, loop = loop_stack.pop()
+                txt += (
+                    f"{indent}{'  ' * loop_depth}Loop {loop.name}: "
+                    f"trip count {loop.trip_count}, latency {loop.latency}, "
+                    f"II {loop.pipeline_ii}, depth {loop.pipeline_depth}\n"
+                )
+                loop_stack.extend((loop_depth + 1, c) for c in reversed(loop.loops))
+        return txt
+
+    def print_text_summary(self) -> None:
+        print(self.text_summary())
@@ -0,0 +1,483 @@
+import argparse
+import dataclasses
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .cache import SynthCache
+from .resources import child_pids, kill_process_group
+from .sweep import build_job_configs
+from .synth_scaffold import RunInfo, SynthReport, SynthScaffold, config_key
+
+QUEUE_STATES = ("pending", "running", "done", "failed")
+
+
+def _write_json_atomic(fp: Path, data: Any) -> None:
+    fp_tmp = fp.with_suffix(f".tmp.{socket.gethostname()}.{os.getpid()}")
+    fp_tmp.write_text(json.dumps(data, indent=4, default=str))
+    os.replace(fp_tmp, fp)
+
+
+def _parse_job_name(name: str) -> tuple[str, int] | None:
+    # "<job_id>.<attempt>.json"
+    parts = name.split(".")
+    if len(parts) != 3 or parts[2] != "json" or not parts[1].isdigit():
+        return None
+    return parts[0], int(parts[1])
+
+
+@dataclass
+class Job:
+    job_id: str
+    attempt: int
+    config: dict[str, Any]
+    fp: Path
+    lease_lost: bool = False
+
+
+class JobQueue:
+    """
+    A job queue in a directory that several hosts share, e.g. over NFS,
+    with no broker. Each job is a `SynthScaffold` config in a JSON file that
+    moves between state directories by `rename()`, which is atomic on a
+    single filesystem, NFS included:
+
+        pending/<job_id>.<attempt>.json   submitted, waiting for a worker
+        running/<job_id>.<attempt>.json   claimed; its mtime is the lease
+        done/<job_id>.json                the report and run info
+        failed/<job_id>.json              the run info and the error
+
+    Job ids are config keys, so submitting a config that is already queued
+    or finished does nothing.
+
+    A worker claims a job by renaming it from `pending/` to `running/` and
+    renews its lease by touching the file while the job runs. A job whose
+    lease has not been renewed for `lease_s` seconds belongs to a dead
+    worker; any worker moves it back to `pending/` with the next attempt
+    number, or to `failed/` after `max_attempts` attempts. Leases compare
+    file mtimes with the local clock, so the hosts' clocks must be in sync
+    (e.g. with NTP) to well within `lease_s`, and `lease_s` should be well
+    above the NFS attribute cache timeout.
+    """
+
+    def __init__(
+        self, queue_dir: Path, lease_s: float = 300.0, max_attempts: int = 3
+    ) -> None:
+        self.queue_dir = queue_dir
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        for state in QUEUE_STATES:
+            (queue_dir / state).mkdir(parents=True, exist_ok=True)
+
+    def state_dir(self, state: str) -> Path:
+        return self.queue_dir / state
+
+    def _queued_ids(self) -> set[str]:
+        job_ids = set()
+        for state in ("pending", "running"):
+            for fp in self.state_dir(state).iterdir():
+                parsed = _parse_job_name(fp.name)
+                if parsed is not None:
+                    job_ids.add(parsed[0])
+        for state in ("done", "failed"):
+            job_ids.update(fp.stem for fp in self.state_dir(state).glob("*.json"))
+        return job_ids
+
+    def submit(self, configs: Iterable[dict[str, Any]]) -> list[str]:
+        """
+        Adds configs to the queue and returns the ids of the new jobs.
+        Configs that are already queued, running or finished are skipped;
+        remove their result from `done/` or `failed/` to run them again.
+        """
+        queued = self._queued_ids()
+        job_ids = []
+        for config in configs:
+            config = json.loads(json.dumps(config, default=str))
+            job_id = config_key(config)
+            if job_id in queued:
+                continue
+            queued.add(job_id)
+            _write_json_atomic(self.state_dir("pending") / f"{job_id}.1.json", config)
+            job_ids.append(job_id)
+        return job_ids
+
+    def claim(self) -> Job | None:
+        """
+        Takes the first pending job, or returns `None` if there is none.
+        """
+        for fp in sorted(self.state_dir("pending").iterdir()):
+            parsed = _parse_job_name(fp.name)
+            if parsed is None:
+                continue
+            fp_running = self.state_dir("running") / fp.name
+            try:
+                # start the lease before the rename makes the job ours; if
+                # another worker gets it first, this touched its lease
+                os.utime(fp)
+                os.rename(fp, fp_running)
+                config = json.loads(fp_running.read_text())
+            except FileNotFoundError:
+                continue
+            job_id, attempt = parsed
+            if (self.state_dir("done") / f"{job_id}.json").exists():
+                # finished by a worker that lost its lease
+                fp_running.unlink(missing_ok=True)
+                continue
+            return Job(job_id=job_id, attempt=attempt, config=config, fp=fp_running)
+        return None
+
+    def renew(self, job: Job) -> bool:
+        """
+        Extends the lease of a running job. Returns `False` if the job has
+        been requeued because its lease expired.
+        """
+        try:
+            os.utime(job.fp)
+        except FileNotFoundError:
+            job.lease_lost = True
+            return False
+        return True
+
+    def release(self, job: Job) -> None:
+        """
+        Puts a claimed job back in `pending/` without using up an attempt,
+        e.g. because its worker was stopped.
+        """
+        if job.lease_lost:
+            return
+        try:
+            os.rename(job.fp, self.state_dir("pending") / job.fp.name)
+        except FileNotFoundError:
+            pass
+
+    def requeue_expired(self) -> list[str]:
+        """
+        Moves running jobs whose lease expired back to `pending/`, or to
+        `failed/` once they have used up `max_attempts`. Returns their ids.
+        """
+        now = time.time()
+        requeued = []
+        for fp in self.state_dir("running").iterdir():
+            parsed = _parse_job_name(fp.name)
+            if parsed is None:
+                continue
+            try:
+                if now - fp.stat().st_mtime <= self.lease_s:
+                    continue
+            except FileNotFoundError:
+                continue
+            job_id, attempt = parsed
+            if attempt >= self.max_attempts:
+                fp_expired = fp.with_suffix(".expired")
+                try:
+                    os.rename(fp, fp_expired)
+                except FileNotFoundError:
+                    continue
+                config = json.loads(fp_expired.read_text())
+                self._publish(
+                    "failed",
+                    job_id,
+                    {
+                        "config": config,
+                        "attempt": attempt,
+                        "error": f"Lease expired on all {attempt} attempts",
+                    },
+                )
+                fp_expired.unlink()
+            else:
+                fp_pending = self.state_dir("pending") / f"{job_id}.{attempt + 1}.json"
+                try:
+                    os.rename(fp, fp_pending)
+                except FileNotFoundError:
+                    continue
+            requeued.append(job_id)
+        return requeued
+
+    def _publish(self, state: str, job_id: str, record: dict[str, Any]) -> None:
+        record = {
+            **record,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "finished": time.time(),
+        }
+        _write_json_atomic(self.state_dir(state) / f"{job_id}.json", record)
+
+    def complete(
+        self,
+        job: Job,
+        report: SynthReport | None,
+        run_info: RunInfo | None,
+        error: str | None = None,
+    ) -> None:
+        """
+        Publishes the result of a job to `done/`, or to `failed/` if it has no
+        report, and releases its lease.
+        """
+        record = {
+            "config": job.config,
+            "attempt": job.attempt,
+            "report": report.to_dict() if report is not None else None,
+            "run_info": dataclasses.asdict(run_info) if run_info is not None else None,
+            "error": error,
+        }
+        self._publish("done" if report is not None else "failed", job.job_id, record)
+        if not job.lease_lost:
+            job.fp.unlink(missing_ok=True)
+
+    def status(self) -> dict[str, int]:
+        """
+        Number of jobs in each state.
+        """
+        counts = {}
+        for state in QUEUE_STATES:
+            names = [fp.name for fp in self.state_dir(state).iterdir()]
+            if state in ("pending", "running"):
+                counts[state] = sum(_parse_job_name(n) is not None for n in names)
+            else:
+                counts[state] = sum(n.endswith(".json") for n in names)
+        return counts
+
+    def results(self) -> Iterator[tuple[dict[str, Any], SynthReport | None]]:
+        """
+        The `(config, report)` of every finished job, like `sweep()` yields
+        them.
+        """
+        for state in ("done", "failed"):
+            for fp in sorted(self.state_dir(state).glob("*.json")):
+                record = json.loads(fp.read_text())
+                report = record.get("report")
+                yield (
+                    record["config"],
+                    SynthReport.from_dict(report) if report is not None else None,
+                )
+
+
+def run_job(
+    queue: JobQueue,
+    job: Job,
+    cache: SynthCache | None = None,
+    timeout_s: float | None = None,
+    verbose: bool = False,
+    stop: threading.Event | None = None,
+) -> SynthReport | None:
+    """
+    Runs a claimed job with `generate_and_run()`, renewing its lease from a
+    background thread, and publishes the result. A job that fails after
+    `stop` is set (e.g. because its tool was killed) is released back to
+    the queue instead.
+    """
+    heartbeat_stop = threading.Event()
+
+    def heartbeat() -> None:
+        while not heartbeat_stop.wait(queue.lease_s / 4):
+            if not queue.renew(job):
+                return
+
+    heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+    heartbeat_thread.start()
+    s = None
+    report = None
+    error = None
+    try:
+        s = SynthScaffold.from_config(job.config, cache=cache)
+        report = s.generate_and_run(timeout_s=timeout_s)
+    except Exception:  # noqa: BLE001 - a bad config fails its job, not the worker
+        error = traceback.format_exc()
+    finally:
+        heartbeat_stop.set()
+        heartbeat_thread.join()
+    run_info = s.last_run if s is not None else None
+    if report is None and stop is not None and stop.is_set():
+        queue.release(job)
+        if verbose:
+            print(f"{job.job_id} (attempt {job.attempt}): stopped, requeued")
+        return None
+    queue.complete(job, report, run_info, error)
+    if verbose:
+        status = "ok" if report is not None else "failed"
+        if job.lease_lost:
+            status += " (lease lost)"
+        print(f"{job.job_id} (attempt {job.attempt}): {status}")
+    return report
+
+
+def work(
+    queue: JobQueue,
+    cache: SynthCache | None = None,
+    timeout_s: float | None = None,
+    poll_s: float = 10.0,
+    exit_when_empty: bool = False,
+    max_jobs: int | None = None,
+    verbose: bool = False,
+    stop: threading.Event | None = None,
+) -> int:
+    """
+    Claims and runs jobs until the queue is empty (with `exit_when_empty`),
+    `max_jobs` jobs have run or `stop` is set, polling every `poll_s`
+    seconds while there is nothing to claim. Expired leases are requeued
+    before every claim. Returns the number of jobs run.
+    """
+    if stop is None:
+        stop = threading.Event()
+    n_jobs = 0
+    while (max_jobs is None or n_jobs < max_jobs) and not stop.is_set():
+        queue.requeue_expired()
+        job = queue.claim()
+        if job is None:
+            if exit_when_empty and queue.status()["running"] == 0:
+                break
+            stop.wait(poll_s)
+            continue
+        run_job(
+            queue, job, cache=cache, timeout_s=timeout_s, verbose=verbose, stop=stop
+        )
+        n_jobs += 1
+    return n_jobs
+
+
+def stop_workers(threads: list[threading.Thread], stop: threading.Event) -> None:
+    """
+    Stops `work()` threads that share `stop`: no more jobs are claimed, the
+    tools of running jobs are killed and their jobs go back to the queue.
+    The tools run in their own sessions, so they do not get the Ctrl-C
+    themselves.
+    """
+    stop.set()
+    while any(thread.is_alive() for thread in threads):
+        # a thread may still be starting a tool
+        for pid in child_pids(os.getpid()):
+            kill_process_group(pid)
+        for thread in threads:
+            thread.join(timeout=0.5)
+
+
+def submit_main(args=None) -> bool:
+    parser = argparse.ArgumentParser(
+        prog="synth-scaffold submit",
+        description="Add SynthScaffold configs to a shared job queue directory",
+    )
+    parser.add_argument("--queue", type=Path, required=True, help="Job queue directory")
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=None,
+        help="JSON file with a config, or a base config to expand with --design-space",
+    )
+    parser.add_argument(
+        "--design-space",
+        type=Path,
+        default=None,
+        help="JSON file with a design space; each point becomes a job under the config's output_dir",
+    )
+    parser.add_argument(
+        "--configs",
+        type=Path,
+        default=None,
+        help="JSON file with a list of configs",
+    )
+
+    args: argparse.Namespace = parser.parse_args(args)
+
+    queue = JobQueue(args.queue)
+    configs = []
+    if args.configs is not None:
+        configs += json.loads(args.configs.read_text())
+    if args.config is not None:
+        config = json.loads(args.config.read_text())
+        if args.design_space is not None:
+            design_space = json.loads(args.design_space.read_text())
+            configs += build_job_configs(config, design_space)
+        else:
+            configs.append(config)
+
+    job_ids = queue.submit(configs)
+    print(f"Submitted {len(job_ids)} of {len(configs)} jobs")
+    print(", ".join(f"{state}: {n}" for state, n in queue.status().items()))
+    return True
+
+
+def worker_main(args=None) -> bool:
+    parser = argparse.ArgumentParser(
+        prog="synth-scaffold worker",
+        description="Run jobs from a shared job queue directory",
+    )
+    parser.add_argument("--queue", type=Path, required=True, help="Job queue directory")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of jobs to run at once on this host",
+    )
+    parser.add_argument(
+        "--lease",
+        type=float,
+        default=300.0,
+        help="Seconds without a heartbeat after which a running job is requeued",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Times a job whose worker died is tried before it fails",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=10.0,
+        help="Seconds between checks of an empty queue",
+    )
+    parser.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help="Exit once no jobs are pending or running instead of waiting for more",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Kill a synthesis job after this many seconds",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory of a persistent synthesis result cache to reuse",
+    )
+
+    args: argparse.Namespace = parser.parse_args(args)
+
+    queue = JobQueue(args.queue, lease_s=args.lease, max_attempts=args.max_attempts)
+    cache = SynthCache(args.cache_dir) if args.cache_dir is not None else None
+
+    stop = threading.Event()
+
+    def work_loop() -> None:
+        work(
+            queue,
+            cache=cache,
+            timeout_s=args.timeout,
+            poll_s=args.poll,
+            exit_when_empty=args.exit_when_empty,
+            verbose=True,
+            stop=stop,
+        )
+
+    # the tool runs in subprocesses, so threads are enough to run jobs at once
+    threads = [threading.Thread(target=work_loop) for _ in range(args.jobs)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        print("Stopping: killing running jobs and returning them to the queue")
+        stop_workers(threads, stop)
+        return False
+    return True
@@ -0,0 +1,370 @@
+import dataclasses
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+
+
+@dataclass
+class FunctionSignature:
+    name: str
+    template_args: str | None
+    ret_type: str
+    args: str
+    file: Path
+    offset: int
+
+    def to_dict(self) -> dict[str, Any]:
+        data = dataclasses.asdict(self)
+        data["file"] = str(self.file)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FunctionSignature":
+        data = dict(data)
+        data["file"] = Path(data["file"])
+        return cls(**data)
+
+
+class Token(NamedTuple):
+    text: str
+    start: int
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+# Both patterns are plain alternations where every branch either consumes a
+# fixed prefix or runs up to a fixed terminator, so matching never
+# backtracks and lexing is linear in the size of the source.
+RE_TRIVIA = re.compile(
+    r"""
+    (?P<preproc>^[ \t]*\#(?:[^\n\\]|\\.)*)
+    |(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    |(?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    """,
+    re.VERBOSE | re.MULTILINE | re.DOTALL,
+)
+RE_TOKEN = re.compile(
+    r"""
+    "(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'
+    |[A-Za-z_]\w*
+    |\.?\d(?:[eEpP][+-]|[\w.'])*
+    |::|->|\S
+    """,
+    re.VERBOSE,
+)
+
+IDENT_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+
+BRACKET_PAIRS = {")": "(", "]": "[", "}": "{"}
+
+# words that can come right before a `(` without naming a function
+NOT_FUNCTION_NAMES = {
+    "alignas",
+    "alignof",
+    "case",
+    "catch",
+    "co_return",
+    "co_yield",
+    "decltype",
+    "delete",
+    "do",
+    "else",
+    "for",
+    "if",
+    "new",
+    "noexcept",
+    "operator",
+    "return",
+    "sizeof",
+    "static_assert",
+    "switch",
+    "throw",
+    "typeid",
+    "while",
+    "__attribute__",
+    "__declspec",
+}
+
+# parenthesized groups that belong to the return type or the declaration
+# specifiers rather than being the function's parameter list
+SPECIFIER_CALLS = {"alignas", "decltype", "noexcept", "__attribute__", "__declspec"}
+
+DECL_SPECIFIERS = {
+    "constexpr",
+    "consteval",
+    "explicit",
+    "extern",
+    "friend",
+    "inline",
+    "static",
+    "virtual",
+}
+
+ACCESS_SPECIFIERS = {"public", "private", "protected"}
+SCOPE_KEYWORDS = {"namespace", "class", "struct", "union"}
+
+
+def blank_trivia(source_txt: str) -> str:
+    """
+    Replaces comments and preprocessor lines (including backslash
+    continuations) with spaces, keeping string literals intact and every
+    offset unchanged.
+    """
+
+    def blank(m: re.Match) -> str:
+        if m.lastgroup == "string":
+            return m.group()
+        return " " * len(m.group())
+
+    return RE_TRIVIA.sub(blank, source_txt)
+
+
+def tokenize(clean_txt: str) -> list[Token]:
+    return [Token(m.group(), m.start()) for m in RE_TOKEN.finditer(clean_txt)]
+
+
+def match_brackets(tokens: list[Token]) -> dict[int, int]:
+    """
+    Maps the index of every opening (, [ and { token to the index of its
+    closing token. Unbalanced brackets are left unmatched.
+    """
+    matches: dict[int, int] = {}
+    stack: list[int] = []
+    for i, tok in enumerate(tokens):
+        if tok.text in "([{":
+            stack.append(i)
+        elif tok.text in BRACKET_PAIRS:
+            opener = BRACKET_PAIRS[tok.text]
+            # drop openers that were never closed, e.g. from code that is
+            # only balanced across preprocessor branches
+            while stack and tokens[stack[-1]].text != opener:
+                stack.pop()
+            if stack:
+                matches[stack.pop()] = i
+    return matches
+
+
+def match_angle(tokens: list[Token], lt_idx: int, brackets: dict[int, int]) -> int:
+    """
+    Index of the `>` closing the template parameter list that opens at
+    `lt_idx`. Anything inside (), [] or {} is skipped, so defaults such as
+    `bool B = (N > 2)` do not end the list early.
+    """
+    depth = 0
+    i = lt_idx
+    while i < len(tokens):
+        text = tokens[i].text
+        if text in "([{" and i in brackets:
+            i = brackets[i]
+        elif text == "<":
+            depth += 1
+        elif text == ">":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(tokens) - 1
+
+
+def qualified_name_start(tokens: list[Token], name_idx: int, lower: int) -> int:
+    """
+    Walks back from a function name over `Outer::Inner<T>::` qualifiers and
+    returns the index of the first token of the qualified name.
+    """
+    i = name_idx
+    while i - 2 >= lower and tokens[i - 1].text == "::":
+        j = i - 2
+        if tokens[j].text == ">":
+            depth = 0
+            while j >= lower:
+                if tokens[j].text == ">":
+                    depth += 1
+                elif tokens[j].text == "<":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j -= 1
+            j -= 1
+        if j < lower or tokens[j].text[0] not in IDENT_START:
+            break
+        i = j
+    return i
+
+
+def parse_declarator(
+    clean_txt: str,
+    tokens: list[Token],
+    brackets: dict[int, int],
+    stmt_start: int,
+    template_clause: tuple[int, int] | None,
+    paren_idx: int,
+    fp: Path,
+) -> FunctionSignature | None:
+    name_idx = paren_idx - 1
+    if name_idx < stmt_start:
+        return None
+    name_tok = tokens[name_idx]
+    if name_tok.text[0] not in IDENT_START or name_tok.text in NOT_FUNCTION_NAMES:
+        return None
+
+    type_start = template_clause[1] + 1 if template_clause else stmt_start
+    type_end = qualified_name_start(tokens, name_idx, type_start)
+
+    i = type_start
+    while i < type_end:
+        text = tokens[i].text
+        if text in DECL_SPECIFIERS:
+            i += 1
+        elif text == "[" and i in brackets:
+            # attributes such as [[nodiscard]]
+            i = brackets[i] + 1
+        else:
+            break
+    type_start = i
+    if type_start >= type_end:
+        # no return type: a constructor, a macro invocation or a call
+        return None
+
+    j = type_start
+    while j < type_end:
+        text = tokens[j].text
+        if text in SPECIFIER_CALLS and j + 1 < type_end and tokens[j + 1].text == "(":
+            # e.g. a decltype(...) return type
+            j = brackets.get(j + 1, type_end) + 1
+            continue
+        if text in ("=", "(", ")", ";") or text in NOT_FUNCTION_NAMES:
+            return None
+        j += 1
+
+    ret_type = " ".join(
+        clean_txt[tokens[type_start].start : tokens[type_end - 1].end].split()
+    )
+
+    template_args = None
+    if template_clause is not None:
+        lt_idx, gt_idx = template_clause
+        template_args = clean_txt[tokens[lt_idx].end : tokens[gt_idx].start]
+
+    close_idx = brackets.get(paren_idx)
+    if close_idx is None:
+        return None
+    args = clean_txt[tokens[paren_idx].end : tokens[close_idx].start].strip()
+
+    return FunctionSignature(
+        name=name_tok.text,
+        template_args=template_args,
+        ret_type=ret_type,
+        args=args,
+        file=fp,
+        offset=tokens[stmt_start].start,
+    )
+
+
+def find_function_signatures(source_txt: str, fp: Path) -> list[FunctionSignature]:
+    """
+    Finds every function declaration and definition in `source_txt`, in
+    source order, in time linear in the size of the source.
+
+    Declarations are only looked for at namespace and class scope. Function
+    bodies and initializers are skipped using precomputed bracket matches,
+    and only the first top-level parenthesized group of each statement is
+    considered as a parameter list, so calls inside bodies or default
+    arguments are never mistaken for declarations.
+    """
+    clean_txt = blank_trivia(source_txt)
+    tokens = tokenize(clean_txt)
+    brackets = match_brackets(tokens)
+    n_tokens = len(tokens)
+
+    signatures: list[FunctionSignature] = []
+
+    i = 0
+    stmt_start = 0
+    template_clause: tuple[int, int] | None = None
+    declarator_seen = False
+    while i < n_tokens:
+        text = tokens[i].text
+
+        if text[0] in IDENT_START:
+            if text == "template" and i + 1 < n_tokens and tokens[i + 1].text == "<":
+                gt_idx = match_angle(tokens, i + 1, brackets)
+                template_clause = (i + 1, gt_idx)
+                i = gt_idx + 1
+                continue
+            if (
+                text in ACCESS_SPECIFIERS
+                and i == stmt_start
+                and i + 1 < n_tokens
+                and tokens[i + 1].text == ":"
+            ):
+                i += 2
+                stmt_start = i
+                continue
+            i += 1
+            continue
+
+        if text == "(" and not declarator_seen:
+            if i > stmt_start and tokens[i - 1].text in SPECIFIER_CALLS:
+                i = brackets.get(i, i) + 1
+                continue
+            declarator_seen = True
+            signature = parse_declarator(
+                clean_txt, tokens, brackets, stmt_start, template_clause, i, fp
+            )
+            if signature is not None:
+                signatures.append(signature)
+            i = brackets.get(i, i) + 1
+            continue
+
+        if text == "{":
+            stmt_texts = {t.text for t in tokens[stmt_start:i]}
+            opens_scope = (
+                not declarator_seen
+                and "enum" not in stmt_texts
+                and (
+                    bool(stmt_texts & SCOPE_KEYWORDS)
+                    or (
+                        i - stmt_start == 2
+                        and tokens[stmt_start].text == "extern"
+                        and tokens[stmt_start + 1].text[0] == '"'
+                    )
+                )
+            )
+            if opens_scope or i not in brackets:
+                # an unmatched brace, e.g. of a function header that is
+                # split across preprocessor branches, is stepped over so
+                # that the code after it is still scanned
+                i += 1
+            else:
+                i = brackets[i] + 1
+                if not declarator_seen:
+                    # an initializer such as `int x[] = {...};` is followed
+                    # by the rest of its statement
+                    continue
+            stmt_start = i
+            template_clause = None
+            declarator_seen = False
+            continue
+
+        if text in (";", "}"):
+            i += 1
+            stmt_start = i
+            template_clause = None
+            declarator_seen = False
+            continue
+
+        i += 1
+
+    return signatures
+
+
+def find_function_signature(
+    source_txt: str, function_name: str, fp: Path
+) -> FunctionSignature | None:
+    for signature in find_function_signatures(source_txt, fp):
+        if signature.name == function_name:
+            return signature
+    return None
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any
+
+from .archive import list_files, open_path
+from .store import STATUS_OK, run_status
+from .synth_scaffold import (
+    RunInfo,
+    SynthReport,
+    SynthScaffold,
+    config_key,
+)
+
+MANIFEST_NAME = "sweep_manifest.jsonl"
+
+
+def sources_digest(config: dict[str, Any]) -> str:
+    """
+    Hash of the names and contents of a config's input source files.
+    """
+    h = hashlib.sha256()
+    for fp in config["input_source_files"]:
+        fp = Path(fp)
+        data = fp.read_bytes()
+        h.update(fp.name.encode())
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()[:16]
+
+
+def report_digest(report_dir: Path) -> str | None:
+    """
+    Hash of the XML reports in `report_dir`, or `None` if there are none.
+    Reports of archived runs are read from the archive.
+    """
+    xml_names = [name for name in list_files(report_dir) if name.endswith(".xml")]
+    if not xml_names:
+        return None
+    h = hashlib.sha256()
+    for name in xml_names:
+        with open_path(report_dir / name) as f:
+            data = f.read()
+        h.update(name.encode())
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()[:16]
+
+
+class SweepManifest:
+    """
+    Append-only log of the finished jobs of a sweep, one JSON line per job,
+    kept in the runs root so that an interrupted sweep can be resumed.
+
+    Each record holds the job's config key, its status, a hash of the input
+    sources and a hash of the reports it produced. A line is written in a
+    single `write()` and synced before the job's result is yielded, so an
+    interrupt can at worst leave a truncated last line, which is ignored.
+    Jobs still running when the sweep is interrupted have no record and are
+    run again on resume.
+    """
+
+    def __init__(self, fp: Path) -> None:
+        self.fp = fp
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """
+        The latest record of every config key.
+        """
+        records: dict[str, dict[str, Any]] = {}
+        if not self.fp.exists():
+            return records
+        for line in self.fp.read_text().splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["key"]] = record
+        return records
+
+    def record(
+        self,
+        config: dict[str, Any],
+        report: SynthReport | None,
+        run_info: RunInfo | None,
+        digest: str,
+    ) -> None:
+        report_dir = SynthScaffold.from_config(config).report_dir
+        record = {
+            "key": config_key(config),
+            "status": run_status(report, run_info),
+            "output_dir": str(config["output_dir"]),
+            "sources_digest": digest,
+            "report_digest": (
+                report_digest(report_dir) if report is not None else None
+            ),
+            "created": time.time(),
+        }
+        self.fp.parent.mkdir(parents=True, exist_ok=True)
+        with self.fp.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def completed_report(
+        self,
+        config: dict[str, Any],
+        records: dict[str, dict[str, Any]],
+        digest: str,
+    ) -> SynthReport | None:
+        """
+        The report of a job that needs no rerun: it has a successful record
+        for the same config key and input sources, and its `syn/report`
+        directory is complete and unchanged since the record was written.
+        """
+        record = records.get(config_key(config))
+        if record is None or record["status"] != STATUS_OK:
+            return None
+        if record["sources_digest"] != digest or record["report_digest"] is None:
+            return None
+        report_dir = SynthScaffold.from_config(config).report_dir
+        if report_digest(report_dir) != record["report_digest"]:
+            return None
+        try:
+            return SynthReport.from_report_dir(report_dir)
+        except (OSError, ValueError, ET.ParseError):
+            return None
@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .monitor import ProgressEvent
+
+# e.g. "Command         elaborate done; 3.11 sec." in autopilot.flow.log; the
+# indentation is the nesting depth of the command
+RE_FLOW_LOG_COMMAND = re.compile(
+    r"^Command\s+(?P<name>\S+) done;.*?(?P<seconds>\d+(?:\.\d+)?) sec\.\s*$",
+    re.MULTILINE,
+)
+
+
+def parse_flow_log(flow_log_txt: str) -> dict[str, float]:
+    """
+    Total time in seconds of each command in a Vitis HLS
+    `autopilot.flow.log`, in order of first completion. Commands run more
+    than once (e.g. scheduling once per module) are summed, and nested
+    commands are also counted in the commands that contain them.
+    """
+    times_s: dict[str, float] = {}
+    for m in RE_FLOW_LOG_COMMAND.finditer(flow_log_txt):
+        name = m.group("name")
+        times_s[name] = times_s.get(name, 0.0) + float(m.group("seconds"))
+    return times_s
+
+
+def _cpu_s(t0: os.times_result, t1: os.times_result) -> float:
+    # children's times only include children that have been waited for, so a
+    # span around a tool run that ends with wait() includes the tool
+    return (
+        (t1.user - t0.user)
+        + (t1.system - t0.system)
+        + (t1.children_user - t0.children_user)
+        + (t1.children_system - t0.children_system)
+    )
+
+
+@dataclass
+class Span:
+    """
+    A timed step of a run. `start_s` is a wall-clock timestamp so that spans
+    from different processes line up; `wall_s` is measured on a monotonic
+    clock. `cpu_s` is the CPU time of this process and of the children it
+    waited for during the span, or `None` where it cannot be attributed;
+    it includes other runs that overlap in the same process, e.g. with
+    `run_async()`.
+    """
+
+    name: str
+    category: str
+    start_s: float
+    wall_s: float
+    cpu_s: float | None = None
+
+
+@dataclass
+class OpenSpan:
+    name: str
+    category: str
+    start_s: float
+    t_start: float
+    times_start: os.times_result
+
+
+def open_span(name: str, category: str = "python") -> OpenSpan:
+    """
+    Starts timing a span, which `RunMetrics.close_span()` ends.
+    """
+    return OpenSpan(name, category, time.time(), time.perf_counter(), os.times())
+
+
+@dataclass
+class RunMetrics:
+    """
+    Where the time of one `generate()` and `run()` went: a `Span` per step
+    (parsing, staging, the tool run and each synthesis phase seen in its
+    output, reading the report), the bytes copied while staging sources,
+    the peak RSS of the tool and the time of each command in the tool's
+    `autopilot.flow.log`.
+    """
+
+    spans: list[Span] = field(default_factory=list)
+    bytes_staged: int = 0
+    peak_rss_bytes: int | None = None
+    flow_log_times_s: dict[str, float] = field(default_factory=dict)
+    pid: int = field(default_factory=os.getpid)
+
+    def close_span(self, started: OpenSpan) -> Span:
+        span = Span(
+            name=started.name,
+            category=started.category,
+            start_s=started.start_s,
+            wall_s=time.perf_counter() - started.t_start,
+            cpu_s=_cpu_s(started.times_start, os.times()),
+        )
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, category: str = "python") -> Iterator[None]:
+        started = open_span(name, category)
+        try:
+            yield
+        finally:
+            self.close_span(started)
+
+    def add_phase_spans(self, tool_span: Span, events: list[ProgressEvent]) -> None:
+        """
+        Splits a tool run into spans from the phase transitions seen in its
+        output. The time before the first transition is tool startup.
+        """
+        starts = [("startup", 0.0)] + [(e.phase, e.elapsed_s) for e in events]
+        ends = [t for _, t in starts[1:]] + [tool_span.wall_s]
+        for (phase, t_start), t_end in zip(starts, ends):
+            if t_end > t_start:
+                self.spans.append(
+                    Span(
+                        name=phase,
+                        category="phase",
+                        start_s=tool_span.start_s + t_start,
+                        wall_s=t_end - t_start,
+                    )
+                )
+
+    def wall_times_s(self) -> dict[str, float]:
+        """
+        Total wall time of the spans of each name.
+        """
+        times_s: dict[str, float] = {}
+        for span in self.spans:
+            times_s[span.name] = times_s.get(span.name, 0.0) + span.wall_s
+        return times_s
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "spans": [vars(span) for span in self.spans],
+            "bytes_staged": self.bytes_staged,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "flow_log_times_s": self.flow_log_times_s,
+            "pid": self.pid,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RunMetrics":
+        return cls(
+            spans=[Span(**span) for span in data["spans"]],
+            bytes_staged=data["bytes_staged"],
+            peak_rss_bytes=data["peak_rss_bytes"],
+            flow_log_times_s=data["flow_log_times_s"],
+            pid=data["pid"],
+        )
+
+
+def chrome_trace_events(
+    jobs: Iterable[tuple[str, RunMetrics]],
+) -> list[dict[str, Any]]:
+    """
+    Chrome trace events for the `(label, metrics)` of each job: one track
+    per process that ran jobs, with a complete event per span. Every event
+    carries the job's label; the job's bytes staged, peak RSS and flow log
+    times are in the arguments of its outermost span.
+    """
+    events: list[dict[str, Any]] = []
+    pids: set[int] = set()
+    for label, metrics in jobs:
+        if not metrics.spans:
+            continue
+        pids.add(metrics.pid)
+        spans = sorted(metrics.spans, key=lambda span: (span.start_s, -span.wall_s))
+        for span in spans:
+            args: dict[str, Any] = {"job": label}
+            if span.cpu_s is not None:
+                args["cpu_s"] = span.cpu_s
+            if span is spans[0]:
+                args["bytes_staged"] = metrics.bytes_staged
+                args["peak_rss_bytes"] = metrics.peak_rss_bytes
+                args["flow_log_times_s"] = metrics.flow_log_times_s
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start_s * 1e6,
+                    "dur": span.wall_s * 1e6,
+                    "pid": metrics.pid,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+    for pid in sorted(pids):
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 0,
+                "args": {"name": f"worker {pid}"},
+            }
+        )
+    return events
+
+
+def write_chrome_trace(fp: Path, jobs: Iterable[tuple[str, RunMetrics]]) -> None:
+    """
+    Writes the spans of `jobs` as a Chrome trace-event JSON file, which
+    `chrome://tracing` and Perfetto show as a timeline per worker process.
+    """
+    data = {"traceEvents": chrome_trace_events(jobs), "displayTimeUnit": "ms"}
+    fp_tmp = fp.with_suffix(f".tmp.{os.getpid()}")
+    fp_tmp.write_text(json.dumps(data))
+    os.replace(fp_tmp, fp)
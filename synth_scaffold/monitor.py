@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+# Vitis HLS log lines that mark the start of each synthesis phase. Scheduling
+# and binding alternate once per module in hierarchical designs, so a phase
+# can be entered more than once and its time is accumulated.
+PHASE_PATTERNS: list[tuple[str, re.Pattern]] = [
+    ("elaboration", re.compile(r"Analyzing design file")),
+    ("transformation", re.compile(r"Starting code transformations")),
+    ("scheduling", re.compile(r"\[SCHED 204-\d+\]|Starting scheduling")),
+    (
+        "binding",
+        re.compile(r"\[BIND 205-\d+\]|Starting (?:binding|micro-architecture)"),
+    ),
+    ("rtl_generation", re.compile(r"\[RTGEN 206-\d+\]|Generating RTL for module")),
+]
+PHASES = tuple(phase for phase, _ in PHASE_PATTERNS)
+
+RUN_TIMEOUT = "run"
+
+
+@dataclass
+class ProgressEvent:
+    phase: str
+    elapsed_s: float
+    line: str
+
+
+class PhaseMonitor:
+    """
+    Follows the output of a running `vitis_hls` line by line, tracks which
+    synthesis phase it is in and how long each phase has taken, and decides
+    when the run has exceeded its wall-clock or per-phase timeout.
+
+    Each phase transition is passed to `on_progress` and, with `status_fp`
+    set, written to a JSON status file that other processes can poll.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float | None = None,
+        phase_timeouts_s: dict[str, float] | None = None,
+        status_fp: Path | None = None,
+        on_progress: Callable[[ProgressEvent], None] | None = None,
+    ) -> None:
+        phase_timeouts_s = dict(phase_timeouts_s or {})
+        unknown_phases = set(phase_timeouts_s) - set(PHASES)
+        if unknown_phases:
+            raise ValueError(
+                f"Unknown phases: {', '.join(sorted(unknown_phases))} (expected some of {', '.join(PHASES)})"
+            )
+
+        self.timeout_s = timeout_s
+        self.phase_timeouts_s = phase_timeouts_s
+        self.status_fp = status_fp
+        self.on_progress = on_progress
+
+        self.t_start = time.monotonic()
+        self.phase: str | None = None
+        self.phase_times_s: dict[str, float] = {}
+        self.events: list[ProgressEvent] = []
+
+        self._t_phase = self.t_start
+        self._lock = threading.Lock()
+        self.write_status("running")
+
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.t_start
+
+    def _phase_time_s(self, phase: str, now: float) -> float:
+        t = self.phase_times_s.get(phase, 0.0)
+        if phase == self.phase:
+            t += now - self._t_phase
+        return t
+
+    def feed(self, line: str) -> ProgressEvent | None:
+        """
+        Processes one line of tool output and returns the progress event if
+        the line starts a new phase.
+        """
+        for phase, pattern in PHASE_PATTERNS:
+            if pattern.search(line):
+                break
+        else:
+            return None
+
+        with self._lock:
+            if phase == self.phase:
+                return None
+            now = time.monotonic()
+            if self.phase is not None:
+                self.phase_times_s[self.phase] = self._phase_time_s(self.phase, now)
+            self.phase = phase
+            self._t_phase = now
+            event = ProgressEvent(phase=phase, elapsed_s=now - self.t_start, line=line)
+            self.events.append(event)
+
+        self.write_status("running")
+        if self.on_progress is not None:
+            self.on_progress(event)
+        return event
+
+    def timeout_reason(self) -> str | None:
+        """
+        `RUN_TIMEOUT` if the whole run took too long, the name of the current
+        phase if it took too long, otherwise `None`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.timeout_s is not None and now - self.t_start > self.timeout_s:
+                return RUN_TIMEOUT
+            if self.phase is None or self.phase not in self.phase_timeouts_s:
+                return None
+            if self._phase_time_s(self.phase, now) > self.phase_timeouts_s[self.phase]:
+                return self.phase
+        return None
+
+    def finish(self, state: str) -> dict[str, float]:
+        """
+        Closes the current phase, writes the final status and returns the
+        time spent in each phase, including the one the run ended in.
+        """
+        with self._lock:
+            if self.phase is not None:
+                now = time.monotonic()
+                self.phase_times_s[self.phase] = self._phase_time_s(self.phase, now)
+                self._t_phase = now
+        self.write_status(state)
+        return dict(self.phase_times_s)
+
+    def write_status(self, state: str) -> None:
+        if self.status_fp is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            data = {
+                "state": state,
+                "phase": self.phase,
+                "elapsed_s": now - self.t_start,
+                "phase_times_s": {
+                    phase: self._phase_time_s(phase, now)
+                    for phase in PHASES
+                    if phase in self.phase_times_s or phase == self.phase
+                },
+            }
+        status_fp_tmp = self.status_fp.with_suffix(f".tmp.{os.getpid()}")
+        status_fp_tmp.write_text(json.dumps(data, indent=4))
+        os.replace(status_fp_tmp, self.status_fp)
@@ -0,0 +1,130 @@
+"""
+A quick compile of generated scaffolds with the host C++ compiler, to reject
+configs that cannot compile (a template argument that breaks a
+`static_assert`, a block size that does not divide the input size, ...)
+before a `vitis_hls` run is spent on them.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .synth_scaffold import SynthScaffold
+
+PRECHECK_LOG_NAME = "precheck.log"
+# Vitis HLS compiles C++14 by default. __SYNTHESIS__ is not defined: the HLS
+# headers then take branches that only the HLS compiler can parse.
+DEFAULT_FLAGS = ["-std=c++14"]
+
+RE_MISSING_HEADER = re.compile(r"fatal error: .+: No such file or directory")
+
+
+def default_include_dirs() -> list[Path]:
+    """
+    The include directory with the HLS headers (`ap_int.h`, `hls_stream.h`,
+    ...) of the Vitis HLS install: `$XILINX_HLS/include`, or the one next
+    to the `vitis_hls` binary on PATH. Empty if neither exists.
+    """
+    candidates = []
+    if "XILINX_HLS" in os.environ:
+        candidates.append(Path(os.environ["XILINX_HLS"]) / "include")
+    bin_match = shutil.which("vitis_hls")
+    if bin_match is not None:
+        candidates.append(Path(os.path.realpath(bin_match)).parents[1] / "include")
+    return [d for d in candidates if (d / "ap_int.h").exists()][:1]
+
+
+@dataclass
+class PrecheckResult:
+    passed: bool
+    # the compiler's errors, empty if it had none
+    diagnostics: str
+    runtime_s: float
+
+
+class Precheck:
+    """
+    Compiles a generated `scaffold.cpp` with `compiler -fsyntax-only`, which
+    parses and instantiates every template but generates no code, so it
+    takes a fraction of a second.
+
+    The scaffold's own directory, the directories of its input source files
+    and `include_dirs` (by default those of `default_include_dirs()`) are
+    on the include path. The default `flags` select C++14, as during
+    synthesis, but leave `__SYNTHESIS__` undefined, as in C simulation,
+    since the HLS headers' synthesis branches need the HLS compiler.
+    Without HLS include directories, a scaffold that includes an HLS header
+    cannot be checked; a missing header then counts as a pass so that the
+    tool still gets to run it.
+    """
+
+    def __init__(
+        self,
+        include_dirs: list[Path] | None = None,
+        compiler: str = "g++",
+        flags: list[str] | None = None,
+        timeout_s: float = 60.0,
+    ) -> None:
+        if shutil.which(compiler) is None:
+            raise FileNotFoundError(f"Could not find the C++ compiler {compiler}")
+        self.include_dirs = (
+            default_include_dirs() if include_dirs is None else include_dirs
+        )
+        self.compiler = compiler
+        self.flags = list(DEFAULT_FLAGS) if flags is None else flags
+        self.timeout_s = timeout_s
+
+    def args(self, s: "SynthScaffold") -> list[str]:
+        source_dirs = dict.fromkeys(fp.resolve().parent for fp in s.input_source_files)
+        args = [self.compiler, "-fsyntax-only", "-w", *self.flags]
+        for d in [s.output_dir, *source_dirs, *self.include_dirs]:
+            args.append(f"-I{d}")
+        args.append(str(s.output_dir / "scaffold.cpp"))
+        return args
+
+    def check(self, s: "SynthScaffold") -> PrecheckResult:
+        """
+        Compiles the scaffold `s.generate()` wrote.
+        """
+        t_start = time.perf_counter()
+        try:
+            p = subprocess.run(
+                self.args(s),
+                capture_output=True,
+                text=True,
+                errors="replace",
+                timeout=self.timeout_s,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            # too slow to tell; leave it to the tool
+            return PrecheckResult(True, "", time.perf_counter() - t_start)
+        runtime_s = time.perf_counter() - t_start
+        diagnostics = p.stderr
+        passed = p.returncode == 0
+        if not passed and not self.include_dirs:
+            passed = RE_MISSING_HEADER.search(diagnostics) is not None
+        return PrecheckResult(passed, diagnostics, runtime_s)
+
+
+def precheck_all(
+    scaffolds: list["SynthScaffold"], max_workers: int | None = None
+) -> list[PrecheckResult | None]:
+    """
+    Runs each scaffold's `precheck` on a thread pool (default: one thread per
+    CPU). Scaffolds without a `precheck` get `None`.
+    """
+
+    def check(s: "SynthScaffold") -> PrecheckResult | None:
+        return s.precheck.check(s) if s.precheck is not None else None
+
+    n_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(check, scaffolds))
@@ -0,0 +1,198 @@
+import os
+import signal
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Self
+
+DIR_PROC = Path("/proc")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _children_map() -> dict[int, list[int]]:
+    children: dict[int, list[int]] = {}
+    for entry in os.scandir(DIR_PROC):
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat_txt = (DIR_PROC / entry.name / "stat").read_text()
+        except OSError:
+            continue
+        # the command name may contain spaces and parentheses, so split after
+        # the last ')'; the fields that follow are: state, ppid, ...
+        fields = stat_txt[stat_txt.rfind(")") + 2 :].split()
+        children.setdefault(int(fields[1]), []).append(int(entry.name))
+    return children
+
+
+def child_pids(pid: int) -> list[int]:
+    """
+    The direct children of process `pid`.
+    """
+    return _children_map().get(pid, [])
+
+
+def process_tree_pids(
+    pid: int, children: dict[int, list[int]] | None = None
+) -> list[int]:
+    if children is None:
+        children = _children_map()
+    pids = []
+    stack = [pid]
+    while stack:
+        p = stack.pop()
+        pids.append(p)
+        stack.extend(children.get(p, []))
+    return pids
+
+
+def process_rss(pid: int) -> int:
+    try:
+        statm_txt = (DIR_PROC / str(pid) / "statm").read_text()
+    except OSError:
+        return 0
+    return int(statm_txt.split()[1]) * PAGE_SIZE
+
+
+def process_tree_rss(pid: int) -> int | None:
+    """
+    Resident set size in bytes of a process and all of its descendants, or
+    `None` if process information is not available on this platform.
+
+    `vitis_hls` is a launcher script that starts the actual tool as a child
+    process, so the whole tree has to be summed to see its real footprint.
+    """
+    if not DIR_PROC.is_dir():
+        return None
+    return sum(process_rss(p) for p in process_tree_pids(pid))
+
+
+def process_tree_rss_many(pids: Iterable[int]) -> dict[int, int] | None:
+    """
+    `process_tree_rss()` of several processes from a single scan of `/proc`.
+    """
+    if not DIR_PROC.is_dir():
+        return None
+    children = _children_map()
+    return {
+        pid: sum(process_rss(p) for p in process_tree_pids(pid, children))
+        for pid in pids
+    }
+
+
+def kill_process_group(pid: int) -> None:
+    """
+    Sends SIGKILL to the process group led by `pid`, i.e. a tool started with
+    `start_new_session=True` and everything it spawned.
+    """
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def process_exists(pid: int) -> bool:
+    """
+    Whether a process with id `pid` exists on this host.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # it exists, but belongs to another user
+        return True
+    return True
+
+
+class RssSampler:
+    """
+    Samples the RSS of a process tree on a background thread and keeps the
+    peak. Use as a context manager around the lifetime of the process.
+    """
+
+    def __init__(self, pid: int, interval_s: float = 1.0) -> None:
+        self.pid = pid
+        self.interval_s = interval_s
+        self.peak_rss_bytes: int | None = None
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+
+    def sample(self) -> None:
+        self.record(process_tree_rss(self.pid))
+
+    def record(self, rss: int | None) -> None:
+        if rss is None:
+            return
+        if self.peak_rss_bytes is None or rss > self.peak_rss_bytes:
+            self.peak_rss_bytes = rss
+
+    def _sample_loop(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval_s)
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class RssSamplerGroup:
+    """
+    Samples many `RssSampler`s on one background thread, with a single scan
+    of `/proc` per interval for all of them, for callers that supervise many
+    processes at once. The thread runs while samplers are added, and takes
+    the place of their own threads.
+    """
+
+    def __init__(self, interval_s: float = 1.0) -> None:
+        self.interval_s = interval_s
+        self._samplers: set[RssSampler] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, sampler: RssSampler) -> None:
+        with self._lock:
+            self._samplers.add(sampler)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+                self._thread.start()
+        # a new process is sampled right away, not at the next interval
+        self._wakeup.set()
+
+    def remove(self, sampler: RssSampler) -> None:
+        with self._lock:
+            self._samplers.discard(sampler)
+
+    def _sample_loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                samplers = list(self._samplers)
+                if not samplers:
+                    self._thread = None
+                    return
+            rss = process_tree_rss_many({s.pid for s in samplers})
+            for sampler in samplers:
+                sampler.record(rss[sampler.pid] if rss is not None else None)
+            self._wakeup.wait(self.interval_s)
+
+
+def available_memory_bytes() -> int | None:
+    """
+    `MemAvailable` from `/proc/meminfo`, or `None` if it cannot be read.
+    """
+    try:
+        meminfo_txt = (DIR_PROC / "meminfo").read_text()
+    except OSError:
+        return None
+    for line in meminfo_txt.splitlines():
+        if line.startswith("MemAvailable:"):
+            return int(line.split()[1]) * 1024
+    return None
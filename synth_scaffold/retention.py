@@ -0,0 +1,243 @@
+"""
+What is kept of finished runs. The tool's project directory takes hundreds
+of megabytes per run, almost none of which is needed once the report has
+been read. `apply_retention()` cuts a run down to its reports and logs or
+packs its project into one compressed archive, and `gc()` does that to the
+oldest runs under a directory until they fit in a size budget. Reports of
+archived runs stay readable with `SynthReport.from_report_dir()`.
+"""
+
+import argparse
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .archive import archive_dir, archive_path, unarchive_paths
+from .synth_scaffold import PROJECT_DIR_NAME, RETENTION_MODES, RUN_RESULT_PATHS
+
+RUN_STATUS_NAME = "run_status.json"
+
+
+def disk_usage_bytes(path: Path) -> int:
+    """
+    The disk space taken by the file or directory tree at `path`.
+    """
+    try:
+        st = path.lstat()
+    except FileNotFoundError:
+        return 0
+    total = st.st_blocks * 512
+    if path.is_dir() and not path.is_symlink():
+        for root, dir_names, file_names in os.walk(path):
+            for name in dir_names + file_names:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_blocks * 512
+                except FileNotFoundError:
+                    pass
+    return total
+
+
+def _unkept_paths(dir_path: Path, kept: list[Path]) -> Iterator[Path]:
+    """
+    The topmost files and directories under `dir_path` that are neither in
+    `kept` nor on the way to something in it.
+    """
+    for entry in os.scandir(dir_path):
+        path = Path(entry.path)
+        if any(path.is_relative_to(k) for k in kept):
+            continue
+        if entry.is_dir(follow_symlinks=False) and any(
+            k.is_relative_to(path) for k in kept
+        ):
+            yield from _unkept_paths(path, kept)
+        else:
+            yield path
+
+
+def run_retention(output_dir: Path) -> str | None:
+    """
+    The retention mode a run's project is in: "archive" if it has been
+    archived, "reports" if only `RUN_RESULT_PATHS` are left of it, "all"
+    otherwise, or `None` if `output_dir` has no project.
+    """
+    project_dir = output_dir / PROJECT_DIR_NAME
+    if archive_path(project_dir).is_file():
+        return "archive"
+    if not project_dir.is_dir():
+        return None
+    kept = [output_dir / p for p in RUN_RESULT_PATHS]
+    for _ in _unkept_paths(project_dir, kept):
+        return "all"
+    return "reports"
+
+
+def apply_retention(output_dir: Path, mode: str) -> None:
+    """
+    Reduces the project of the run in `output_dir` to what `mode` keeps:
+        - "all": everything
+        - "reports": only `RUN_RESULT_PATHS`, i.e. the reports and logs
+        - "archive": everything, packed into one compressed archive that
+          replaces the project directory
+    An archived run can be reduced to its reports, which are extracted from
+    the archive again. Applying a mode the run is already in does nothing.
+    """
+    if mode not in RETENTION_MODES:
+        raise ValueError(
+            f"Unknown retention mode: {mode} (expected one of {', '.join(RETENTION_MODES)})"
+        )
+    project_dir = output_dir / PROJECT_DIR_NAME
+    archive_fp = archive_path(project_dir)
+    if mode == "reports":
+        if archive_fp.is_file():
+            unarchive_paths(archive_fp, list(RUN_RESULT_PATHS))
+        if project_dir.is_dir():
+            kept = [output_dir / p for p in RUN_RESULT_PATHS]
+            for path in list(_unkept_paths(project_dir, kept)):
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+    elif mode == "archive":
+        if project_dir.is_dir():
+            archive_dir(project_dir)
+
+
+@dataclass
+class RunDir:
+    output_dir: Path
+    retention: str
+    size_bytes: int
+    # when the tool last ran here
+    mtime: float
+
+    @classmethod
+    def from_output_dir(cls, output_dir: Path) -> "RunDir | None":
+        retention = run_retention(output_dir)
+        if retention is None:
+            return None
+        project_dir = output_dir / PROJECT_DIR_NAME
+        stamp_fps = [output_dir / "csynth.log", archive_path(project_dir), project_dir]
+        mtime = next(fp.stat().st_mtime for fp in stamp_fps if fp.exists())
+        return cls(
+            output_dir=output_dir,
+            retention=retention,
+            size_bytes=disk_usage_bytes(output_dir),
+            mtime=mtime,
+        )
+
+    def is_running(self) -> bool:
+        try:
+            status = json.loads((self.output_dir / RUN_STATUS_NAME).read_text())
+        except (OSError, ValueError):
+            return False
+        return status.get("state") == "running"
+
+
+def find_run_dirs(root_dir: Path) -> list[RunDir]:
+    """
+    Every run under `root_dir`, i.e. every directory with a project
+    directory or a project archive in it, in sorted order. Runs are not
+    descended into.
+    """
+    run_dirs = []
+    stack = [root_dir]
+    while stack:
+        dir_path = stack.pop()
+        run_dir = RunDir.from_output_dir(dir_path)
+        if run_dir is not None:
+            run_dirs.append(run_dir)
+            continue
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+    return sorted(run_dirs, key=lambda r: r.output_dir)
+
+
+@dataclass
+class GcResult:
+    size_before_bytes: int
+    size_after_bytes: int
+    # output directories of the runs that were reduced
+    reduced: list[Path]
+
+    def text_summary(self) -> str:
+        txt = ""
+        txt += f"Runs Reduced: {len(self.reduced)}\n"
+        txt += f"Size Before: {self.size_before_bytes / 1024**3:.2f} GiB\n"
+        txt += f"Size After: {self.size_after_bytes / 1024**3:.2f} GiB\n"
+        return txt
+
+
+def gc(
+    root_dir: Path,
+    max_bytes: int,
+    mode: str = "archive",
+) -> GcResult:
+    """
+    Applies the retention `mode` to the runs under `root_dir`, least
+    recently run first, until the runs take at most `max_bytes` of disk
+    space in total. Runs that are already in `mode` or that are still
+    running are skipped.
+    """
+    if mode == "all":
+        raise ValueError('Retention mode "all" frees no space')
+    run_dirs = find_run_dirs(root_dir)
+    size_before = sum(r.size_bytes for r in run_dirs)
+    size = size_before
+    reduced = []
+    for run_dir in sorted(run_dirs, key=lambda r: r.mtime):
+        if size <= max_bytes:
+            break
+        if run_dir.retention == mode or run_dir.is_running():
+            continue
+        reduced.append(run_dir.output_dir)
+        apply_retention(run_dir.output_dir, mode)
+        size += disk_usage_bytes(run_dir.output_dir) - run_dir.size_bytes
+    return GcResult(
+        size_before_bytes=size_before,
+        size_after_bytes=size,
+        reduced=reduced,
+    )
+
+
+def main(args=None) -> bool:
+    parser = argparse.ArgumentParser(
+        prog="synth-scaffold gc",
+        description="Shrink the oldest runs under a directory until they fit in a size budget",
+    )
+    parser.add_argument(
+        "root_dir",
+        type=Path,
+        help="Directory with the runs, e.g. the output_dir of a sweep",
+    )
+    parser.add_argument(
+        "--max-size-gb",
+        type=float,
+        required=True,
+        help="Disk space the runs may take in total",
+    )
+    parser.add_argument(
+        "--retention",
+        type=str,
+        choices=[m for m in RETENTION_MODES if m != "all"],
+        default="archive",
+        help="What to keep of each run that is shrunk",
+    )
+    args = parser.parse_args(args)
+
+    max_bytes = int(args.max_size_gb * 1024**3)
+    result = gc(args.root_dir, max_bytes, mode=args.retention)
+    for output_dir in result.reduced:
+        print(f"Reduced: {output_dir}")
+    print(result.text_summary(), end="")
+    if result.size_after_bytes > max_bytes:
+        print("The runs do not fit in the budget.")
+        return False
+    return True
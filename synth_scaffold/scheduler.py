@@ -0,0 +1,141 @@
+import json
+import os
+import signal
+from collections.abc import Callable, Collection
+from pathlib import Path
+from typing import Any
+
+from .resources import available_memory_bytes
+from .synth_scaffold import RunInfo, config_key
+
+# a SIGKILL from the kernel OOM killer shows up as -9 for a direct child and
+# as 137 when it passes through a launcher shell script such as vitis_hls
+OOM_RETURN_CODES = (-signal.SIGKILL, 128 + signal.SIGKILL)
+
+DEFAULT_ESTIMATE_BYTES = 4 * 1024**3
+
+
+def is_oom_kill(run_info: RunInfo | None) -> bool:
+    # runs killed for exceeding a timeout also end with SIGKILL
+    return (
+        run_info is not None
+        and run_info.timed_out is None
+        and run_info.returncode in OOM_RETURN_CODES
+    )
+
+
+class MemoryHistory:
+    """
+    Peak RSS of past `vitis_hls` runs, keyed by config and persisted as JSON
+    so that later sweeps start with a memory model of their configs.
+    """
+
+    def __init__(self, history_fp: Path | None = None) -> None:
+        self.history_fp = history_fp
+        self.records: dict[str, dict[str, Any]] = {}
+        if history_fp is not None and history_fp.exists():
+            self.records = json.loads(history_fp.read_text())
+
+    def record(self, config: dict[str, Any], peak_rss_bytes: int) -> None:
+        key = config_key(config)
+        previous = self.records.get(key, {}).get("peak_rss_bytes", 0)
+        self.records[key] = {
+            "target_fn": config["target_fn"],
+            "peak_rss_bytes": max(previous, peak_rss_bytes),
+        }
+
+    def estimate(self, config: dict[str, Any]) -> int | None:
+        """
+        Known peak of this exact config, otherwise the largest peak seen for
+        the same target function, otherwise `None`.
+        """
+        record = self.records.get(config_key(config))
+        if record is not None:
+            return int(record["peak_rss_bytes"])
+        peaks = [
+            int(r["peak_rss_bytes"])
+            for r in self.records.values()
+            if r["target_fn"] == config["target_fn"]
+        ]
+        if peaks:
+            return max(peaks)
+        return None
+
+    def save(self) -> None:
+        if self.history_fp is None:
+            return
+        self.history_fp.parent.mkdir(parents=True, exist_ok=True)
+        history_fp_tmp = self.history_fp.with_suffix(f".tmp.{os.getpid()}")
+        history_fp_tmp.write_text(json.dumps(self.records, indent=4))
+        os.replace(history_fp_tmp, self.history_fp)
+
+
+class AdmissionController:
+    """
+    Decides when another synthesis job may start.
+
+    A job is admitted only while the number of running jobs is below both the
+    concurrency cap and the number of tool licenses/seats, and while the
+    projected memory of all running jobs plus the new one stays within
+    `memory_budget_bytes`. Projections come from the `MemoryHistory`, falling
+    back to `default_estimate_bytes` for targets never seen before. With a
+    budget, the new job's projection must also fit in the memory the host
+    has available right now (`available_memory()`, by default `MemAvailable`),
+    which other users of the host may have taken out of the budget. A job is
+    always admitted when nothing is running so that a sweep cannot stall on a
+    config larger than the whole budget.
+
+    When a job is OOM-killed, the concurrency cap is halved so that its
+    retry, and everything after it, runs with fewer neighbours.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        memory_budget_bytes: int | None = None,
+        licenses: int | None = None,
+        history: MemoryHistory | None = None,
+        default_estimate_bytes: int = DEFAULT_ESTIMATE_BYTES,
+        available_memory: Callable[[], int | None] = available_memory_bytes,
+    ) -> None:
+        self.max_concurrency = max_workers
+        self.memory_budget_bytes = memory_budget_bytes
+        self.licenses = licenses
+        self.history = history if history is not None else MemoryHistory()
+        self.default_estimate_bytes = default_estimate_bytes
+        self.available_memory = available_memory
+
+    def estimate(self, config: dict[str, Any]) -> int:
+        estimate = self.history.estimate(config)
+        if estimate is None:
+            return self.default_estimate_bytes
+        return estimate
+
+    def admit(
+        self, config: dict[str, Any], running: Collection[dict[str, Any]]
+    ) -> bool:
+        n_running = len(running)
+        if n_running >= self.max_concurrency:
+            return False
+        if self.licenses is not None and n_running >= self.licenses:
+            return False
+        if n_running == 0:
+            return True
+        if self.memory_budget_bytes is not None:
+            estimate = self.estimate(config)
+            projected = sum(self.estimate(c) for c in running) + estimate
+            if projected > self.memory_budget_bytes:
+                return False
+            available = self.available_memory()
+            if available is not None and estimate > available:
+                return False
+        return True
+
+    def record(self, config: dict[str, Any], run_info: RunInfo | None) -> None:
+        if run_info is None or run_info.peak_rss_bytes is None:
+            return
+        self.history.record(config, run_info.peak_rss_bytes)
+        self.history.save()
+
+    def on_oom(self, n_running: int) -> None:
+        self.max_concurrency = max(1, min(self.max_concurrency, n_running) // 2)
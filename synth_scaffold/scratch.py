@@ -0,0 +1,73 @@
+"""
+Private working directories on fast local storage (e.g. `/dev/shm` or
+`$TMPDIR`) for `vitis_hls` runs, so that the tool's intermediate files never
+touch the disk or network filesystem that holds `output_dir`.
+"""
+
+import os
+import re
+import shutil
+import socket
+import tempfile
+from pathlib import Path
+
+from .resources import process_exists
+from .synth_scaffold import RUN_RESULT_PATHS
+
+SCRATCH_PREFIX = "synth_scaffold"
+RE_SCRATCH_NAME = re.compile(
+    rf"^{SCRATCH_PREFIX}\.(?P<host>.+)\.(?P<pid>\d+)\.[a-z0-9_]+$"
+)
+
+
+def make_scratch_dir(scratch_dir: Path) -> Path:
+    """
+    Creates a new, empty working directory under `scratch_dir`. Its name
+    records the host and process that own it, for
+    `remove_stale_scratch_dirs()`.
+    """
+    scratch_dir.mkdir(parents=True, exist_ok=True)
+    prefix = f"{SCRATCH_PREFIX}.{socket.gethostname()}.{os.getpid()}."
+    return Path(tempfile.mkdtemp(prefix=prefix, dir=scratch_dir))
+
+
+def remove_stale_scratch_dirs(scratch_dir: Path) -> list[Path]:
+    """
+    Removes the working directories under `scratch_dir` left behind by
+    processes on this host that no longer exist, e.g. because they were
+    killed with SIGKILL before they could clean up. Returns the removed
+    directories.
+    """
+    hostname = socket.gethostname()
+    removed = []
+    try:
+        entries = list(os.scandir(scratch_dir))
+    except FileNotFoundError:
+        return removed
+    for entry in entries:
+        m = RE_SCRATCH_NAME.match(entry.name)
+        if m is None or m.group("host") != hostname:
+            continue
+        if process_exists(int(m.group("pid"))):
+            continue
+        shutil.rmtree(entry.path, ignore_errors=True)
+        removed.append(Path(entry.path))
+    return removed
+
+
+def copy_back(work_dir: Path, output_dir: Path) -> None:
+    """
+    Copies `RUN_RESULT_PATHS` from `work_dir` into the same places under
+    `output_dir`, replacing what is there. Paths the run did not get to
+    write are skipped.
+    """
+    for path in RUN_RESULT_PATHS:
+        src = work_dir / path
+        dst = output_dir / path
+        if src.is_dir():
+            if dst.exists():
+                shutil.rmtree(dst)
+            shutil.copytree(src, dst)
+        elif src.is_file():
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, dst)
@@ -0,0 +1,341 @@
+import dataclasses
+import math
+import os
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .sweep import (
+    DesignPoint,
+    DesignSpace,
+    apply_design_point,
+    design_point_id,
+    expand_design_space,
+    sweep,
+)
+from .synth_scaffold import SynthReport, config_key
+
+
+@dataclass
+class Objective:
+    """
+    A `SynthReport` field or property to optimize, e.g.
+    `Objective("latency_t_computed_average_case")` or
+    `Objective("resources_lut_used", weight=1e-9)`.
+    """
+
+    name: str
+    direction: Literal["min", "max"] = "min"
+    weight: float = 1.0
+
+    def __post_init__(self) -> None:
+        field_names = {f.name for f in dataclasses.fields(SynthReport)}
+        is_property = isinstance(getattr(SynthReport, self.name, None), property)
+        if self.name not in field_names and not is_property:
+            raise ValueError(f"SynthReport has no field or property {self.name}")
+        if self.direction not in ("min", "max"):
+            raise ValueError(
+                f"Unknown direction: {self.direction} (expected min or max)"
+            )
+
+
+def score_report(
+    report: SynthReport | None, objectives: Sequence[Objective]
+) -> float | None:
+    """
+    Weighted sum of the objectives, signed so that lower is always better, or
+    `None` for a failed run or a report that lacks one of the values.
+    """
+    if report is None:
+        return None
+    score = 0.0
+    for objective in objectives:
+        value = getattr(report, objective.name)
+        if value is None:
+            return None
+        sign = 1.0 if objective.direction == "min" else -1.0
+        score += sign * objective.weight * float(value)
+    return score
+
+
+class SearchStrategy(ABC):
+    """
+    Proposes design points to synthesize through an ask/tell interface.
+
+    `ask(n)` returns up to `n` new points to evaluate; an empty list means
+    the strategy has nothing left to propose. Every asked point must be
+    reported back through `tell()` with its score (lower is better) or
+    `None` if synthesis failed, before the next `ask()`.
+    """
+
+    def __init__(self) -> None:
+        self.history: list[tuple[DesignPoint, float | None]] = []
+
+    @abstractmethod
+    def ask(self, n: int) -> list[DesignPoint]:
+        """
+        Returns up to `n` new design points to synthesize.
+        """
+
+    @abstractmethod
+    def tell(self, point: DesignPoint, score: float | None) -> None:
+        """
+        Records the score of an asked point. Subclasses call this through
+        `super().tell()` for the scores that should count towards `best()`.
+        """
+        self.history.append((point, score))
+
+    def best(self) -> tuple[DesignPoint, float] | None:
+        scored = [(p, s) for p, s in self.history if s is not None]
+        if not scored:
+            return None
+        return min(scored, key=lambda x: x[1])
+
+
+class RandomSearch(SearchStrategy):
+    """
+    Samples design points uniformly at random without replacement.
+    """
+
+    def __init__(self, design_space: DesignSpace, seed: int | None = None) -> None:
+        super().__init__()
+        self.points = expand_design_space(design_space)
+        random.Random(seed).shuffle(self.points)
+
+    def ask(self, n: int) -> list[DesignPoint]:
+        batch = self.points[:n]
+        del self.points[:n]
+        return batch
+
+    def tell(self, point: DesignPoint, score: float | None) -> None:
+        super().tell(point, score)
+
+
+class SuccessiveHalving(SearchStrategy):
+    """
+    Evaluates many design points cheaply and spends full-cost runs only on
+    the most promising ones.
+
+    Every point is first synthesized at the lowest fidelity, e.g. a small
+    problem size set through the template argument `fidelity_name`. The best
+    `1 / eta` of them are promoted to the next value of `fidelity_values`,
+    and so on until the last value, which should be the real problem size.
+    Only scores from the final rung count towards `best()`.
+    """
+
+    def __init__(
+        self,
+        design_space: DesignSpace,
+        fidelity_name: str,
+        fidelity_values: Sequence[Any],
+        eta: int = 3,
+        n_initial: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__()
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        if not fidelity_values:
+            raise ValueError("fidelity_values must not be empty")
+
+        points = expand_design_space(design_space)
+        if any(fidelity_name in point for point in points):
+            raise ValueError(f"{fidelity_name} is the fidelity and cannot be searched")
+        rng = random.Random(seed)
+        if n_initial is not None and n_initial < len(points):
+            points = rng.sample(points, n_initial)
+
+        self.fidelity_name = fidelity_name
+        self.fidelity_values = list(fidelity_values)
+        self.eta = eta
+        self.rung = 0
+
+        self._queue = points
+        self._n_pending = 0
+        self._rung_results: list[tuple[DesignPoint, float | None]] = []
+
+    def ask(self, n: int) -> list[DesignPoint]:
+        if self.rung >= len(self.fidelity_values):
+            return []
+        batch = self._queue[:n]
+        del self._queue[:n]
+        self._n_pending += len(batch)
+        fidelity = self.fidelity_values[self.rung]
+        return [{**point, self.fidelity_name: fidelity} for point in batch]
+
+    def tell(self, point: DesignPoint, score: float | None) -> None:
+        if point.get(self.fidelity_name) == self.fidelity_values[-1]:
+            super().tell(point, score)
+
+        point = {k: v for k, v in point.items() if k != self.fidelity_name}
+        self._rung_results.append((point, score))
+        self._n_pending -= 1
+
+        if self._queue or self._n_pending > 0:
+            return
+        # the rung is complete: promote the best points to the next fidelity
+        scored = sorted(
+            ((p, s) for p, s in self._rung_results if s is not None),
+            key=lambda x: x[1],
+        )
+        n_promoted = max(1, len(scored) // self.eta) if scored else 0
+        self._queue = [p for p, _ in scored[:n_promoted]]
+        self._rung_results = []
+        self.rung += 1
+
+
+class TPESearch(SearchStrategy):
+    """
+    Tree-structured Parzen estimator search over categorical dimensions.
+
+    After `n_startup` random points, the points told so far are split into
+    the best `gamma` fraction and the rest. For each dimension, the frequency
+    of every value among the good and the bad points (with add-one
+    smoothing) gives the densities `l(x)` and `g(x)`. Candidates are drawn
+    from `l(x)`, and the unseen candidate with the largest `l(x) / g(x)` is
+    proposed next. Failed runs count as bad points.
+    """
+
+    def __init__(
+        self,
+        design_space: Mapping[str, Sequence[Any]],
+        n_startup: int = 10,
+        gamma: float = 0.25,
+        n_candidates: int = 24,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__()
+        if not isinstance(design_space, Mapping):
+            raise TypeError("TPESearch needs a mapping of names to candidate values")
+        self.dimensions = {name: list(values) for name, values in design_space.items()}
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.rng = random.Random(seed)
+
+        self.n_points = math.prod(len(values) for values in self.dimensions.values())
+        self._seen: set[str] = set()
+
+    def _random_point(self) -> DesignPoint:
+        return {
+            name: self.rng.choice(values) for name, values in self.dimensions.items()
+        }
+
+    def _random_unseen_point(self) -> DesignPoint:
+        # rejection sampling is fast while most of the space is unseen; fall
+        # back to enumerating what is left once it fills up
+        for _ in range(100):
+            point = self._random_point()
+            if design_point_id(point) not in self._seen:
+                return point
+        unseen = [
+            p
+            for p in expand_design_space(self.dimensions)
+            if design_point_id(p) not in self._seen
+        ]
+        return self.rng.choice(unseen)
+
+    def _densities(self, points: list[DesignPoint]) -> dict[str, dict[str, float]]:
+        densities = {}
+        for name, values in self.dimensions.items():
+            counts = {design_point_id(v): 1.0 for v in values}
+            for point in points:
+                counts[design_point_id(point[name])] += 1.0
+            total = sum(counts.values())
+            densities[name] = {v: c / total for v, c in counts.items()}
+        return densities
+
+    def _propose(self) -> DesignPoint:
+        if len(self.history) < self.n_startup:
+            return self._random_unseen_point()
+
+        scored = sorted(
+            ((p, s) for p, s in self.history if s is not None), key=lambda x: x[1]
+        )
+        n_good = max(1, math.ceil(self.gamma * len(scored))) if scored else 0
+        good = [p for p, _ in scored[:n_good]]
+        bad = [p for p, _ in scored[n_good:]]
+        bad += [p for p, s in self.history if s is None]
+        l_densities = self._densities(good)
+        g_densities = self._densities(bad)
+
+        def draw(name: str) -> Any:
+            values = self.dimensions[name]
+            weights = [l_densities[name][design_point_id(v)] for v in values]
+            return self.rng.choices(values, weights=weights)[0]
+
+        best_point = None
+        best_ratio = -math.inf
+        for _ in range(self.n_candidates):
+            point = {name: draw(name) for name in self.dimensions}
+            if design_point_id(point) in self._seen:
+                continue
+            ratio = 0.0
+            for name, value in point.items():
+                value_id = design_point_id(value)
+                ratio += math.log(l_densities[name][value_id])
+                ratio -= math.log(g_densities[name][value_id])
+            if ratio > best_ratio:
+                best_point, best_ratio = point, ratio
+        if best_point is None:
+            return self._random_unseen_point()
+        return best_point
+
+    def ask(self, n: int) -> list[DesignPoint]:
+        batch = []
+        while len(batch) < n and len(self._seen) < self.n_points:
+            point = self._propose()
+            self._seen.add(design_point_id(point))
+            batch.append(point)
+        return batch
+
+    def tell(self, point: DesignPoint, score: float | None) -> None:
+        super().tell(point, score)
+
+
+def search(
+    base_config: dict[str, Any],
+    strategy: SearchStrategy,
+    objectives: Sequence[Objective],
+    budget: int,
+    max_workers: int | None = None,
+    **kwargs: Any,
+) -> Iterator[tuple[dict[str, Any], SynthReport | None, float | None]]:
+    """
+    Lets `strategy` pick which design points to synthesize, up to `budget`
+    synthesis runs, and yields `(config, report, score)` for each run.
+
+    Points are asked for in batches of `max_workers` and synthesized with
+    `sweep()`, which receives the remaining keyword arguments (cache, memory
+    budget, timeouts, ...). Each batch is scored with `objectives` and told
+    to the strategy before the next batch is asked for.
+    """
+    objectives = list(objectives)
+    if not objectives:
+        raise ValueError("At least one objective is required")
+    n_slots = max_workers if max_workers is not None else (os.cpu_count() or 1)
+
+    n_runs = 0
+    while n_runs < budget:
+        points = strategy.ask(min(n_slots, budget - n_runs))
+        if not points:
+            break
+        points_by_key: dict[str, list[DesignPoint]] = {}
+        for point in points:
+            key = config_key(apply_design_point(base_config, point))
+            points_by_key.setdefault(key, []).append(point)
+
+        for config, report in sweep(
+            base_config, points, max_workers=max_workers, **kwargs
+        ):
+            score = score_report(report, objectives)
+            # points that map to the same config are synthesized only once
+            for point in points_by_key.pop(config_key(config), []):
+                strategy.tell(point, score)
+            yield config, report, score
+        for leftover_points in points_by_key.values():
+            for point in leftover_points:
+                strategy.tell(point, None)
+        n_runs += len(points)
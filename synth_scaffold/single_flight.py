@@ -0,0 +1,125 @@
+"""
+Single-flight synthesis across processes and hosts that share a
+filesystem. While one requester runs a config, others that request the same
+config (by `config_key()`, so under any spelling of it) wait for that run
+and take its report instead of starting another `vitis_hls`.
+
+Requesters serialize on an `flock()` of a lock file per key. The requester
+that runs the tool publishes its report next to the lock before releasing
+it. A requester that had to wait takes the report if it was published while
+it waited; if the run failed or its process died, the waiter runs the
+config itself. Only reports of runs that were in flight when a requester
+arrived are shared, so a published report is never reused for a later
+request, e.g. after the sources changed.
+"""
+
+import fcntl
+import json
+import os
+from pathlib import Path
+from typing import IO
+
+from .synth_scaffold import SynthReport
+
+
+def _file_id(fp: Path) -> tuple[int, int] | None:
+    """
+    Identifies the version of `fp`, which is replaced as a whole whenever it
+    is written, or `None` if it does not exist.
+    """
+    try:
+        st = fp.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def _read_report(result_fp: Path) -> SynthReport | None:
+    try:
+        result = json.loads(result_fp.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if result["report"] is None:
+        return None
+    return SynthReport.from_dict(result["report"])
+
+
+class Flight:
+    """
+    A held single-flight lock for one key. `shared_report` is the report of
+    the run this flight waited for, if there was one and it succeeded;
+    otherwise the holder is expected to run the config and `publish()` the
+    outcome. The lock is held until `release()`.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        lock_file: IO[str],
+        result_fp: Path,
+        shared_report: SynthReport | None,
+    ) -> None:
+        self.key = key
+        self.lock_file = lock_file
+        self.result_fp = result_fp
+        self.shared_report = shared_report
+
+    def publish(self, report: SynthReport | None) -> None:
+        result = {
+            "key": self.key,
+            "report": report.to_dict() if report is not None else None,
+        }
+        result_fp_tmp = self.result_fp.with_suffix(f".tmp.{os.getpid()}")
+        result_fp_tmp.write_text(json.dumps(result, indent=4))
+        os.replace(result_fp_tmp, self.result_fp)
+
+    def release(self) -> None:
+        if self.lock_file.closed:
+            return
+        fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        self.lock_file.close()
+
+
+class SingleFlight:
+    """
+    Single-flight locks and the reports of the runs that held them, one lock
+    file and one result file per key in `flight_dir`. Every requester that
+    should share runs must use the same directory.
+
+    Locks are taken per open file, so threads of one process exclude each
+    other as well as separate processes. A lock is released by the kernel
+    when its holder dies.
+    """
+
+    def __init__(self, flight_dir: Path) -> None:
+        self.flight_dir = flight_dir
+        self.flight_dir.mkdir(parents=True, exist_ok=True)
+
+    def lock_fp(self, key: str) -> Path:
+        return self.flight_dir / f"{key}.lock"
+
+    def result_fp(self, key: str) -> Path:
+        return self.flight_dir / f"{key}.json"
+
+    def acquire(self, key: str) -> Flight:
+        """
+        Takes the lock for `key`, blocking while another requester holds it.
+        """
+        result_fp = self.result_fp(key)
+        result_id = _file_id(result_fp)
+        lock_file = self.lock_fp(key).open("a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return Flight(key, lock_file, result_fp, None)
+        except BlockingIOError:
+            pass
+
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except BaseException:
+            lock_file.close()
+            raise
+        shared_report = None
+        if _file_id(result_fp) != result_id:
+            shared_report = _read_report(result_fp)
+        return Flight(key, lock_file, result_fp, shared_report)
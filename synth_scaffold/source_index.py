@@ -0,0 +1,99 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from .lexer import FunctionSignature, find_function_signatures
+
+INDEX_VERSION = 2
+
+
+class SourceIndex:
+    """
+    Index of the function signatures declared in a set of source files.
+
+    Each file is scanned once and its signatures are stored together with
+    the file's mtime and size. Later lookups only `stat()` the files and
+    rescan the ones that changed, so repeated `generate()` calls over a large
+    library skip reading and parsing sources altogether. With `index_fp`
+    set, the index is persisted as JSON and shared across processes and
+    sessions.
+    """
+
+    def __init__(self, index_fp: Path | None = None) -> None:
+        self.index_fp = index_fp
+        self.files: dict[str, dict[str, Any]] = {}
+        self._by_name: dict[str, list[FunctionSignature]] | None = None
+
+        if index_fp is not None and index_fp.exists():
+            data = json.loads(index_fp.read_text())
+            if data.get("version") == INDEX_VERSION:
+                self.files = data["files"]
+
+    @staticmethod
+    def _file_id(fp: Path) -> str:
+        return str(fp.resolve())
+
+    def update(self, source_files: list[Path]) -> int:
+        """
+        Rescans every file whose mtime or size changed since it was last
+        indexed. Returns the number of files scanned.
+        """
+        n_scanned = 0
+        for fp in source_files:
+            file_id = self._file_id(fp)
+            st = fp.stat()
+            entry = self.files.get(file_id)
+            if (
+                entry is not None
+                and entry["mtime_ns"] == st.st_mtime_ns
+                and entry["size"] == st.st_size
+            ):
+                continue
+
+            signatures = find_function_signatures(fp.read_text(), Path(file_id))
+            self.files[file_id] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "signatures": [sig.to_dict() for sig in signatures],
+            }
+            n_scanned += 1
+
+        if n_scanned > 0:
+            self._by_name = None
+            self.save()
+        return n_scanned
+
+    def _name_table(self) -> dict[str, list[FunctionSignature]]:
+        if self._by_name is None:
+            self._by_name = {}
+            for entry in self.files.values():
+                for sig_data in entry["signatures"]:
+                    sig = FunctionSignature.from_dict(sig_data)
+                    self._by_name.setdefault(sig.name, []).append(sig)
+        return self._by_name
+
+    def lookup(self, name: str, source_files: list[Path]) -> FunctionSignature | None:
+        """
+        Signature of `name` from the first file in `source_files` that
+        declares it, or `None`.
+        """
+        self.update(source_files)
+
+        candidates = self._name_table().get(name, [])
+        if not candidates:
+            return None
+        file_order = {self._file_id(fp): i for i, fp in enumerate(source_files)}
+        candidates = [c for c in candidates if str(c.file) in file_order]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda c: file_order[str(c.file)])
+
+    def save(self) -> None:
+        if self.index_fp is None:
+            return
+        data = {"version": INDEX_VERSION, "files": self.files}
+        self.index_fp.parent.mkdir(parents=True, exist_ok=True)
+        index_fp_tmp = self.index_fp.with_suffix(f".tmp.{os.getpid()}")
+        index_fp_tmp.write_text(json.dumps(data))
+        os.replace(index_fp_tmp, self.index_fp)
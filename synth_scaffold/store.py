@@ -0,0 +1,423 @@
+import dataclasses
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .synth_scaffold import (
+    REPORT_DIR_PATH,
+    RunInfo,
+    SynthReport,
+    canonical_config,
+    config_key,
+    find_report_dirs,
+    normalize_cpp,
+    read_tool_version,
+    unwrap,
+)
+from .table import DERIVED_COLUMNS
+
+SQL_TYPES: dict[Any, str] = {int: "INTEGER", float: "REAL", str: "TEXT"}
+
+REPORT_COLUMNS = [f.name for f in dataclasses.fields(SynthReport)]
+METRIC_COLUMNS = [*REPORT_COLUMNS, *DERIVED_COLUMNS, "runtime_s", "peak_rss_bytes"]
+
+# config options that have their own column, prefixed with "config_" to keep
+# them apart from report fields such as `part`; every other design point name
+# (template arguments and "defines.NAME") is a row of `run_params`
+OPTION_COLUMNS = ("part", "clock_period", "unsafe_math")
+DEFINE_PREFIX = "defines."
+
+# stored in `PRAGMA user_version`, for future migrations to check
+SCHEMA_VERSION = 1
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMED_OUT = "timed_out"
+STATUS_PRECHECK_FAILED = "precheck_failed"
+
+
+def run_status(report: SynthReport | None, run_info: RunInfo | None) -> str:
+    if report is not None:
+        return STATUS_OK
+    if run_info is not None and run_info.timed_out is not None:
+        return STATUS_TIMED_OUT
+    if run_info is not None and run_info.precheck_diagnostics is not None:
+        return STATUS_PRECHECK_FAILED
+    return STATUS_FAILED
+
+
+def _schema() -> str:
+    report_columns = "".join(
+        f"    {f.name} {SQL_TYPES[f.type]},\n" for f in dataclasses.fields(SynthReport)
+    )
+    derived_columns = "".join(f"    {name} REAL,\n" for name in DERIVED_COLUMNS)
+    return f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    config_key TEXT NOT NULL,
+    target_fn TEXT NOT NULL,
+    config_part TEXT,
+    config_clock_period REAL,
+    config_unsafe_math INTEGER,
+    template_args TEXT NOT NULL,
+    defines TEXT NOT NULL,
+    config TEXT NOT NULL,
+    status TEXT NOT NULL,
+    tool_version TEXT,
+    runtime_s REAL,
+    peak_rss_bytes INTEGER,
+    report_dir TEXT,
+{report_columns}{derived_columns}    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_params (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_config_key ON runs (config_key);
+CREATE INDEX IF NOT EXISTS runs_config
+    ON runs (target_fn, config_part, config_clock_period, config_unsafe_math);
+CREATE INDEX IF NOT EXISTS runs_latency
+    ON runs (target_fn, status, latency_t_computed_average_case);
+CREATE INDEX IF NOT EXISTS runs_lut
+    ON runs (target_fn, status, resources_lut_used);
+CREATE INDEX IF NOT EXISTS run_params_value ON run_params (name, value, run_id);
+CREATE INDEX IF NOT EXISTS run_params_run ON run_params (run_id);
+"""
+
+
+def _check_metric(name: str) -> None:
+    # metric names are interpolated into SQL, so only known columns pass
+    if name not in METRIC_COLUMNS:
+        raise ValueError(f"Unknown metric: {name}")
+
+
+def _param_value(value: Any) -> str:
+    # template arguments are given as strings or numbers interchangeably and
+    # with any spacing, so parameters are stored and compared as canonical
+    # text, as in `canonical_config()`
+    return normalize_cpp(str(value))
+
+
+def _option_value(name: str, value: Any) -> Any:
+    return canonical_config({name: value})[name]
+
+
+@dataclass
+class StoredRun:
+    id: int
+    config: dict[str, Any]
+    status: str
+    report: SynthReport | None
+    tool_version: str | None
+    runtime_s: float | None
+    peak_rss_bytes: int | None
+    created: float
+
+
+class ResultStore:
+    """
+    SQLite database with one row per synthesis run: the `SynthScaffold`
+    config, the status, tool version, runtime and peak memory of the run,
+    and every `SynthReport` field plus the derived latencies and
+    utilizations.
+
+    The config key, the target function and options, and every template
+    argument and define (in `run_params`) are indexed, as are the average
+    computed latency and the LUT count, so that queries such as the best
+    latency of a target under a LUT budget do not scan the table.
+
+    The database is in WAL mode, so many processes (e.g. `sweep()` workers)
+    can write to it at once while others read. Each process opens its own
+    connection on first use. SQLite connections must not be open across a
+    `fork()`, even unused, so `close()` the store before starting worker
+    processes; `sweep()` does this for the store it is given.
+    """
+
+    def __init__(self, db_fp: Path, timeout_s: float = 60.0) -> None:
+        self.db_fp = db_fp
+        self.timeout_s = timeout_s
+        self._conn: sqlite3.Connection | None = None
+        self._conn_pid: int | None = None
+        with self.connection() as conn:
+            conn.executescript(_schema())
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # connections cannot cross processes; workers open their own
+        return {"db_fp": self.db_fp, "timeout_s": self.timeout_s}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.db_fp = state["db_fp"]
+        self.timeout_s = state["timeout_s"]
+        self._conn = None
+        self._conn_pid = None
+
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.db_fp.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_fp, timeout=self.timeout_s)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        self._conn_pid = None
+
+    def _run_row(
+        self,
+        config: dict[str, Any],
+        report: SynthReport | None,
+        run_info: RunInfo | None,
+        tool_version: str | None,
+        report_dir: Path | None = None,
+    ) -> dict[str, Any]:
+        canonical = canonical_config(config)
+        if report_dir is None and config.get("output_dir") is not None:
+            report_dir = Path(config["output_dir"]) / REPORT_DIR_PATH
+        row = {
+            "config_key": config_key(config),
+            "target_fn": config["target_fn"],
+            "config_part": canonical["part"],
+            "config_clock_period": canonical["clock_period"],
+            "config_unsafe_math": canonical["unsafe_math"],
+            "template_args": json.dumps(
+                config.get("template_args", {}), sort_keys=True, default=str
+            ),
+            "defines": json.dumps(
+                config.get("defines", {}), sort_keys=True, default=str
+            ),
+            "config": json.dumps(config, sort_keys=True, default=str),
+            "status": run_status(report, run_info),
+            "tool_version": tool_version,
+            "runtime_s": run_info.runtime_s if run_info is not None else None,
+            "peak_rss_bytes": (
+                run_info.peak_rss_bytes if run_info is not None else None
+            ),
+            "report_dir": (
+                str(report_dir.absolute()) if report_dir is not None else None
+            ),
+            "created": time.time(),
+        }
+        for name in [*REPORT_COLUMNS, *DERIVED_COLUMNS]:
+            row[name] = getattr(report, name) if report is not None else None
+        return row
+
+    def add_many(
+        self,
+        runs: Iterable[
+            tuple[dict[str, Any], SynthReport | None, RunInfo | None, str | None]
+        ],
+    ) -> list[int]:
+        """
+        Adds `(config, report, run_info, tool_version)` records in a single
+        transaction and returns their row ids. A `None` report is stored as
+        a failed or timed out run.
+        """
+        conn = self.connection()
+        with conn:
+            return [self._insert(conn, *run) for run in runs]
+
+    def _insert(
+        self,
+        conn: sqlite3.Connection,
+        config: dict[str, Any],
+        report: SynthReport | None,
+        run_info: RunInfo | None,
+        tool_version: str | None,
+        report_dir: Path | None = None,
+    ) -> int:
+        row = self._run_row(config, report, run_info, tool_version, report_dir)
+        cur = conn.execute(
+            f"INSERT INTO runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values()),
+        )
+        run_id = unwrap(cur.lastrowid)
+        canonical = canonical_config(config)
+        params = [
+            (run_id, name, value) for name, value in canonical["template_args"].items()
+        ]
+        params += [
+            (run_id, f"{DEFINE_PREFIX}{name}", value)
+            for name, value in canonical["defines"].items()
+        ]
+        conn.executemany(
+            "INSERT INTO run_params (run_id, name, value) VALUES (?, ?, ?)",
+            params,
+        )
+        return run_id
+
+    def add(
+        self,
+        config: dict[str, Any],
+        report: SynthReport | None,
+        run_info: RunInfo | None = None,
+        tool_version: str | None = None,
+    ) -> int:
+        return self.add_many([(config, report, run_info, tool_version)])[0]
+
+    def ingest(self, root_dir: Path, workers: int | None = None) -> int:
+        """
+        Adds every run directory under `root_dir` that has a `config.json`
+        (as written by `sweep()`) above its `syn/report` directory, e.g. to
+        import past sweeps. Runs that are already stored, i.e. with the same
+        config key and report directory, whether recorded by a sweep or
+        ingested before, are skipped, so ingesting a directory again only
+        adds new runs. Returns the number of runs added.
+        """
+        runs = []
+        # reports are parsed in worker processes
+        self.close()
+        reports = SynthReport.scan(root_dir, workers=workers)
+        for report_dir in find_report_dirs(root_dir):
+            for parent in report_dir.parents:
+                config_fp = parent / "config.json"
+                if config_fp.exists():
+                    config = json.loads(config_fp.read_text())
+                    tool_version = read_tool_version(report_dir)
+                    runs.append(
+                        (config, reports[report_dir], None, tool_version, report_dir)
+                    )
+                    break
+                if parent == root_dir:
+                    break
+
+        conn = self.connection()
+        with conn:
+            ingested = {
+                (row["config_key"], row["report_dir"])
+                for row in conn.execute(
+                    "SELECT config_key, report_dir FROM runs"
+                    " WHERE report_dir IS NOT NULL"
+                )
+            }
+            n_added = 0
+            for run in runs:
+                config, report_dir = run[0], run[4]
+                if (config_key(config), str(report_dir.absolute())) in ingested:
+                    continue
+                self._insert(conn, *run)
+                n_added += 1
+        return n_added
+
+    def query(
+        self,
+        target_fn: str | None = None,
+        params: Mapping[str, Any] | None = None,
+        max_values: Mapping[str, float] | None = None,
+        min_values: Mapping[str, float] | None = None,
+        order_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+        status: str | None = STATUS_OK,
+    ) -> list[StoredRun]:
+        """
+        Runs matching every filter. `params` are named like design space
+        entries: "part", "clock_period" and "unsafe_math" match the config
+        option, "defines.NAME" a define, and any other name a template
+        argument. `max_values` and `min_values` bound metric columns (report
+        fields, derived metrics, "runtime_s" and "peak_rss_bytes").
+        """
+        where = []
+        args: list[Any] = []
+        if target_fn is not None:
+            where.append("target_fn = ?")
+            args.append(target_fn)
+        if status is not None:
+            where.append("status = ?")
+            args.append(status)
+        for name, value in (params or {}).items():
+            if name in OPTION_COLUMNS:
+                where.append(f"config_{name} = ?")
+                args.append(_option_value(name, value))
+            else:
+                where.append(
+                    "EXISTS (SELECT 1 FROM run_params p"
+                    " WHERE p.name = ? AND p.value = ? AND p.run_id = runs.id)"
+                )
+                args += [name.strip(), _param_value(value)]
+        for bounds, op in [(max_values, "<="), (min_values, ">=")]:
+            for name, value in (bounds or {}).items():
+                _check_metric(name)
+                where.append(f"{name} {op} ?")
+                args.append(value)
+
+        if order_by is not None:
+            _check_metric(order_by)
+            where.append(f"{order_by} IS NOT NULL")
+
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_by is not None:
+            sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+
+        rows = self.connection().execute(sql, args).fetchall()
+        return [self._stored_run(row) for row in rows]
+
+    def best(
+        self,
+        target_fn: str,
+        metric: str = "latency_t_computed_average_case",
+        params: Mapping[str, Any] | None = None,
+        max_values: Mapping[str, float] | None = None,
+        min_values: Mapping[str, float] | None = None,
+        maximize: bool = False,
+    ) -> StoredRun | None:
+        """
+        The successful run of `target_fn` with the lowest (or highest)
+        `metric` among those matching the filters of `query()`, e.g.
+        `store.best("linear", max_values={"resources_lut_used": 20000})`.
+        """
+        runs = self.query(
+            target_fn=target_fn,
+            params=params,
+            max_values=max_values,
+            min_values=min_values,
+            order_by=metric,
+            descending=maximize,
+            limit=1,
+        )
+        return runs[0] if runs else None
+
+    def count(self, status: str | None = None) -> int:
+        if status is None:
+            row = self.connection().execute("SELECT COUNT(*) FROM runs").fetchone()
+        else:
+            row = (
+                self.connection()
+                .execute("SELECT COUNT(*) FROM runs WHERE status = ?", [status])
+                .fetchone()
+            )
+        return int(row[0])
+
+    def _stored_run(self, row: sqlite3.Row) -> StoredRun:
+        report = None
+        if row["status"] == STATUS_OK:
+            report = SynthReport(**{name: row[name] for name in REPORT_COLUMNS})
+        return StoredRun(
+            id=row["id"],
+            config=json.loads(row["config"]),
+            status=row["status"],
+            report=report,
+            tool_version=row["tool_version"],
+            runtime_s=row["runtime_s"],
+            peak_rss_bytes=row["peak_rss_bytes"],
+            created=row["created"],
+        )
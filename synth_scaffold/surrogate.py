@@ -0,0 +1,336 @@
+import math
+import random
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .synth_scaffold import SynthReport
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_METRICS = (
+    "latency_t_computed_average_case",
+    "resources_lut_used",
+    "resources_ff_used",
+    "resources_dsp_used",
+    "resources_bram_used",
+)
+
+# width of the prediction interval in standard deviations (~95%)
+INTERVAL_Z = 2.0
+
+# a completed run within this fraction of a prediction's optimistic bound
+# ties with it, so that metrics that never change (e.g. BRAM) do not block
+# dominance
+TIE_REL_TOL = 0.01
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "The surrogate model needs NumPy: pip install 'synth-scaffold[surrogate]'"
+        ) from e
+    return numpy
+
+
+def config_features(config: dict[str, Any]) -> dict[str, Any]:
+    """
+    The inputs a surrogate model sees for a config: its template arguments,
+    its defines and its clock period.
+    """
+    features: dict[str, Any] = {}
+    for name, value in config.get("template_args", {}).items():
+        features[name] = value
+    for name, value in config.get("defines", {}).items():
+        features[f"defines.{name}"] = value
+    features["clock_period"] = config.get("clock_period", 5.0)
+    return features
+
+
+def _as_number(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+class FeatureEncoder:
+    """
+    Turns config features into a standardized numeric design matrix.
+
+    Features whose values are all numbers (including numeric strings such as
+    "64") become a linear column plus, when all values are positive, a log2
+    column, so that power-law relationships such as latency ~ size / block
+    are linear in the encoded space. All other features are one-hot encoded
+    over the values seen during fitting; unseen values encode as all zeros.
+    """
+
+    def __init__(self) -> None:
+        self.columns: list[tuple[str, str, Any]] = []
+        self.mean: np.ndarray | None = None
+        self.std: np.ndarray | None = None
+
+    def fit(self, rows: list[dict[str, Any]]) -> "FeatureEncoder":
+        names = sorted({name for row in rows for name in row})
+        self.columns = []
+        for name in names:
+            values = [row.get(name) for row in rows]
+            numbers = [_as_number(v) for v in values]
+            if all(n is not None for n in numbers):
+                self.columns.append((name, "linear", None))
+                if all(n > 0 for n in numbers):
+                    self.columns.append((name, "log2", None))
+            else:
+                for value in sorted({str(v) for v in values}):
+                    self.columns.append((name, "onehot", value))
+
+        x = self._raw(rows)
+        self.mean = x.mean(axis=0)
+        self.std = x.std(axis=0)
+        self.std[self.std == 0] = 1.0
+        return self
+
+    def _raw(self, rows: list[dict[str, Any]]) -> "np.ndarray":
+        np = _import_numpy()
+        x = np.zeros((len(rows), len(self.columns)))
+        for i, row in enumerate(rows):
+            for j, (name, kind, category) in enumerate(self.columns):
+                value = row.get(name)
+                if kind == "onehot":
+                    x[i, j] = float(str(value) == category)
+                    continue
+                number = _as_number(value)
+                if number is None:
+                    continue
+                if kind == "linear":
+                    x[i, j] = number
+                elif number > 0:
+                    x[i, j] = math.log2(number)
+        return x
+
+    def transform(self, rows: list[dict[str, Any]]) -> "np.ndarray":
+        return (self._raw(rows) - self.mean) / self.std
+
+
+class BayesianLinearRegression:
+    """
+    Linear regression with a Gaussian prior of precision `alpha` on the
+    weights. The noise variance is estimated from the residuals, and
+    predictions come with the posterior predictive standard deviation, which
+    grows for inputs far from the training data.
+    """
+
+    def __init__(self, alpha: float = 1e-2) -> None:
+        self.alpha = alpha
+
+    def fit(self, x: "np.ndarray", y: "np.ndarray") -> "BayesianLinearRegression":
+        np = _import_numpy()
+        n, d = x.shape
+        x1 = np.hstack([x, np.ones((n, 1))])
+        precision = x1.T @ x1 + self.alpha * np.eye(d + 1)
+        self.cov_unscaled = np.linalg.inv(precision)
+        self.weights = self.cov_unscaled @ x1.T @ y
+
+        residuals = y - x1 @ self.weights
+        dof_effective = np.trace(x1 @ self.cov_unscaled @ x1.T)
+        dof = max(n - dof_effective, 1.0)
+        self.noise_var = max(float(residuals @ residuals) / dof, 1e-12)
+        return self
+
+    def predict(self, x: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+        np = _import_numpy()
+        x1 = np.hstack([x, np.ones((x.shape[0], 1))])
+        mean = x1 @ self.weights
+        var = self.noise_var * (
+            1.0 + np.einsum("ij,jk,ik->i", x1, self.cov_unscaled, x1)
+        )
+        return mean, np.sqrt(var)
+
+
+@dataclass
+class Prediction:
+    mean: float
+    lower: float
+    upper: float
+
+
+@dataclass
+class ValidationStats:
+    metric: str
+    n_train: int
+    n_test: int
+    mean_abs_pct_error: float | None
+    interval_coverage: float
+
+    def text_summary(self) -> str:
+        txt = f"{self.metric}: "
+        if self.mean_abs_pct_error is not None:
+            txt += f"MAPE {self.mean_abs_pct_error * 100:.1f}%, "
+        txt += f"interval coverage {self.interval_coverage * 100:.0f}% "
+        txt += f"({self.n_train} train, {self.n_test} test)"
+        return txt
+
+
+class SurrogateModel:
+    """
+    Predicts `SynthReport` metrics of unseen configs from completed runs,
+    with one regression model per target function and metric.
+
+    Each metric is modeled as `log1p(value / scale)`, where `scale` is a
+    hundredth of the smallest positive value seen during fitting, so that
+    latencies in seconds and LUT counts in the thousands are both fitted in
+    relative terms and predictions stay non-negative. Needs NumPy.
+    """
+
+    def __init__(
+        self, metrics: Sequence[str] = DEFAULT_METRICS, alpha: float = 1e-2
+    ) -> None:
+        self.metrics = list(metrics)
+        self.alpha = alpha
+        self.encoders: dict[str, FeatureEncoder] = {}
+        self.models: dict[str, dict[str, tuple[BayesianLinearRegression, float]]] = {}
+        self.observed: dict[str, list[tuple[dict[str, Any], SynthReport]]] = {}
+
+    def fit(
+        self, results: Iterable[tuple[dict[str, Any], SynthReport | None]]
+    ) -> "SurrogateModel":
+        """
+        Fits the models on `(config, report)` pairs, e.g. the output of
+        `sweep()`. Failed runs are ignored.
+        """
+        np = _import_numpy()
+        self.encoders, self.models, self.observed = {}, {}, {}
+        for config, report in results:
+            if report is not None:
+                self.observed.setdefault(config["target_fn"], []).append(
+                    (config, report)
+                )
+
+        for target_fn, observed in self.observed.items():
+            encoder = FeatureEncoder().fit([config_features(c) for c, _ in observed])
+            x = encoder.transform([config_features(c) for c, _ in observed])
+            self.encoders[target_fn] = encoder
+            self.models[target_fn] = {}
+            for metric in self.metrics:
+                values = np.array([float(getattr(r, metric)) for _, r in observed])
+                positive = values[values > 0]
+                scale = float(positive.min()) / 100 if positive.size else 1.0
+                y = np.log1p(values / scale)
+                model = BayesianLinearRegression(self.alpha).fit(x, y)
+                self.models[target_fn][metric] = (model, scale)
+        return self
+
+    def predict(self, configs: list[dict[str, Any]]) -> list[dict[str, Prediction]]:
+        """
+        Predicted value and interval of every metric for each config, or an
+        empty dict for configs whose target function has no fitted model.
+        """
+        np = _import_numpy()
+        predictions: list[dict[str, Prediction]] = [{} for _ in configs]
+        by_target: dict[str, list[int]] = {}
+        for i, config in enumerate(configs):
+            if config["target_fn"] in self.models:
+                by_target.setdefault(config["target_fn"], []).append(i)
+
+        for target_fn, indices in by_target.items():
+            x = self.encoders[target_fn].transform(
+                [config_features(configs[i]) for i in indices]
+            )
+            for metric, (model, scale) in self.models[target_fn].items():
+                mean, std = model.predict(x)
+                lower = scale * np.expm1(np.maximum(mean - INTERVAL_Z * std, 0.0))
+                upper = scale * np.expm1(np.maximum(mean + INTERVAL_Z * std, 0.0))
+                mean = scale * np.expm1(np.maximum(mean, 0.0))
+                for k, i in enumerate(indices):
+                    predictions[i][metric] = Prediction(
+                        mean=float(mean[k]),
+                        lower=float(lower[k]),
+                        upper=float(upper[k]),
+                    )
+        return predictions
+
+    def is_dominated(
+        self, config: dict[str, Any], prediction: dict[str, Prediction]
+    ) -> bool:
+        """
+        Whether some completed run of the same target is at least as good as
+        the optimistic end of the config's prediction interval on every
+        metric, and strictly better on one. All metrics are minimized.
+        """
+        if not prediction:
+            return False
+        bounds = [prediction[m].lower for m in self.metrics]
+        for _, report in self.observed.get(config["target_fn"], []):
+            values = [float(getattr(report, m)) for m in self.metrics]
+            if all(v <= b * (1 + TIE_REL_TOL) for v, b in zip(values, bounds)) and any(
+                v < b for v, b in zip(values, bounds)
+            ):
+                return True
+        return False
+
+    def partition(
+        self, configs: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Splits configs into those worth synthesizing and those confidently
+        dominated by a completed run.
+        """
+        promising, dominated = [], []
+        for config, prediction in zip(configs, self.predict(configs)):
+            if self.is_dominated(config, prediction):
+                dominated.append(config)
+            else:
+                promising.append(config)
+        return promising, dominated
+
+    def validate(
+        self,
+        results: Iterable[tuple[dict[str, Any], SynthReport | None]],
+        holdout_fraction: float = 0.2,
+        seed: int | None = 0,
+    ) -> list[ValidationStats]:
+        """
+        Fits a fresh model on part of `results` and measures its error on the
+        held-out rest: the mean absolute percentage error (over nonzero
+        actual values) and the fraction of actual values that fall inside
+        the prediction interval.
+        """
+        completed = [(c, r) for c, r in results if r is not None]
+        random.Random(seed).shuffle(completed)
+        n_test = max(1, int(len(completed) * holdout_fraction))
+        test, train = completed[:n_test], completed[n_test:]
+        if not train:
+            raise ValueError("Not enough completed runs to validate on")
+
+        model = SurrogateModel(self.metrics, self.alpha).fit(train)
+        predictions = model.predict([c for c, _ in test])
+
+        stats = []
+        for metric in self.metrics:
+            errors = []
+            n_covered = 0
+            n_predicted = 0
+            for (_, report), prediction in zip(test, predictions):
+                if metric not in prediction:
+                    continue
+                n_predicted += 1
+                actual = float(getattr(report, metric))
+                p = prediction[metric]
+                if actual != 0:
+                    errors.append(abs(p.mean - actual) / abs(actual))
+                if p.lower <= actual <= p.upper:
+                    n_covered += 1
+            stats.append(
+                ValidationStats(
+                    metric=metric,
+                    n_train=len(train),
+                    n_test=n_predicted,
+                    mean_abs_pct_error=sum(errors) / len(errors) if errors else None,
+                    interval_coverage=n_covered / n_predicted if n_predicted else 0.0,
+                )
+            )
+        return stats
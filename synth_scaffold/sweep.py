@@ -0,0 +1,531 @@
+import argparse
+import itertools
+import json
+import os
+import sqlite3
+import traceback
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .cache import SynthCache
+from .manifest import MANIFEST_NAME, SweepManifest, sources_digest
+from .metrics import RunMetrics, open_span, write_chrome_trace
+from .precheck import Precheck
+from .scheduler import AdmissionController, MemoryHistory, is_oom_kill
+from .single_flight import SingleFlight
+from .source_index import SourceIndex
+from .store import ResultStore
+from .synth_scaffold import (
+    RunInfo,
+    SynthReport,
+    SynthScaffold,
+    config_key,
+    read_tool_version,
+)
+
+if TYPE_CHECKING:
+    from .surrogate import SurrogateModel
+
+SCAFFOLD_OPTIONS = ("part", "clock_period", "unsafe_math")
+DEFINE_PREFIX = "defines."
+
+DesignPoint = dict[str, Any]
+DesignSpace = Mapping[str, Sequence[Any]] | Iterable[DesignPoint]
+
+
+def design_point_id(point: DesignPoint) -> str:
+    return json.dumps(point, sort_keys=True, default=str)
+
+
+def expand_design_space(design_space: DesignSpace) -> list[DesignPoint]:
+    """
+    Turns a design space into a list of design points.
+
+    A mapping of names to candidate values is expanded into its full
+    Cartesian product, e.g.:
+        {"BLOCK_SIZE_IN_": [1, 2], "T": ["float", "ap_fixed<32, 16>"]}
+    yields four points. Any other iterable is taken as an explicit list of
+    points. Duplicate points are dropped, keeping the first occurrence.
+    """
+    if isinstance(design_space, Mapping):
+        names = list(design_space.keys())
+        points = [
+            dict(zip(names, values))
+            for values in itertools.product(*design_space.values())
+        ]
+    else:
+        points = [dict(point) for point in design_space]
+
+    unique_points: list[DesignPoint] = []
+    seen: set[str] = set()
+    for point in points:
+        point_id = design_point_id(point)
+        if point_id not in seen:
+            seen.add(point_id)
+            unique_points.append(point)
+    return unique_points
+
+
+def apply_design_point(
+    base_config: dict[str, Any], point: DesignPoint
+) -> dict[str, Any]:
+    """
+    Returns a copy of `base_config` with the values of a design point applied.
+
+    Names in `SCAFFOLD_OPTIONS` (e.g. "clock_period") override the matching
+    `SynthScaffold` option, names of the form "defines.NAME" set a define,
+    and every other name sets a template argument.
+    """
+    config = dict(base_config)
+    config["template_args"] = dict(base_config.get("template_args", {}))
+    config["defines"] = dict(base_config.get("defines", {}))
+
+    for name, value in point.items():
+        if name in SCAFFOLD_OPTIONS:
+            config[name] = value
+        elif name.startswith(DEFINE_PREFIX):
+            config["defines"][name.removeprefix(DEFINE_PREFIX)] = value
+        else:
+            config["template_args"][name] = value
+    return config
+
+
+def build_job_configs(
+    base_config: dict[str, Any], design_space: DesignSpace
+) -> list[dict[str, Any]]:
+    """
+    Builds one `SynthScaffold` config per design point. The `output_dir` of
+    `base_config` is used as the runs root and each job gets its own
+    directory under it, named after the job's config key. Points that are
+    spellings of the same config (e.g. 16 and "16") share a key and get
+    only one job, for the first of them.
+    """
+    runs_dir = Path(base_config["output_dir"])
+    job_configs = {}
+    for point in expand_design_space(design_space):
+        config = apply_design_point(base_config, point)
+        key = config_key(config)
+        if key not in job_configs:
+            config["output_dir"] = runs_dir / key
+            job_configs[key] = config
+    return list(job_configs.values())
+
+
+def write_sweep_error(output_dir: Path) -> None:
+    """
+    Appends the traceback of the exception being handled to
+    `sweep_error.txt` in `output_dir`.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with (output_dir / "sweep_error.txt").open("a") as f:
+        f.write(traceback.format_exc())
+
+
+def run_job(
+    config: dict[str, Any],
+    cache: SynthCache | None = None,
+    source_index: SourceIndex | None = None,
+    timeout_s: float | None = None,
+    phase_timeouts_s: dict[str, float] | None = None,
+    store: ResultStore | None = None,
+    precheck: Precheck | None = None,
+    single_flight: SingleFlight | None = None,
+) -> tuple[SynthReport | None, RunInfo | None]:
+    job_span = open_span("job", "job")
+    output_dir = Path(config["output_dir"])
+    (output_dir / "sweep_error.txt").unlink(missing_ok=True)
+    s = None
+    report = None
+    try:
+        s = SynthScaffold.from_config(
+            config,
+            cache=cache,
+            source_index=source_index,
+            precheck=precheck,
+            single_flight=single_flight,
+        )
+        s.generate()
+        (output_dir / "config.json").write_text(json.dumps(s.to_config(), indent=4))
+        report = s.run(timeout_s=timeout_s, phase_timeouts_s=phase_timeouts_s)
+    except Exception:  # noqa: BLE001 - a bad config fails its job, not the sweep
+        write_sweep_error(output_dir)
+    run_info = s.last_run if s is not None else None
+    if run_info is not None and run_info.metrics is not None:
+        run_info.metrics.close_span(job_span)
+
+    if store is not None:
+        # e.g. a locked database; the run itself is still good
+        try:
+            tool_version = read_tool_version(s.report_dir) if s is not None else None
+            store.add(config, report, run_info, tool_version)
+        except (sqlite3.Error, OSError):
+            write_sweep_error(output_dir)
+    return report, run_info
+
+
+def sweep(
+    base_config: dict[str, Any],
+    design_space: DesignSpace,
+    max_workers: int | None = None,
+    cache: SynthCache | None = None,
+    source_index: SourceIndex | None = None,
+    memory_budget_bytes: int | None = None,
+    licenses: int | None = None,
+    memory_history_fp: Path | None = None,
+    max_oom_retries: int = 2,
+    timeout_s: float | None = None,
+    phase_timeouts_s: dict[str, float] | None = None,
+    surrogate: "SurrogateModel | None" = None,
+    skip_dominated: bool = True,
+    store: ResultStore | None = None,
+    resume: bool = False,
+    trace_fp: Path | None = None,
+    precheck: Precheck | None = None,
+    single_flight: SingleFlight | None = None,
+    verbose: bool = False,
+) -> Iterator[tuple[dict[str, Any], SynthReport | None]]:
+    """
+    Synthesizes every point of `design_space` on a process pool and yields
+    `(config, report)` pairs in completion order.
+
+    A failed job yields a `None` report and leaves its traceback in
+    `sweep_error.txt` inside the job's output directory; the remaining jobs
+    keep running.
+
+    New jobs are started through an `AdmissionController`, which keeps the
+    projected peak memory of running jobs under `memory_budget_bytes` and the
+    number of running jobs under `licenses`. Peak memory of every run is
+    recorded in `memory_history_fp` (by default `memory_history.json` in the
+    runs root). Jobs that are OOM-killed are retried up to `max_oom_retries`
+    times at reduced concurrency. A killed worker process takes down the jobs
+    running beside it; that counts as one OOM event and those jobs are run
+    again without using up their retries.
+
+    With a `source_index`, the input sources are indexed once up front and
+    every job looks its target function up in the index instead of parsing
+    the sources again.
+
+    `timeout_s` and `phase_timeouts_s` are passed on to `SynthScaffold.run()`
+    for every job; a job that times out yields a `None` report and is not
+    retried.
+
+    With a fitted `surrogate`, configs whose predicted metrics are
+    confidently dominated by a completed run are skipped and not yielded, or
+    with `skip_dominated=False`, run after all the others.
+
+    With a `store`, every job records its run, failed or not, in the
+    `ResultStore` from its worker process.
+
+    Every finished job is recorded in a `SweepManifest` in the runs root.
+    With `resume=True`, jobs that the manifest records as successful, for
+    the same input sources and with their reports still intact, are yielded
+    from their reports first without running again; only missing and failed
+    jobs are run.
+
+    With a `trace_fp`, the `RunMetrics` of every job that ran are written
+    there as a Chrome trace-event JSON file when the sweep ends, with one
+    track per worker process.
+
+    With a `precheck`, each job compiles its scaffold with the host compiler
+    before starting the tool, and jobs that do not compile fail right away
+    with the compiler's errors in `precheck.log` in their output directory.
+
+    With a `single_flight`, a job whose config another sweep or requester
+    is already running waits for that run and shares its report.
+    """
+    runs_dir = Path(base_config["output_dir"])
+    pending = build_job_configs(base_config, design_space)
+
+    manifest = SweepManifest(runs_dir / MANIFEST_NAME)
+    digest = sources_digest(base_config)
+    resumed = []
+    if resume:
+        records = manifest.load()
+        remaining = []
+        for config in pending:
+            report = manifest.completed_report(config, records, digest)
+            if report is not None:
+                resumed.append((config, report))
+            else:
+                remaining.append(config)
+        pending = remaining
+        if verbose:
+            print(f"Resuming: {len(resumed)} done, {len(pending)} to run")
+    yield from resumed
+
+    if surrogate is not None:
+        promising, dominated = surrogate.partition(pending)
+        if verbose:
+            action = "skipping" if skip_dominated else "deprioritizing"
+            print(f"Surrogate: {action} {len(dominated)} dominated configs")
+        pending = promising if skip_dominated else promising + dominated
+    pending.reverse()
+    n_jobs = len(pending)
+    n_done = 0
+    oom_retries: dict[str, int] = {}
+
+    n_slots = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if memory_history_fp is None:
+        memory_history_fp = runs_dir / "memory_history.json"
+    scheduler = AdmissionController(
+        max_workers=n_slots,
+        memory_budget_bytes=memory_budget_bytes,
+        licenses=licenses,
+        history=MemoryHistory(memory_history_fp),
+    )
+
+    if source_index is not None:
+        source_index.update([Path(fp) for fp in base_config["input_source_files"]])
+
+    if store is not None:
+        # workers open their own connections
+        store.close()
+
+    executor = ProcessPoolExecutor(max_workers=n_slots)
+    in_flight: dict[Future, dict[str, Any]] = {}
+    traced: list[tuple[str, RunMetrics]] = []
+    try:
+        while pending or in_flight:
+            while pending and scheduler.admit(pending[-1], list(in_flight.values())):
+                config = pending.pop()
+                future = executor.submit(
+                    run_job,
+                    config,
+                    cache,
+                    source_index,
+                    timeout_s,
+                    phase_timeouts_s,
+                    store,
+                    precheck,
+                    single_flight,
+                )
+                in_flight[future] = config
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            n_running = len(in_flight)
+            finished = []
+            broken = []
+            for future in done:
+                config = in_flight.pop(future)
+                try:
+                    report, run_info = future.result()
+                except BrokenProcessPool:
+                    broken.append(config)
+                    continue
+                except Exception:  # noqa: BLE001 - only this job fails
+                    # e.g. a job or result that could not be pickled
+                    write_sweep_error(Path(config["output_dir"]))
+                    report, run_info = None, None
+                finished.append((config, report, run_info, is_oom_kill(run_info)))
+
+            if broken:
+                # a worker process itself was killed, most likely by the OOM
+                # killer, and the pool is unusable: every job still running on
+                # it fails with it. Start a fresh pool and count this as one
+                # OOM event. Only a job that was running alone is known to be
+                # the one that was killed and uses up a retry; the others are
+                # requeued as they are
+                broken.extend(in_flight.values())
+                in_flight.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=n_slots)
+                if len(broken) == 1:
+                    finished.append((broken[0], None, None, True))
+                else:
+                    scheduler.on_oom(n_running)
+                    if verbose:
+                        print(
+                            f"Worker killed, requeueing {len(broken)} jobs with "
+                            f"at most {scheduler.max_concurrency} concurrent jobs"
+                        )
+                    pending.extend(broken)
+
+            for config, report, run_info, oom_killed in finished:
+                scheduler.record(config, run_info)
+
+                key = config_key(config)
+                if run_info is not None and run_info.metrics is not None:
+                    traced.append((key, run_info.metrics))
+                if oom_killed and oom_retries.get(key, 0) < max_oom_retries:
+                    oom_retries[key] = oom_retries.get(key, 0) + 1
+                    scheduler.on_oom(n_running)
+                    if verbose:
+                        print(
+                            f"OOM-killed, retrying with at most "
+                            f"{scheduler.max_concurrency} concurrent jobs: "
+                            f"{config['output_dir']}"
+                        )
+                    pending.append(config)
+                    continue
+
+                manifest.record(config, report, run_info, digest)
+                n_done += 1
+                if verbose:
+                    status = "ok" if report is not None else "failed"
+                    if run_info is not None and run_info.timed_out is not None:
+                        status = f"timed out ({run_info.timed_out})"
+                    if run_info is not None and run_info.precheck_diagnostics:
+                        status = "failed the pre-check"
+                    print(f"[{n_done}/{n_jobs}] {config['output_dir']}: {status}")
+                yield config, report
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if trace_fp is not None:
+            write_chrome_trace(trace_fp, traced)
+
+
+def main(args=None) -> bool:
+    parser = argparse.ArgumentParser(
+        prog="synth-scaffold sweep",
+        description="Synthesize every point of a design space in parallel",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        required=True,
+        help="JSON file with the base SynthScaffold config; its output_dir is the runs root",
+    )
+    parser.add_argument(
+        "--design-space",
+        type=Path,
+        required=True,
+        help="JSON file with a mapping of names to values, or a list of design points",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Number of concurrent synthesis jobs (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--source-index",
+        type=Path,
+        default=None,
+        help="JSON file to persist the function signature index of the sources in",
+    )
+    parser.add_argument(
+        "--memory-budget-gb",
+        type=float,
+        default=None,
+        help="Only start jobs while their projected peak memory fits in this budget",
+    )
+    parser.add_argument(
+        "--licenses",
+        type=int,
+        default=None,
+        help="Maximum number of vitis_hls license seats to use at once",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Kill a synthesis job after this many seconds",
+    )
+    parser.add_argument(
+        "--phase-timeouts",
+        type=str,
+        nargs="+",
+        default=[],
+        help="Per-phase timeouts in seconds, e.g. scheduling=600 binding=600",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=None,
+        help="JSON lines file to append one record per finished job to",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory of a persistent synthesis result cache to reuse",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="SQLite database to record every run in",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip jobs that completed in an earlier run of this sweep",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="Chrome trace-event JSON file to write the timeline of all jobs to",
+    )
+    parser.add_argument(
+        "--precheck",
+        action="store_true",
+        help="Compile each scaffold with the host C++ compiler first and skip configs that do not compile",
+    )
+    parser.add_argument(
+        "--precheck-include-dirs",
+        type=Path,
+        nargs="+",
+        default=None,
+        help="Include directories with the HLS headers for --precheck (default: those of the Vitis HLS install)",
+    )
+    parser.add_argument(
+        "--single-flight-dir",
+        type=Path,
+        default=None,
+        help="Shared directory of single-flight locks; jobs wait for and reuse concurrent runs of the same config",
+    )
+
+    args: argparse.Namespace = parser.parse_args(args)
+
+    base_config = json.loads(args.config.read_text())
+    design_space = json.loads(args.design_space.read_text())
+    cache = SynthCache(args.cache_dir) if args.cache_dir is not None else None
+    store = ResultStore(args.store) if args.store is not None else None
+    source_index = None
+    if args.source_index is not None:
+        source_index = SourceIndex(args.source_index)
+    phase_timeouts_s = {}
+    for phase_timeout in args.phase_timeouts:
+        phase, seconds = phase_timeout.split("=")
+        phase_timeouts_s[phase] = float(seconds)
+    memory_budget_bytes = None
+    if args.memory_budget_gb is not None:
+        memory_budget_bytes = int(args.memory_budget_gb * 1024**3)
+    precheck = None
+    if args.precheck:
+        precheck = Precheck(include_dirs=args.precheck_include_dirs)
+    single_flight = None
+    if args.single_flight_dir is not None:
+        single_flight = SingleFlight(args.single_flight_dir)
+
+    all_ok = True
+    for config, report in sweep(
+        base_config,
+        design_space,
+        max_workers=args.max_workers,
+        cache=cache,
+        source_index=source_index,
+        memory_budget_bytes=memory_budget_bytes,
+        licenses=args.licenses,
+        timeout_s=args.timeout,
+        phase_timeouts_s=phase_timeouts_s,
+        store=store,
+        resume=args.resume,
+        trace_fp=args.trace,
+        precheck=precheck,
+        single_flight=single_flight,
+        verbose=True,
+    ):
+        all_ok &= report is not None
+        if args.results is not None:
+            record = {
+                "config": json.loads(json.dumps(config, default=str)),
+                "report": report.to_dict() if report is not None else None,
+            }
+            with args.results.open("a") as f:
+                f.write(json.dumps(record) + "\n")
+    return all_ok
@@ -1,15 +1,50 @@
 import argparse
+import asyncio
+import contextlib
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
 import re
 import shutil
 import subprocess
+import sys
 import textwrap
+import threading
 import xml.etree.ElementTree as ET
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Mapping
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Optional, TypeVar
+
+from .archive import ARCHIVE_SUFFIX, archive_path, archived_dirs, path_exists
+from .lexer import FunctionSignature, find_function_signature
+from .metrics import OpenSpan, RunMetrics, open_span, parse_flow_log
+from .monitor import PhaseMonitor, ProgressEvent
+from .resources import RssSampler, RssSamplerGroup, kill_process_group
+from .xml_extract import extract_texts
+
+if TYPE_CHECKING:
+    from .cache import SynthCache
+    from .hierarchy import ReportTree
+    from .precheck import Precheck, PrecheckResult
+    from .single_flight import Flight, SingleFlight
+    from .source_index import SourceIndex
+    from .sweep import DesignSpace
 
 T_optional = TypeVar("T_optional")
 
+OutputCallback = Callable[[str], Awaitable[None]]
+ProgressCallback = Callable[[ProgressEvent], Awaitable[None]]
+
+# how often a running tool is checked against its timeouts
+MONITOR_INTERVAL_S = 0.5
+
+# samples the tools of all asyncio runs in this process with one scan of
+# /proc per interval, off the event loop
+ASYNC_RSS_SAMPLERS = RssSamplerGroup()
+
 
 def unwrap(value: Optional[T_optional], error_message: str | None = None) -> T_optional:
     if value is None:
@@ -97,39 +132,72 @@ def is_reference_type(arg_str: str) -> bool:
         raise ValueError(f"Could not extract argument name from: {arg_str}")
 
 
-def build_regex_pattern_from_func(self, function_name: str) -> re.Pattern:
-    # pattern = re.compile(
-    #     r"(template\s*<(?P<template_args>[^>]+)>\s*)?"  # Optional template declaration
-    #     r"(?P<ret_type>[\w:\s\*&<>\[\]]+?)\s+"  # Return type (simplistic)
-    #     + re.escape(function_name)
-    #     + r"\s*\((?P<args>[^\)]*)\)",  # Argument list (everything until ')')
-    #     re.MULTILINE,
-    # )
-    # (?:(template\s*<(?P<template_args>[^>]+)>\s+))?(?P<ret_type>[a-zA-Z_]\w*(?:\s*[&\*\s])*)\s+activation_tanh\s*\((?P<args>[^\)]*)\)
-    # pattern = re.compile(
-    #     r"(?:(template\s*<(?P<template_args>[^>]+)>\s+))?"
-    #     r"(?P<ret_type>[a-zA-Z_]\w*(?:\s*[&\*\s])*)\s+"
-    #     + re.escape(function_name)
-    #     + r"\s*\((?P<args>[^\)]*)\)",
-    #     re.MULTILINE,
-    # )
-    # (?:(template\s*<(?P<template_args>[^>]+)>\s+))?(?P<ret_type>[a-zA-Z_]\w*(?:\s*[&*])*\s+)process_graph\s*\((?P<args>[^\)]*)\)
-    # pattern = re.compile(
-    #     r"(?:(template\s*<(?P<template_args>[^>]+)>\s+))?"
-    #     r"(?P<ret_type>[a-zA-Z_]\w*(?:\s*[&*])*\s+)"
-    #     + re.escape(pattern=function_name)
-    #     + r"\s*\((?P<args>[^\)]*)\)",
-    #     re.MULTILINE,
-    # )
-    # (?:template\s*<(?P<template_args>(?s:(?:(?!template).)+))>\s+)?(?P<ret_type>[a-zA-Z_]\w*(?:\s*[&*])*\s+)pe_message_transformation\s*\((?P<args>[^\)]*)\)
-    pattern = re.compile(
-        r"(?:template\s*<(?P<template_args>(?s:(?:(?!template).)+))>\s+)?"
-        r"(?P<ret_type>[a-zA-Z_]\w*(?:\s*[&*])*\s+)"
-        + re.escape(pattern=function_name)
-        + r"\s*\((?P<args>[^\)]*)\)",
-        re.MULTILINE,
-    )
-    return pattern
+RE_STRING_LITERAL = re.compile(r'"(?:\\.|[^"\\])*"')
+RE_WHITESPACE = re.compile(r"\s+")
+RE_SPACE_AROUND_PUNCT = re.compile(r"\s*([<>,()\[\]{}])\s*")
+
+
+def normalize_cpp(txt: str) -> str:
+    """
+    `txt`, a C++ type or expression, with its whitespace normalized outside
+    of string literals: runs of whitespace become one space and whitespace
+    around brackets and commas is dropped, so that "ap_fixed<32, 16>" and
+    "ap_fixed<32,16>" read the same.
+    """
+
+    def normalize_code(code: str) -> str:
+        return RE_SPACE_AROUND_PUNCT.sub(r"\1", RE_WHITESPACE.sub(" ", code))
+
+    parts = []
+    pos = 0
+    for m in RE_STRING_LITERAL.finditer(txt):
+        parts.append(normalize_code(txt[pos : m.start()]))
+        parts.append(m.group())
+        pos = m.end()
+    parts.append(normalize_code(txt[pos:]))
+    return "".join(parts).strip()
+
+
+def canonical_config(config: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    `config` (a `SynthScaffold` config as returned by
+    `SynthScaffold.to_config()`, or a subset of one) in a canonical form, so
+    that different spellings of the same synthesis compare equal: missing
+    entries take their defaults, template argument and define values are
+    strings with `normalize_cpp()` applied (16 and "16" are the same value),
+    `clock_period` is a float and paths are strings.
+    """
+    canonical = {**CONFIG_DEFAULTS, **config}
+    canonical["input_source_files"] = [
+        str(Path(fp)) for fp in canonical.get("input_source_files", [])
+    ]
+    canonical["includes"] = [normalize_cpp(str(i)) for i in canonical["includes"]]
+    for name in ["template_args", "defines"]:
+        canonical[name] = {
+            k.strip(): normalize_cpp(str(v)) for k, v in canonical[name].items()
+        }
+    canonical["part"] = str(canonical["part"]).strip()
+    canonical["unsafe_math"] = bool(canonical["unsafe_math"])
+    canonical["clock_period"] = float(canonical["clock_period"])
+    for name in ["output_dir", "scratch_dir"]:
+        if canonical.get(name) is not None:
+            canonical[name] = str(Path(canonical[name]))
+    return canonical
+
+
+def config_key(config: dict[str, Any]) -> str:
+    """
+    Stable identifier of a `SynthScaffold` config (as returned by
+    `SynthScaffold.to_config()`), computed from its `canonical_config()`
+    with sorted keys, so that spellings of the same config share a key. The
+    entries in `RUN_OPTION_KEYS` are not part of the key, so the same design
+    lands on the same key wherever and however it is run.
+    """
+    config_id = {
+        k: v for k, v in canonical_config(config).items() if k not in RUN_OPTION_KEYS
+    }
+    config_id_txt = json.dumps(config_id, sort_keys=True, default=str)
+    return hashlib.sha256(config_id_txt.encode()).hexdigest()[:16]
 
 
 def parse_time_unit(s: str) -> float:
@@ -154,7 +222,118 @@ def parse_latency_t(s: str) -> float:
     return s_number * time_unit_scaler
 
 
-@dataclass
+# elements read from csynth.xml and from <module>_csynth.xml, in the pattern
+# syntax of `xml_extract.pattern_matches()`
+CSYNTH_TOP_PATTERNS = {
+    "module_name": ("InstancesList", "Instance", "ModuleName"),
+}
+CSYNTH_MODULE_PATTERNS = {
+    "part": ("UserAssignments", "Part"),
+    "flow_target": ("UserAssignments", "FlowTarget"),
+    "clock_unit": ("UserAssignments", "unit"),
+    "target_clock_period": ("UserAssignments", "TargetClockPeriod"),
+    "target_clock_uncertainty": ("UserAssignments", "ClockUncertainty"),
+    "achieved_clock_period": (
+        "PerformanceEstimates",
+        "SummaryOfTimingAnalysis",
+        "EstimatedClockPeriod",
+    ),
+    "latency_best_case": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Best-caseLatency",
+    ),
+    "latency_average_case": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Average-caseLatency",
+    ),
+    "latency_worst_case": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Worst-caseLatency",
+    ),
+    "latency_t_best_case": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Best-caseRealTimeLatency",
+    ),
+    "latency_t_average_case": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Average-caseRealTimeLatency",
+    ),
+    "latency_t_worst_case": (
+        "PerformanceEstimates",
+        "SummaryOfOverallLatency",
+        "Worst-caseRealTimeLatency",
+    ),
+    "resources_lut_used": ("AreaEstimates", "Resources", "LUT"),
+    "resources_ff_used": ("AreaEstimates", "Resources", "FF"),
+    "resources_dsp_used": ("AreaEstimates", "Resources", "DSP"),
+    "resources_bram_used": ("AreaEstimates", "Resources", "BRAM_18K"),
+    "resources_uram_used": ("AreaEstimates", "Resources", "URAM"),
+    "resources_lut_available": ("AreaEstimates", "AvailableResources", "LUT"),
+    "resources_ff_available": ("AreaEstimates", "AvailableResources", "FF"),
+    "resources_dsp_available": ("AreaEstimates", "AvailableResources", "DSP"),
+    "resources_bram_available": ("AreaEstimates", "AvailableResources", "BRAM_18K"),
+    "resources_uram_available": ("AreaEstimates", "AvailableResources", "URAM"),
+}
+
+
+def read_tool_version(report_dir: Path) -> str | None:
+    """
+    The Vitis HLS version that wrote the reports in `report_dir`, or `None`
+    if it cannot be read.
+    """
+    try:
+        texts = extract_texts(
+            report_dir / "csynth.xml", {"version": ("ReportVersion", "Version")}
+        )
+    except (OSError, ET.ParseError):
+        return None
+    return texts.get("version")
+
+
+def find_report_dirs(root_dir: Path) -> list[Path]:
+    """
+    Every `syn/report` directory under `root_dir`, in sorted order,
+    including those inside run archives. Report directories themselves are
+    not descended into.
+    """
+    report_dirs = []
+    stack = [str(root_dir)]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.endswith(ARCHIVE_SUFFIX) and entry.is_file():
+                report_dirs.extend(
+                    d
+                    for d in archived_dirs(Path(entry.path), "csynth.xml")
+                    if d.name == "report" and d.parent.name == "syn"
+                )
+                continue
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if entry.name == "report" and os.path.basename(dir_path) == "syn":
+                report_dirs.append(Path(entry.path))
+            else:
+                stack.append(entry.path)
+    return sorted(report_dirs)
+
+
+def _try_from_report_dir(report_dir: Path) -> "SynthReport | None":
+    try:
+        return SynthReport.from_report_dir(report_dir)
+    except (OSError, ValueError, ET.ParseError):
+        return None
+
+
+@dataclass(slots=True)
 class SynthReport:
     part: str
     flow_target: str
@@ -238,101 +417,94 @@ class SynthReport:
 
     @classmethod
     def from_report_dir(cls, report_dir: Path) -> "SynthReport":
+        """
+        Reads a report from a `syn/report` directory. Only the elements
+        listed in `CSYNTH_TOP_PATTERNS` and `CSYNTH_MODULE_PATTERNS` are
+        extracted, streaming each XML file and stopping as soon as they have
+        all been seen. The reports of an archived run are read from its
+        archive.
+        """
         xml_csynth_fp = report_dir / "csynth.xml"
-        if not xml_csynth_fp.exists():
+        if not path_exists(xml_csynth_fp):
             raise FileNotFoundError(f"File {xml_csynth_fp} does not exist")
 
-        xml_csynth = ET.parse(xml_csynth_fp).getroot()
-
-        instance_element = unwrap(xml_csynth.find(".//InstancesList/Instance"))
-
-        module_name_element = unwrap(instance_element.find("ModuleName"))
-        module_name = str(unwrap(module_name_element.text))
+        top = extract_texts(xml_csynth_fp, CSYNTH_TOP_PATTERNS)
+        module_name = unwrap(top.get("module_name"))
 
         xml_target_fn_fp = report_dir / f"{module_name}_csynth.xml"
-        if not xml_target_fn_fp.exists():
+        if not path_exists(xml_target_fn_fp):
             raise FileNotFoundError(f"File {xml_target_fn_fp} does not exist")
 
-        xml_target_fn = ET.parse(xml_target_fn_fp).getroot()
-
-        user_assignments = unwrap(xml_target_fn.find(".//UserAssignments"))
-
-        part = str(unwrap(user_assignments.findtext("Part")))
-        flow_target = str(unwrap(user_assignments.findtext("FlowTarget")))
-        clock_unit = str(unwrap(user_assignments.findtext("unit")))
-        target_clock_period = float(
-            unwrap(user_assignments.findtext("TargetClockPeriod"))
-        )
-        target_clock_uncertainty = float(
-            unwrap(user_assignments.findtext("ClockUncertainty"))
-        )
+        module = extract_texts(xml_target_fn_fp, CSYNTH_MODULE_PATTERNS)
+        return cls.from_module_texts(module_name, module, xml_target_fn_fp)
 
-        performance_est = unwrap(xml_target_fn.find(".//PerformanceEstimates"))
-        summary_of_timing = unwrap(performance_est.find("SummaryOfTimingAnalysis"))
-        achieved_clock_period = float(
-            unwrap(summary_of_timing.findtext("EstimatedClockPeriod"))
-        )
+    @classmethod
+    def from_module_texts(
+        cls, module_name: str, texts: Mapping[str, str], xml_fp: Path
+    ) -> "SynthReport":
+        """
+        A report from the texts of the `CSYNTH_MODULE_PATTERNS` elements
+        extracted from the `<module>_csynth.xml` at `xml_fp`.
+        """
 
-        summary_of_latency = unwrap(performance_est.find("SummaryOfOverallLatency"))
-        latency_best_case = int(unwrap(summary_of_latency.findtext("Best-caseLatency")))
-        latency_average_case = int(
-            unwrap(summary_of_latency.findtext("Average-caseLatency"))
-        )
-        latency_worst_case = int(
-            unwrap(summary_of_latency.findtext("Worst-caseLatency"))
-        )
+        def text(key: str) -> str:
+            return unwrap(texts.get(key), f"{xml_fp} has no {key}")
 
-        latency_t_best_case = parse_latency_t(
-            unwrap(summary_of_latency.findtext("Best-caseRealTimeLatency"))
-        )
-        latency_t_average_case = parse_latency_t(
-            unwrap(summary_of_latency.findtext("Average-caseRealTimeLatency"))
-        )
-        latency_t_worst_case = parse_latency_t(
-            unwrap(summary_of_latency.findtext("Worst-caseRealTimeLatency"))
+        return cls(
+            part=text("part"),
+            flow_target=text("flow_target"),
+            module_name=module_name,
+            clock_unit=text("clock_unit"),
+            target_clock_period=float(text("target_clock_period")),
+            target_clock_uncertainty=float(text("target_clock_uncertainty")),
+            achieved_clock_period=float(text("achieved_clock_period")),
+            latency_best_case=int(text("latency_best_case")),
+            latency_average_case=int(text("latency_average_case")),
+            latency_worst_case=int(text("latency_worst_case")),
+            latency_t_best_case=parse_latency_t(text("latency_t_best_case")),
+            latency_t_average_case=parse_latency_t(text("latency_t_average_case")),
+            latency_t_worst_case=parse_latency_t(text("latency_t_worst_case")),
+            resources_lut_used=int(text("resources_lut_used")),
+            resources_ff_used=int(text("resources_ff_used")),
+            resources_dsp_used=int(text("resources_dsp_used")),
+            resources_bram_used=int(text("resources_bram_used")),
+            resources_uram_used=int(text("resources_uram_used")),
+            resources_lut_available=int(text("resources_lut_available")),
+            resources_ff_available=int(text("resources_ff_available")),
+            resources_dsp_available=int(text("resources_dsp_available")),
+            resources_bram_available=int(text("resources_bram_available")),
+            resources_uram_available=int(text("resources_uram_available")),
         )
 
-        area_estimates = unwrap(xml_target_fn.find(".//AreaEstimates"))
-
-        resources = unwrap(area_estimates.find(".//Resources"))
-        resources_lut_used = int(unwrap(resources.findtext("LUT")))
-        resources_ff_used = int(unwrap(resources.findtext("FF")))
-        resources_dsp_used = int(unwrap(resources.findtext("DSP")))
-        resources_bram_used = int(unwrap(resources.findtext("BRAM_18K")))
-        resources_uram_used = int(unwrap(resources.findtext("URAM")))
+    @classmethod
+    def scan(
+        cls, root_dir: Path, workers: int | None = None
+    ) -> dict[Path, "SynthReport | None"]:
+        """
+        Finds every `syn/report` directory under `root_dir` and parses them
+        on `workers` processes (default: number of CPUs). Directories that
+        cannot be parsed map to `None`.
+        """
+        report_dirs = find_report_dirs(root_dir)
+        n_workers = workers if workers is not None else (os.cpu_count() or 1)
+        if n_workers <= 1 or len(report_dirs) <= 1:
+            return {d: _try_from_report_dir(d) for d in report_dirs}
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(report_dirs) // (n_workers * 4))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            reports = executor.map(
+                _try_from_report_dir, report_dirs, chunksize=chunksize
+            )
+            return dict(zip(report_dirs, reports))
 
-        resources_available = unwrap(area_estimates.find(".//AvailableResources"))
-        resources_lut_available = int(unwrap(resources_available.findtext("LUT")))
-        resources_ff_available = int(unwrap(resources_available.findtext("FF")))
-        resources_dsp_available = int(unwrap(resources_available.findtext("DSP")))
-        resources_bram_available = int(unwrap(resources_available.findtext("BRAM_18K")))
-        resources_uram_available = int(unwrap(resources_available.findtext("URAM")))
+    def to_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
 
-        return cls(
-            part=part,
-            flow_target=flow_target,
-            module_name=module_name,
-            clock_unit=clock_unit,
-            target_clock_period=target_clock_period,
-            target_clock_uncertainty=target_clock_uncertainty,
-            achieved_clock_period=achieved_clock_period,
-            latency_best_case=latency_best_case,
-            latency_average_case=latency_average_case,
-            latency_worst_case=latency_worst_case,
-            latency_t_best_case=latency_t_best_case,
-            latency_t_average_case=latency_t_average_case,
-            latency_t_worst_case=latency_t_worst_case,
-            resources_lut_used=resources_lut_used,
-            resources_ff_used=resources_ff_used,
-            resources_dsp_used=resources_dsp_used,
-            resources_bram_used=resources_bram_used,
-            resources_uram_used=resources_uram_used,
-            resources_lut_available=resources_lut_available,
-            resources_ff_available=resources_ff_available,
-            resources_dsp_available=resources_dsp_available,
-            resources_bram_available=resources_bram_available,
-            resources_uram_available=resources_uram_available,
-        )
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SynthReport":
+        return cls(**data)
 
     def text_summary(self) -> str:
         txt = ""
@@ -391,6 +563,77 @@ class SynthReport:
         print(self.text_summary())
 
 
+STAGING_MODES = ("copy", "symlink", "hardlink", "include")
+RETENTION_MODES = ("all", "reports", "archive")
+
+PROJECT_DIR_NAME = "synth_scaffold_project"
+STAGED_MANIFEST_NAME = ".staged_sources.json"
+
+# config entries that change where or how a config runs, but not its result
+RUN_OPTION_KEYS = ("output_dir", "scratch_dir", "retention")
+
+# where the tool writes the reports, relative to the directory it ran in
+REPORT_DIR_PATH = Path(PROJECT_DIR_NAME) / "solution_csynth" / "syn" / "report"
+
+# what is kept of a run by the "reports" retention mode and copied back from
+# a scratch directory, relative to the directory the tool ran in: the
+# reports, the tool log and the flow log the run metrics are read from
+RUN_RESULT_PATHS = (
+    Path("csynth.log"),
+    REPORT_DIR_PATH,
+    Path(PROJECT_DIR_NAME)
+    / "solution_csynth"
+    / ".autopilot"
+    / "db"
+    / "autopilot.flow.log",
+)
+
+
+def vitis_hls_args(tcl_script_name: str, log_name: str) -> list[str]:
+    bin_match = shutil.which("vitis_hls")
+    if bin_match is None:
+        raise FileNotFoundError("Could not find the Vitis HLS binary")
+
+    args = [
+        bin_match,
+        tcl_script_name,
+        "-l",
+        log_name,
+    ]
+    return args
+
+
+def write_if_changed(fp: Path, txt: str) -> bool:
+    """
+    Writes `txt` to `fp` unless the file already has exactly that content, so
+    that unchanged files keep their mtime. Returns whether the file was
+    written.
+    """
+    try:
+        if fp.read_text() == txt:
+            return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    fp.write_text(txt)
+    return True
+
+
+@dataclass
+class RunInfo:
+    returncode: int | None
+    runtime_s: float
+    peak_rss_bytes: int | None = None
+    cache_hit: bool = False
+    up_to_date: bool = False
+    phase_times_s: dict[str, float] = dataclasses.field(default_factory=dict)
+    timed_out: str | None = None
+    metrics: RunMetrics | None = None
+    # the compiler errors of a config that failed the pre-check
+    precheck_diagnostics: str | None = None
+    # the report is that of a concurrent run of the same config
+    shared_flight: bool = False
+
+
 class SynthScaffold:
     def __init__(
         self,
@@ -403,6 +646,13 @@ class SynthScaffold:
         part: str = "xczu9eg-ffvb1156-2-e",
         unsafe_math: bool = False,
         clock_period: float = 5.0,
+        cache: "SynthCache | None" = None,
+        source_index: "SourceIndex | None" = None,
+        precheck: "Precheck | None" = None,
+        single_flight: "SingleFlight | None" = None,
+        staging: str = "copy",
+        scratch_dir: Path | None = None,
+        retention: str = "all",
     ) -> None:
         self.target_fn = target_fn
         self.includes = includes
@@ -415,12 +665,107 @@ class SynthScaffold:
         self.unsafe_math = unsafe_math
         self.clock_period = clock_period
 
+        self.cache = cache
+        self.source_index = source_index
+        self.precheck = precheck
+        self.single_flight = single_flight
+
+        if staging not in STAGING_MODES:
+            raise ValueError(
+                f"Unknown staging mode: {staging} (expected one of {', '.join(STAGING_MODES)})"
+            )
+        self.staging = staging
+        self.scratch_dir = scratch_dir
+
+        if retention not in RETENTION_MODES:
+            raise ValueError(
+                f"Unknown retention mode: {retention} (expected one of {', '.join(RETENTION_MODES)})"
+            )
+        self.retention = retention
+
+        self.last_run: RunInfo | None = None
+        self.metrics = RunMetrics()
+        self._tool_span: OpenSpan | None = None
+
         # check that all the source files exist
         for file in self.input_source_files:
             if not file.exists():
                 raise FileNotFoundError(f"File {file} does not exist")
 
-    def generate(self) -> None:
+        # staged files are placed in `output_dir` by name, where the scaffold
+        # includes them, so two different files must not share a name
+        if self.staging != "include":
+            staged_fps: dict[str, Path] = {}
+            for file in self.input_source_files:
+                other = staged_fps.setdefault(file.name, file)
+                if other.resolve() != file.resolve():
+                    raise ValueError(
+                        f"Input source files {other} and {file} have the same name "
+                        'and cannot both be staged; rename one or use staging="include"'
+                    )
+
+    def to_config(self) -> dict[str, Any]:
+        return {
+            "input_source_files": [str(fp) for fp in self.input_source_files],
+            "output_dir": str(self.output_dir),
+            "target_fn": self.target_fn,
+            "includes": list(self.includes),
+            "template_args": dict(self.template_args),
+            "defines": dict(self.defines),
+            "part": self.part,
+            "unsafe_math": self.unsafe_math,
+            "clock_period": self.clock_period,
+            "staging": self.staging,
+            "scratch_dir": str(self.scratch_dir) if self.scratch_dir else None,
+            "retention": self.retention,
+        }
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], **kwargs: Any) -> "SynthScaffold":
+        config = dict(config)
+        config["input_source_files"] = [Path(fp) for fp in config["input_source_files"]]
+        config["output_dir"] = Path(config["output_dir"])
+        if config.get("scratch_dir") is not None:
+            config["scratch_dir"] = Path(config["scratch_dir"])
+        return cls(**config, **kwargs)
+
+    def find_target_fn(self) -> FunctionSignature:
+        target_fn_signature = None
+        if self.source_index is not None:
+            target_fn_signature = self.source_index.lookup(
+                self.target_fn, self.input_source_files
+            )
+        else:
+            for fp in self.input_source_files:
+                target_fn_signature = find_function_signature(
+                    fp.read_text(), self.target_fn, fp
+                )
+                if target_fn_signature is not None:
+                    break
+
+        if target_fn_signature is None:
+            raise ValueError(
+                f"Could not find target function {self.target_fn} in any of the source files"
+            )
+        return target_fn_signature
+
+    def generate(self) -> bool:
+        """
+        Writes the scaffold, the TCL script and the staged sources into
+        `output_dir`. Files whose content is already up to date are not
+        touched, so a completed project survives repeated calls.
+
+        Returns whether synthesis has to run again, i.e. whether anything
+        changed or there is no report newer than all inputs.
+
+        Starts a new `RunMetrics` in `metrics`, which the following `run()`
+        adds to.
+        """
+        self.metrics = RunMetrics()
+        with self.metrics.span("generate"):
+            return self._generate()
+
+    def _generate(self) -> bool:
         synth_wrapper_cpp = ""
 
         for include in self.includes:
@@ -439,34 +784,18 @@ class SynthScaffold:
             synth_wrapper_cpp += "\n\n"
 
         # parse out the target function data from source files
-        target_fn_match = None
-        target_fn_pattern = build_regex_pattern_from_func(self, self.target_fn)
-        for fp in self.input_source_files:
-            source_txt = fp.read_text()
-            source_txt = "\n".join(
-                line
-                for line in source_txt.splitlines()
-                if not line.strip().startswith("//")
-            )
-            match = target_fn_pattern.search(source_txt)
-            if match:
-                target_fn_match = match
-                break
-
-        if target_fn_match is None:
-            raise ValueError(
-                f"Could not find target function {self.target_fn} in any of the source files"
-            )
+        with self.metrics.span("find_target_fn"):
+            target_fn_signature = self.find_target_fn()
 
         # extract the target function signature
-        target_fn_template_args = target_fn_match.group("template_args")
-        target_fn_ret_type = target_fn_match.group("ret_type").strip()
+        target_fn_template_args = target_fn_signature.template_args
+        target_fn_ret_type = target_fn_signature.ret_type
         if not target_fn_ret_type:
             raise ValueError("Could not find return type for target function")
         if target_fn_ret_type != "void":
             target_fn_ret_type = f"auto"
         # target_fn_ret_type = "auto"
-        target_fn_args = target_fn_match.group("args").strip()
+        target_fn_args = target_fn_signature.args
         if not target_fn_args:
             raise ValueError("Could not find arguments for target function")
 
@@ -559,18 +888,41 @@ class SynthScaffold:
 
         synth_wrapper_cpp += scaffold_fn_code
 
-        if self.output_dir.exists():
-            shutil.rmtree(self.output_dir)
-
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         synth_wrapper_cpp_fp = self.output_dir / "scaffold.cpp"
-        synth_wrapper_cpp_fp.write_text(synth_wrapper_cpp)
+        changed = write_if_changed(synth_wrapper_cpp_fp, synth_wrapper_cpp)
+
+        tcl_script_txt = self.tcl_commands()
+        tcl_script_txt += "exit\n"
+
+        tcl_script_fp = self.output_dir / "csynth.tcl"
+        changed |= write_if_changed(tcl_script_fp, tcl_script_txt)
+
+        with self.metrics.span("stage_sources"):
+            changed |= self.stage_sources()
+
+        return changed or not self.is_up_to_date()
+
+    def tcl_commands(self) -> str:
+        """
+        The TCL commands that create the project and synthesize the scaffold,
+        without the final `exit`. Relative paths are resolved against the
+        tool's working directory, which must be `output_dir`.
+        """
+        scaffold_fp = self.output_dir / "scaffold.cpp"
 
         tcl_script_txt = ""
-        tcl_script_txt += "open_project -reset synth_scaffold_project\n"
+        tcl_script_txt += f"open_project -reset {PROJECT_DIR_NAME}\n"
         tcl_script_txt += "\n\n"
-        tcl_script_txt += f"add_files {synth_wrapper_cpp_fp}\n"
+        if self.staging == "include":
+            include_dirs = list(
+                dict.fromkeys(fp.resolve().parent for fp in self.input_source_files)
+            )
+            cflags = " ".join(f"-I{d}" for d in include_dirs)
+            tcl_script_txt += f'add_files {scaffold_fp} -cflags "{cflags}"\n'
+        else:
+            tcl_script_txt += f"add_files {scaffold_fp}\n"
         tcl_script_txt += "\n\n"
         tcl_script_txt += "set_top scaffold_fn\n"
         tcl_script_txt += "\n\n"
@@ -586,46 +938,319 @@ class SynthScaffold:
         tcl_script_txt += "\n\n"
         tcl_script_txt += "csynth_design\n"
         tcl_script_txt += "\n\n"
-        tcl_script_txt += "exit\n"
 
-        tcl_script_fp = self.output_dir / "csynth.tcl"
-        tcl_script_fp.write_text(tcl_script_txt)
+        return tcl_script_txt
+
+    def stage_sources(self) -> bool:
+        """
+        Makes the input source files visible to the scaffold in
+        `output_dir` according to `self.staging`:
+            - "copy": copies of each file, with the original's mtime
+            - "symlink": symbolic links to the original files
+            - "hardlink": hard links, falling back to a copy when the output
+              directory is on a different filesystem
+            - "include": nothing is staged; the TCL script passes the
+              original directories to the compiler with -I instead
+
+        Files that are already staged correctly are left alone, and files
+        staged by a previous `generate()` that are no longer inputs are
+        removed. Returns whether anything in `output_dir` changed.
+        """
+        manifest_fp = self.output_dir / STAGED_MANIFEST_NAME
+        previous: list[str] = []
+        if manifest_fp.exists():
+            previous = json.loads(manifest_fp.read_text())
+
+        staged: list[str] = []
+        changed = False
+        if self.staging != "include":
+            for fp in self.input_source_files:
+                fp_dst = self.output_dir / fp.name
+                staged.append(fp.name)
+                if self.is_staged(fp, fp_dst):
+                    continue
+                if fp_dst.exists() or fp_dst.is_symlink():
+                    fp_dst.unlink()
+                match self.staging:
+                    case "copy":
+                        shutil.copy2(fp, fp_dst)
+                        self.metrics.bytes_staged += fp_dst.stat().st_size
+                    case "symlink":
+                        fp_dst.symlink_to(fp.resolve())
+                    case "hardlink":
+                        try:
+                            os.link(fp, fp_dst)
+                        except OSError:
+                            shutil.copy2(fp, fp_dst)
+                            self.metrics.bytes_staged += fp_dst.stat().st_size
+                changed = True
+
+        for name in set(previous) - set(staged):
+            fp_stale = self.output_dir / name
+            if fp_stale.exists() or fp_stale.is_symlink():
+                fp_stale.unlink()
+                changed = True
+
+        write_if_changed(manifest_fp, json.dumps(staged))
+        return changed
+
+    def is_staged(self, fp: Path, fp_dst: Path) -> bool:
+        if self.staging == "symlink":
+            return fp_dst.is_symlink() and fp_dst.readlink() == fp.resolve()
+        if not fp_dst.exists() or fp_dst.is_symlink():
+            return False
+        st, st_dst = fp.stat(), fp_dst.stat()
+        if self.staging == "hardlink" and os.path.samestat(st, st_dst):
+            return True
+        # copies made with copy2 carry the original's mtime, so an unchanged
+        # size and mtime means an unchanged file
+        return st.st_size == st_dst.st_size and st.st_mtime_ns == st_dst.st_mtime_ns
+
+    @property
+    def project_dir(self) -> Path:
+        return self.output_dir / PROJECT_DIR_NAME
+
+    @property
+    def report_dir(self) -> Path:
+        return self.output_dir / REPORT_DIR_PATH
+
+    def report_tree(self) -> "ReportTree":
+        """
+        The per-instance reports of the last run: the target function and
+        every module it calls, read from the run's report directory.
+        """
+        from .hierarchy import ReportTree
+
+        return ReportTree.from_report_dir(self.report_dir)
+
+    def is_up_to_date(self) -> bool:
+        """
+        Whether the synthesis report in `output_dir` is newer than the
+        generated scaffold and TCL script and every input source file.
+        """
+        report_fp = self.report_dir / "csynth.xml"
+        if not report_fp.exists():
+            if not path_exists(report_fp):
+                return False
+            # an archived run was archived after its report was written
+            report_fp = archive_path(self.project_dir)
+        report_mtime_ns = report_fp.stat().st_mtime_ns
+        input_fps = [
+            self.output_dir / "scaffold.cpp",
+            self.output_dir / "csynth.tcl",
+            *self.input_source_files,
+        ]
+        for fp in input_fps:
+            try:
+                if fp.stat().st_mtime_ns > report_mtime_ns:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
 
+    def cache_key(self) -> str:
+        """
+        Hash everything that affects the synthesis result: the generated
+        scaffold and TCL script, the part and clock, the contents of every
+        input source file, and the resolved Vitis HLS binary.
+
+        Must be called after `generate()`. The output directory is masked out
+        of the TCL script so that identical runs in different directories
+        share the same key.
+        """
+        h = hashlib.sha256()
+
+        def update(label: str, data: bytes) -> None:
+            h.update(label.encode())
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+
+        update("scaffold.cpp", (self.output_dir / "scaffold.cpp").read_bytes())
+        tcl_script_txt = (self.output_dir / "csynth.tcl").read_text()
+        tcl_script_txt = tcl_script_txt.replace(str(self.output_dir), "<output_dir>")
+        update("csynth.tcl", tcl_script_txt.encode())
+        update("part", self.part.encode())
+        update("clock_period", str(float(self.clock_period)).encode())
         for fp in self.input_source_files:
-            fp_dst = self.output_dir / fp.name
-            fp_dst.write_text(fp.read_text())
+            update(f"source:{fp.name}", fp.read_bytes())
 
-    def run(self, verbose: bool = False) -> SynthReport | None:
+        bin_match = shutil.which("vitis_hls")
+        bin_path = os.path.realpath(bin_match) if bin_match is not None else ""
+        update("vitis_hls", bin_path.encode())
+
+        return h.hexdigest()
+
+    def _reuse_result(
+        self, verbose: bool = False
+    ) -> tuple[str | None, SynthReport | None]:
+        """
+        Looks for a result that makes running the tool unnecessary: a
+        complete report in `output_dir` that is newer than all inputs, or a
+        cache hit.
+        Returns the cache key (if there is a cache) and the reused report.
+        """
         tcl_script_fp = self.output_dir / "csynth.tcl"
         if not tcl_script_fp.exists():
             raise FileNotFoundError(f"File {tcl_script_fp} does not exist")
 
-        bin_match = shutil.which("vitis_hls")
-        if bin_match is None:
-            raise FileNotFoundError("Could not find the Vitis HLS binary")
-
-        args = [
-            bin_match,
-            "csynth.tcl",
-            "-l",
-            "csynth.log",
-        ]
+        if self.is_up_to_date():
+            # a damaged or partial report (e.g. from an interrupted run) is
+            # not reused; the tool runs again
+            report = _try_from_report_dir(self.report_dir)
+            if report is not None:
+                if verbose:
+                    print(f"Up To Date: {self.report_dir}")
+                self.last_run = RunInfo(
+                    returncode=None,
+                    runtime_s=0.0,
+                    up_to_date=True,
+                    metrics=self.metrics,
+                )
+                return None, report
 
-        p = subprocess.run(
-            args,
-            cwd=self.output_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            bufsize=-1,
+        if self.cache is None:
+            return None, None
+
+        cache_key = self.cache_key()
+        cached_report = self.cache.get(cache_key)
+        if verbose:
+            print(f"Cache Key: {cache_key}")
+            print(f"Cache Hit: {cached_report is not None}")
+        if cached_report is not None:
+            self.last_run = RunInfo(
+                returncode=None, runtime_s=0.0, cache_hit=True, metrics=self.metrics
+            )
+        return cache_key, cached_report
+
+    def _passes_precheck(self) -> bool:
+        """
+        Compiles the scaffold with `precheck`, if there is one. A config that
+        fails gets a `last_run` with the compiler's errors and should not be
+        run.
+        """
+        if self.precheck is None:
+            return True
+        with self.metrics.span("precheck"):
+            result = self.precheck.check(self)
+        self._record_precheck(result)
+        return result.passed
+
+    def _record_precheck(self, result: "PrecheckResult") -> None:
+        """
+        Keeps the compiler's errors in `precheck.log` and, if the config
+        failed, in `last_run`.
+        """
+        from .precheck import PRECHECK_LOG_NAME
+
+        precheck_log_fp = self.output_dir / PRECHECK_LOG_NAME
+        if result.passed:
+            precheck_log_fp.unlink(missing_ok=True)
+            return
+        precheck_log_fp.write_text(result.diagnostics)
+        self.last_run = RunInfo(
+            returncode=None,
+            runtime_s=result.runtime_s,
+            metrics=self.metrics,
+            precheck_diagnostics=result.diagnostics,
         )
 
+    def _join_flight(self, verbose: bool = False) -> "Flight | None":
+        """
+        Takes the `single_flight` lock of this config's `config_key()`,
+        waiting while another requester runs the same config. If that run
+        produced a report, the flight's `shared_report` holds it and
+        `last_run` records it as shared; otherwise the caller runs the tool
+        and publishes its report on the flight before releasing it.
+        """
+        if self.single_flight is None:
+            return None
+        key = config_key(self.to_config())
+        with self.metrics.span("single_flight"):
+            flight = self.single_flight.acquire(key)
+        if verbose:
+            print(f"Flight Key: {key}")
+            print(f"Shared Flight: {flight.shared_report is not None}")
+        if flight.shared_report is not None:
+            self.last_run = RunInfo(
+                returncode=None,
+                runtime_s=0.0,
+                metrics=self.metrics,
+                shared_flight=True,
+            )
+        return flight
+
+    def _clear_project(self) -> None:
+        # a stale project from an earlier run must not be mistaken for the
+        # result of this one if the tool fails before writing a new report
+        if self.project_dir.exists():
+            shutil.rmtree(self.project_dir)
+        archive_path(self.project_dir).unlink(missing_ok=True)
+
+    @contextlib.contextmanager
+    def _work_dir(self) -> Iterator[Path]:
+        """
+        The directory the tool runs in. Without a `scratch_dir` that is
+        `output_dir`. Otherwise it is a new directory under `scratch_dir`:
+        the reports and logs are copied back into `output_dir` and the
+        directory is removed when the run ends, whether it finished, failed,
+        timed out or was interrupted. Directories left behind by killed
+        processes are removed first.
+        """
+        if self.scratch_dir is None:
+            yield self.output_dir
+            return
+
+        from .scratch import copy_back, make_scratch_dir, remove_stale_scratch_dirs
+
+        remove_stale_scratch_dirs(self.scratch_dir)
+        work_dir = make_scratch_dir(self.scratch_dir)
+        try:
+            shutil.copy2(self.output_dir / "csynth.tcl", work_dir / "csynth.tcl")
+            yield work_dir
+        finally:
+            try:
+                with self.metrics.span("copy_back"):
+                    copy_back(work_dir, self.output_dir)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    @contextlib.asynccontextmanager
+    async def _work_dir_async(self) -> AsyncIterator[Path]:
+        """
+        `_work_dir()` with its copying and removal of files run in a thread,
+        off the event loop.
+        """
+        work_dir_cm = self._work_dir()
+        work_dir = await asyncio.to_thread(work_dir_cm.__enter__)
+        try:
+            yield work_dir
+        except BaseException as e:
+            if not await asyncio.to_thread(
+                work_dir_cm.__exit__, type(e), e, e.__traceback__
+            ):
+                raise
+        else:
+            await asyncio.to_thread(work_dir_cm.__exit__, None, None, None)
+
+    def _tool_args(self) -> list[str]:
+        return vitis_hls_args("csynth.tcl", "csynth.log")
+
+    def _collect_report(
+        self, cache_key: str | None, verbose: bool = False
+    ) -> SynthReport | None:
+        run_info = unwrap(self.last_run)
         if verbose:
-            print(f"Return Code: {p.returncode}")
+            print(f"Return Code: {run_info.returncode}")
+            if run_info.timed_out is not None:
+                print(f"Timed Out: {run_info.timed_out}")
+            for phase, phase_time_s in run_info.phase_times_s.items():
+                print(f"Phase {phase}: {phase_time_s:.1f} s")
+            if run_info.peak_rss_bytes is not None:
+                print(f"Peak RSS: {run_info.peak_rss_bytes / 1024**2:.1f} MiB")
             print(f"Log Path: {self.output_dir / 'csynth.log'}")
 
         flow_log_fp: Path = (
-            self.output_dir
-            / "synth_scaffold_project"
+            self.project_dir
             / "solution_csynth"
             / ".autopilot"
             / "db"
@@ -635,29 +1260,362 @@ class SynthScaffold:
         if verbose:
             print(f"Autopilot Flow Log: {flow_log_fp_str}")
 
-        report_dir: Path = (
-            self.output_dir
-            / "synth_scaffold_project"
-            / "solution_csynth"
-            / "syn"
-            / "report"
-        )
+        report_dir = self.report_dir
         report_dir_str: str | None = str(report_dir) if report_dir.exists() else None
         if verbose:
             print(f"Report Dir: {report_dir_str}")
 
+        self.metrics.peak_rss_bytes = run_info.peak_rss_bytes
+        if flow_log_fp_str is not None:
+            self.metrics.flow_log_times_s = parse_flow_log(
+                flow_log_fp.read_text(errors="replace")
+            )
+        run_info.metrics = self.metrics
+
+        report = None
         if report_dir.exists():
-            return SynthReport.from_report_dir(report_dir)
+            with self.metrics.span("read_report"):
+                report = SynthReport.from_report_dir(report_dir)
+            if self.cache is not None:
+                self.cache.put(unwrap(cache_key), report, run_info.runtime_s)
+
+        if self.retention != "all":
+            from .retention import apply_retention
+
+            with self.metrics.span("retention"):
+                apply_retention(self.output_dir, self.retention)
+        return report
+
+    def _monitor(
+        self,
+        timeout_s: float | None,
+        phase_timeouts_s: dict[str, float] | None,
+        on_progress: Callable[[ProgressEvent], None] | None = None,
+    ) -> PhaseMonitor:
+        self._tool_span = open_span("vitis_hls", "tool")
+        return PhaseMonitor(
+            timeout_s=timeout_s,
+            phase_timeouts_s=phase_timeouts_s,
+            status_fp=self.output_dir / "run_status.json",
+            on_progress=on_progress,
+        )
+
+    def _finish_run(
+        self,
+        returncode: int | None,
+        rss_sampler: RssSampler,
+        monitor: PhaseMonitor,
+        timed_out: str | None,
+    ) -> None:
+        if timed_out is not None:
+            state = "timed_out"
+        elif returncode == 0:
+            state = "finished"
         else:
+            state = "failed"
+        tool_span = self.metrics.close_span(unwrap(self._tool_span))
+        self.metrics.add_phase_spans(tool_span, monitor.events)
+        self.last_run = RunInfo(
+            returncode=returncode,
+            runtime_s=monitor.elapsed_s(),
+            peak_rss_bytes=rss_sampler.peak_rss_bytes,
+            phase_times_s=monitor.finish(state),
+            timed_out=timed_out,
+        )
+
+    def run(
+        self,
+        verbose: bool = False,
+        timeout_s: float | None = None,
+        phase_timeouts_s: dict[str, float] | None = None,
+        on_progress: Callable[[ProgressEvent], None] | None = None,
+    ) -> SynthReport | None:
+        """
+        Runs Vitis HLS on the generated scaffold and parses its report.
+
+        The tool's output is followed while it runs: every transition between
+        synthesis phases (elaboration, transformation, scheduling, binding,
+        RTL generation) is passed to `on_progress` and written to
+        `run_status.json` in `output_dir`. If the run exceeds `timeout_s`, or
+        a phase exceeds its entry in `phase_timeouts_s`, the tool's whole
+        process tree is killed. The time spent in each phase and the timeout
+        that fired, if any, are recorded in `last_run`.
+
+        With a `precheck`, the scaffold is compiled first, and a config that
+        does not compile returns `None` without starting the tool.
+
+        With a `single_flight`, a config that another process or thread is
+        already running waits for that run and returns its report instead
+        of starting the tool again.
+        """
+        with self.metrics.span("reuse_check"):
+            cache_key, cached_report = self._reuse_result(verbose=verbose)
+        if cached_report is not None:
+            return cached_report
+        if not self._passes_precheck():
             return None
 
-    def generate_and_run(self, verbose: bool = False) -> None | SynthReport:
+        flight = self._join_flight(verbose=verbose)
+        try:
+            if flight is not None and flight.shared_report is not None:
+                return flight.shared_report
+
+            args = self._tool_args()
+            self._clear_project()
+
+            with self._work_dir() as work_dir:
+                self._run_tool(args, work_dir, timeout_s, phase_timeouts_s, on_progress)
+
+            report = self._collect_report(cache_key, verbose=verbose)
+            if flight is not None:
+                flight.publish(report)
+            return report
+        finally:
+            if flight is not None:
+                flight.release()
+
+    def _run_tool(
+        self,
+        args: list[str],
+        work_dir: Path,
+        timeout_s: float | None,
+        phase_timeouts_s: dict[str, float] | None,
+        on_progress: Callable[[ProgressEvent], None] | None,
+    ) -> None:
+        monitor = self._monitor(timeout_s, phase_timeouts_s, on_progress)
+        p = subprocess.Popen(
+            args,
+            cwd=work_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            start_new_session=True,
+        )
+
+        def pump() -> None:
+            for line in unwrap(p.stdout):
+                monitor.feed(line)
+
+        reader = threading.Thread(target=pump, daemon=True)
+        reader.start()
+
+        timed_out = None
+        with RssSampler(p.pid) as rss_sampler:
+            try:
+                while True:
+                    try:
+                        p.wait(timeout=MONITOR_INTERVAL_S)
+                        break
+                    except subprocess.TimeoutExpired:
+                        timed_out = monitor.timeout_reason()
+                        if timed_out is not None:
+                            kill_process_group(p.pid)
+                            p.wait()
+                            break
+            except BaseException:
+                # e.g. Ctrl-C: the tool runs in its own session, so it would
+                # outlive us and keep writing into output_dir
+                kill_process_group(p.pid)
+                p.wait()
+                monitor.finish("cancelled")
+                raise
+        reader.join()
+        unwrap(p.stdout).close()
+
+        self._finish_run(p.returncode, rss_sampler, monitor, timed_out)
+
+    def generate_and_run(
+        self,
+        verbose: bool = False,
+        timeout_s: float | None = None,
+        phase_timeouts_s: dict[str, float] | None = None,
+        on_progress: Callable[[ProgressEvent], None] | None = None,
+    ) -> None | SynthReport:
         self.generate()
-        result = self.run(verbose=verbose)
+        result = self.run(
+            verbose=verbose,
+            timeout_s=timeout_s,
+            phase_timeouts_s=phase_timeouts_s,
+            on_progress=on_progress,
+        )
         return result
 
+    async def generate_async(self) -> bool:
+        return await asyncio.to_thread(self.generate)
+
+    async def run_async(
+        self,
+        verbose: bool = False,
+        on_output: OutputCallback | None = None,
+        timeout_s: float | None = None,
+        phase_timeouts_s: dict[str, float] | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> SynthReport | None:
+        """
+        Like `run()`, but drives `vitis_hls` as an asyncio subprocess so that
+        a single event loop can supervise many syntheses at once.
+
+        Each line the tool writes to stdout or stderr is passed to the
+        `on_output` coroutine as it arrives instead of being buffered, and
+        phase transitions are passed to the `on_progress` coroutine. The
+        tool runs in its own process group; cancelling the task or exceeding
+        a timeout kills the whole group, including the children `vitis_hls`
+        spawns.
+        """
+        with self.metrics.span("reuse_check"):
+            cache_key, cached_report = await asyncio.to_thread(
+                self._reuse_result, verbose
+            )
+        if cached_report is not None:
+            return cached_report
+        if not await asyncio.to_thread(self._passes_precheck):
+            return None
+
+        flight = await asyncio.to_thread(self._join_flight, verbose)
+        try:
+            if flight is not None and flight.shared_report is not None:
+                return flight.shared_report
+
+            args = self._tool_args()
+            await asyncio.to_thread(self._clear_project)
+
+            async with self._work_dir_async() as work_dir:
+                await self._run_tool_async(
+                    args, work_dir, on_output, timeout_s, phase_timeouts_s, on_progress
+                )
+
+            report = await asyncio.to_thread(self._collect_report, cache_key, verbose)
+            if flight is not None:
+                flight.publish(report)
+            return report
+        finally:
+            if flight is not None:
+                flight.release()
+
+    async def _run_tool_async(
+        self,
+        args: list[str],
+        work_dir: Path,
+        on_output: OutputCallback | None,
+        timeout_s: float | None,
+        phase_timeouts_s: dict[str, float] | None,
+        on_progress: ProgressCallback | None,
+    ) -> None:
+        monitor = self._monitor(timeout_s, phase_timeouts_s)
+        p = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=work_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        rss_sampler = RssSampler(p.pid)
+        timed_out = None
+
+        async def pump(stream: asyncio.StreamReader) -> None:
+            async for line in stream:
+                line_txt = line.decode(errors="replace").rstrip("\n")
+                event = monitor.feed(line_txt)
+                if event is not None and on_progress is not None:
+                    await on_progress(event)
+                if on_output is not None:
+                    await on_output(line_txt)
+
+        async def watchdog() -> None:
+            nonlocal timed_out
+            while timed_out is None:
+                await asyncio.sleep(MONITOR_INTERVAL_S)
+                timed_out = monitor.timeout_reason()
+            kill_process_group(p.pid)
+
+        ASYNC_RSS_SAMPLERS.add(rss_sampler)
+        watchdog_task = asyncio.create_task(watchdog())
+        try:
+            await asyncio.gather(
+                pump(unwrap(p.stdout)),
+                pump(unwrap(p.stderr)),
+                p.wait(),
+            )
+        except BaseException:
+            # covers cancellation as well as a failing output callback
+            if p.returncode is None:
+                kill_process_group(p.pid)
+                await p.wait()
+            monitor.finish("cancelled")
+            raise
+        finally:
+            ASYNC_RSS_SAMPLERS.remove(rss_sampler)
+            watchdog_task.cancel()
+
+        self._finish_run(p.returncode, rss_sampler, monitor, timed_out)
+
+    async def generate_and_run_async(
+        self,
+        verbose: bool = False,
+        on_output: OutputCallback | None = None,
+        timeout_s: float | None = None,
+        phase_timeouts_s: dict[str, float] | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> SynthReport | None:
+        await self.generate_async()
+        result = await self.run_async(
+            verbose=verbose,
+            on_output=on_output,
+            timeout_s=timeout_s,
+            phase_timeouts_s=phase_timeouts_s,
+            on_progress=on_progress,
+        )
+        return result
+
+    @staticmethod
+    def sweep(
+        base_config: dict[str, Any],
+        design_space: "DesignSpace",
+        max_workers: int | None = None,
+        **kwargs: Any,
+    ) -> Iterator[tuple[dict[str, Any], SynthReport | None]]:
+        from .sweep import sweep
+
+        return sweep(base_config, design_space, max_workers=max_workers, **kwargs)
+
+    @staticmethod
+    def run_batch(
+        scaffolds: list["SynthScaffold"], batch_dir: Path, verbose: bool = False
+    ) -> list[SynthReport | None]:
+        from .batch import run_batch
+
+        return run_batch(scaffolds, batch_dir, verbose=verbose)
+
+
+# "module" or "module:function"; the function defaults to `main`
+SUBCOMMANDS = {
+    "sweep": "synth_scaffold.sweep",
+    "submit": "synth_scaffold.job_queue:submit_main",
+    "worker": "synth_scaffold.job_queue:worker_main",
+    "gc": "synth_scaffold.retention",
+}
+
+
+# the defaults of the `SynthScaffold` config entries that have one
+CONFIG_DEFAULTS: dict[str, Any] = {
+    name: param.default
+    for name, param in inspect.signature(SynthScaffold.__init__).parameters.items()
+    if param.default is not inspect.Parameter.empty
+    and name not in ("cache", "source_index", "precheck", "single_flight")
+}
+
 
 def main(args=None) -> bool:
+    argv: list[str] = sys.argv[1:] if args is None else list(args)
+    if argv and argv[0] in SUBCOMMANDS:
+        import importlib
+
+        module_name, _, fn_name = SUBCOMMANDS[argv[0]].partition(":")
+        subcommand = importlib.import_module(module_name)
+        return getattr(subcommand, fn_name or "main")(argv[1:])
+
     parser = argparse.ArgumentParser()
 
     parser.add_argument(
@@ -700,13 +1658,70 @@ def main(args=None) -> bool:
         default=[],
         help="Defines to add to the generated scaffold",
     )
+    parser.add_argument(
+        "--staging",
+        type=str,
+        choices=STAGING_MODES,
+        default="copy",
+        help="How to make the input source files available to the synthesis run",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory of a persistent synthesis result cache to reuse",
+    )
+    parser.add_argument(
+        "--scratch-dir",
+        type=Path,
+        default=None,
+        help="Run the tool under this directory (e.g. /dev/shm) and copy back only the reports and logs",
+    )
+    parser.add_argument(
+        "--precheck",
+        action="store_true",
+        help="Compile the scaffold with the host C++ compiler first and do not start the tool if it fails",
+    )
+    parser.add_argument(
+        "--precheck-include-dirs",
+        type=Path,
+        nargs="+",
+        default=None,
+        help="Include directories with the HLS headers for --precheck (default: those of the Vitis HLS install)",
+    )
+    parser.add_argument(
+        "--retention",
+        type=str,
+        choices=RETENTION_MODES,
+        default="all",
+        help="What to keep of the tool's project directory after the run",
+    )
+    parser.add_argument(
+        "--single-flight-dir",
+        type=Path,
+        default=None,
+        help="Shared directory of single-flight locks; wait for and reuse a concurrent run of the same config",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Kill the synthesis after this many seconds",
+    )
+    parser.add_argument(
+        "--phase-timeouts",
+        type=str,
+        nargs="+",
+        default=[],
+        help="Per-phase timeouts in seconds, e.g. scheduling=600 binding=600",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Print verbose output",
     )
 
-    args: argparse.Namespace = parser.parse_args(args)
+    args: argparse.Namespace = parser.parse_args(argv)
 
     input_source_files = [Path(fp) for fp in args.input_source_files]
     includes = args.includes
@@ -719,6 +1734,29 @@ def main(args=None) -> bool:
         key, value = define.split("=")
         defines[key] = value
 
+    phase_timeouts_s = {}
+    for phase_timeout in args.phase_timeouts:
+        phase, seconds = phase_timeout.split("=")
+        phase_timeouts_s[phase] = float(seconds)
+
+    cache = None
+    if args.cache_dir is not None:
+        from .cache import SynthCache
+
+        cache = SynthCache(args.cache_dir)
+
+    precheck = None
+    if args.precheck:
+        from .precheck import Precheck
+
+        precheck = Precheck(include_dirs=args.precheck_include_dirs)
+
+    single_flight = None
+    if args.single_flight_dir is not None:
+        from .single_flight import SingleFlight
+
+        single_flight = SingleFlight(args.single_flight_dir)
+
     synth_scaffold = SynthScaffold(
         input_source_files=input_source_files,
         output_dir=args.output_dir,
@@ -726,16 +1764,36 @@ def main(args=None) -> bool:
         includes=includes,
         template_args=template_args,
         defines=defines,
+        cache=cache,
+        precheck=precheck,
+        single_flight=single_flight,
+        staging=args.staging,
+        scratch_dir=args.scratch_dir,
+        retention=args.retention,
     )
 
-    result = synth_scaffold.generate_and_run(verbose=args.verbose)
+    result = synth_scaffold.generate_and_run(
+        verbose=args.verbose,
+        timeout_s=args.timeout,
+        phase_timeouts_s=phase_timeouts_s,
+    )
     if result is not None:
         result.print_text_summary()
         return True
+    elif synth_scaffold.last_run is not None and (
+        synth_scaffold.last_run.precheck_diagnostics is not None
+    ):
+        print(synth_scaffold.last_run.precheck_diagnostics, end="")
+        print("Pre-check failed.")
+        return False
     else:
         print("Synthesis failed.")
         return False
 
 
+def cli() -> None:
+    sys.exit(0 if main() else 1)
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,279 @@
+import array
+import csv
+import dataclasses
+import math
+import os
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .surrogate import config_features
+from .synth_scaffold import SynthReport, parse_time_unit
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+REPORT_TYPECODES: dict[Any, str] = {int: "q", float: "d"}
+
+RESOURCES = ("lut", "ff", "dsp", "bram", "uram")
+LATENCY_CASES = ("best", "average", "worst")
+
+# derived metrics, named like the `SynthReport` properties they vectorize
+COMPUTED_LATENCIES = {
+    f"latency_t_computed_{case}_case": f"latency_{case}_case" for case in LATENCY_CASES
+}
+UTILIZATIONS = {
+    f"resources_{r}_utilization": (f"resources_{r}_used", f"resources_{r}_available")
+    for r in RESOURCES
+}
+DERIVED_COLUMNS = (*COMPUTED_LATENCIES, *UTILIZATIONS)
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Exporting a ReportTable needs NumPy: pip install 'synth-scaffold[table]'"
+        ) from e
+    return numpy
+
+
+def _typecode(value: Any) -> str | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return "q" if INT64_MIN <= value <= INT64_MAX else None
+    if isinstance(value, float):
+        return "d"
+    return None
+
+
+class _Column:
+    """
+    A growable column: an `array.array` of int64 or float64 values, or a list
+    of arbitrary values.
+
+    Values that do not fit the array's type widen it: an int column becomes a
+    float column when a float arrives, and any other mismatch turns it into a
+    list. Missing values are NaN in float columns and `None` otherwise.
+    """
+
+    def __init__(self, typecode: str | None, n_missing: int = 0) -> None:
+        self.values: array.array | list = (
+            array.array(typecode) if typecode is not None else []
+        )
+        for _ in range(n_missing):
+            self.append(None)
+
+    def append(self, value: Any) -> None:
+        if isinstance(self.values, array.array):
+            column_code = self.values.typecode
+            value_code = _typecode(value)
+            if value_code == column_code or (value_code == "q" and column_code == "d"):
+                self.values.append(value)
+                return
+            if value is None and column_code == "d":
+                self.values.append(math.nan)
+                return
+            if value_code == "d" and column_code == "q":
+                self.values = array.array("d", self.values)
+            else:
+                self.values = self.values.tolist()
+        self.values.append(value)
+
+    def to_numpy(self) -> "np.ndarray":
+        np = _import_numpy()
+        if isinstance(self.values, array.array):
+            dtype = np.int64 if self.values.typecode == "q" else np.float64
+            return np.frombuffer(self.values, dtype=dtype)
+        column = np.empty(len(self.values), dtype=object)
+        column[:] = self.values
+        return column
+
+
+class ReportTable:
+    """
+    Synthesis results stored column-wise: one typed array per `SynthReport`
+    field and per config parameter (see `surrogate.config_features()`), so a
+    sweep of 100k points takes 8 bytes per numeric value instead of a Python
+    object per report. Repeated strings such as the part are interned.
+
+    Numeric columns are `array.array`s of int64 or float64 and are exported
+    to NumPy without copying. While such an export is alive the table cannot
+    grow (`array.array` raises `BufferError`), so export after the sweep.
+    """
+
+    def __init__(self) -> None:
+        self.n_rows = 0
+        self.n_failed = 0
+        self.params: dict[str, _Column] = {}
+        self.reports: dict[str, _Column] = {
+            f.name: _Column(REPORT_TYPECODES.get(f.type))
+            for f in dataclasses.fields(SynthReport)
+        }
+
+    @classmethod
+    def from_results(
+        cls, results: Iterable[tuple[dict[str, Any], SynthReport | None]]
+    ) -> "ReportTable":
+        """
+        A table of the `(config, report)` pairs yielded by `sweep()` or
+        `search()` (whose scores are ignored).
+        """
+        table = cls()
+        table.extend(results)
+        return table
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def append(self, config: dict[str, Any], report: SynthReport | None) -> None:
+        """
+        Adds one result. Failed runs are only counted in `n_failed`.
+        """
+        if report is None:
+            self.n_failed += 1
+            return
+        features = config_features(config)
+        for name, value in features.items():
+            if name in self.reports:
+                raise ValueError(
+                    f"Config parameter {name} has the name of a SynthReport field"
+                )
+            if name not in self.params:
+                self.params[name] = _Column(_typecode(value), n_missing=self.n_rows)
+        for name, column in self.params.items():
+            column.append(features.get(name))
+        for name, column in self.reports.items():
+            value = getattr(report, name)
+            column.append(sys.intern(value) if isinstance(value, str) else value)
+        self.n_rows += 1
+
+    def extend(
+        self, results: Iterable[tuple[dict[str, Any], SynthReport | None]]
+    ) -> None:
+        for result in results:
+            self.append(result[0], result[1])
+
+    def report(self, i: int) -> SynthReport:
+        return SynthReport(
+            **{name: column.values[i] for name, column in self.reports.items()}
+        )
+
+    def row(self, i: int) -> dict[str, Any]:
+        """
+        The config parameters and report fields of row `i`.
+        """
+        row = {name: column.values[i] for name, column in self.params.items()}
+        row.update({name: column.values[i] for name, column in self.reports.items()})
+        return row
+
+    def column_names(self, derived: bool = True) -> list[str]:
+        names = [*self.params, *self.reports]
+        if derived:
+            names += DERIVED_COLUMNS
+        return names
+
+    def column(self, name: str) -> "np.ndarray":
+        """
+        A config parameter, a report field or a derived metric as a NumPy
+        array. Parameters and fields are views of the table's storage;
+        derived metrics are computed for all rows at once and, unlike the
+        `SynthReport` properties, are NaN rather than `None` where a resource
+        is not available on the part.
+        """
+        np = _import_numpy()
+        if name in self.params:
+            return self.params[name].to_numpy()
+        if name in self.reports:
+            return self.reports[name].to_numpy()
+        if name == "time_unit_scaler":
+            clock_units = self.reports["clock_unit"].values
+            scalers = {unit: parse_time_unit(unit) for unit in set(clock_units)}
+            return np.fromiter(
+                (scalers[unit] for unit in clock_units),
+                dtype=np.float64,
+                count=self.n_rows,
+            )
+        if name in COMPUTED_LATENCIES:
+            return (
+                self.column(COMPUTED_LATENCIES[name])
+                * self.column("time_unit_scaler")
+                * self.column("target_clock_period")
+            )
+        if name in UTILIZATIONS:
+            used_name, available_name = UTILIZATIONS[name]
+            used = self.column(used_name).astype(np.float64)
+            available = self.column(available_name).astype(np.float64)
+            utilization = np.full(self.n_rows, np.nan)
+            np.divide(used, available, out=utilization, where=available != 0)
+            return utilization
+        raise KeyError(f"ReportTable has no column {name}")
+
+    def to_numpy(self, derived: bool = True) -> dict[str, "np.ndarray"]:
+        return {name: self.column(name) for name in self.column_names(derived)}
+
+    def to_pandas(self, derived: bool = True) -> "pd.DataFrame":
+        """
+        A DataFrame of the table. The numeric columns are passed to pandas
+        as views with `copy=False`.
+        """
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError(
+                "Exporting a ReportTable to pandas needs pandas: pip install 'synth-scaffold[table]'"
+            ) from e
+        return pd.DataFrame(self.to_numpy(derived), copy=False)
+
+    def to_csv(self, fp: Path, derived: bool = True) -> None:
+        """
+        Writes the table as CSV, one row per result. Does not need NumPy.
+        """
+        names = self.column_names(derived)
+        fp_tmp = fp.with_suffix(f".tmp.{os.getpid()}")
+        with open(fp_tmp, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for i in range(self.n_rows):
+                row = self.row(i)
+                if derived:
+                    report = self.report(i)
+                    for name in DERIVED_COLUMNS:
+                        row[name] = getattr(report, name)
+                writer.writerow(
+                    "" if row[name] is None else row[name] for name in names
+                )
+        os.replace(fp_tmp, fp)
+
+    def to_parquet(self, fp: Path, derived: bool = True) -> None:
+        """
+        Writes the table as Parquet. Needs pyarrow. Parameter columns that mix
+        strings with numbers are written as strings.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Writing Parquet needs pyarrow: pip install 'synth-scaffold[table]'"
+            ) from e
+
+        arrays = {}
+        for name, column in self.to_numpy(derived).items():
+            if column.dtype == object:
+                values = column.tolist()
+                if not all(v is None or isinstance(v, str) for v in values):
+                    values = [None if v is None else str(v) for v in values]
+                arrays[name] = pa.array(values, type=pa.string())
+            else:
+                arrays[name] = pa.array(column)
+        fp_tmp = fp.with_suffix(f".tmp.{os.getpid()}")
+        pq.write_table(pa.table(arrays), fp_tmp)
+        os.replace(fp_tmp, fp)
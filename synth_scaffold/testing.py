@@ -0,0 +1,183 @@
+from collections.abc import Sequence
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from .synth_scaffold import SynthReport
+
+TOP_MODULE_NAME = "scaffold_fn"
+
+
+def _element(tag: str, text: object, indent: int) -> str:
+    return " " * indent + f"<{tag}>{escape(str(text))}</{tag}>\n"
+
+
+def _resources_xml(tag: str, lut, ff, dsp, bram, uram, indent: int) -> str:
+    xml_txt = " " * indent + f"<{tag}>\n"
+    xml_txt += _element("BRAM_18K", bram, indent + 2)
+    xml_txt += _element("DSP", dsp, indent + 2)
+    xml_txt += _element("FF", ff, indent + 2)
+    xml_txt += _element("LUT", lut, indent + 2)
+    xml_txt += _element("URAM", uram, indent + 2)
+    xml_txt += " " * indent + f"</{tag}>\n"
+    return xml_txt
+
+
+def module_report_xml(report: SynthReport, n_loops: int = 0, n_ports: int = 0) -> str:
+    """
+    A `<module>_csynth.xml` for `report`. `n_loops` entries are added to the
+    loop latency summary, which comes before the area estimates, and
+    `n_ports` RTL ports to the interface summary, which comes after them, to
+    make the file as large as those of real designs.
+
+    Real-time latencies are written in seconds so that they parse back to
+    exactly the values in `report`.
+    """
+    r = report
+    xml_txt = '<?xml version="1.0" encoding="UTF-8"?>\n'
+    xml_txt += "<profile>\n"
+    xml_txt += "  <ReportVersion>\n"
+    xml_txt += _element("Version", "2024.1", 4)
+    xml_txt += "  </ReportVersion>\n"
+
+    xml_txt += "  <UserAssignments>\n"
+    xml_txt += _element("unit", r.clock_unit, 4)
+    xml_txt += _element("ProductFamily", "zynquplus", 4)
+    xml_txt += _element("Part", r.part, 4)
+    xml_txt += _element("TopModelName", r.module_name, 4)
+    xml_txt += _element("TargetClockPeriod", repr(r.target_clock_period), 4)
+    xml_txt += _element("ClockUncertainty", repr(r.target_clock_uncertainty), 4)
+    xml_txt += _element("FlowTarget", r.flow_target, 4)
+    xml_txt += "  </UserAssignments>\n"
+
+    xml_txt += "  <PerformanceEstimates>\n"
+    xml_txt += "    <SummaryOfTimingAnalysis>\n"
+    xml_txt += _element("unit", r.clock_unit, 6)
+    xml_txt += _element("EstimatedClockPeriod", repr(r.achieved_clock_period), 6)
+    xml_txt += "    </SummaryOfTimingAnalysis>\n"
+    xml_txt += "    <SummaryOfOverallLatency>\n"
+    xml_txt += _element("unit", "clock cycles", 6)
+    xml_txt += _element("Best-caseLatency", r.latency_best_case, 6)
+    xml_txt += _element("Average-caseLatency", r.latency_average_case, 6)
+    xml_txt += _element("Worst-caseLatency", r.latency_worst_case, 6)
+    xml_txt += _element("Best-caseRealTimeLatency", f"{r.latency_t_best_case!r} s", 6)
+    xml_txt += _element(
+        "Average-caseRealTimeLatency", f"{r.latency_t_average_case!r} s", 6
+    )
+    xml_txt += _element("Worst-caseRealTimeLatency", f"{r.latency_t_worst_case!r} s", 6)
+    xml_txt += _element("Interval-min", r.latency_best_case + 1, 6)
+    xml_txt += _element("Interval-max", r.latency_worst_case + 1, 6)
+    xml_txt += "    </SummaryOfOverallLatency>\n"
+    xml_txt += "    <SummaryOfLoopLatency>\n"
+    for i in range(n_loops):
+        xml_txt += f"      <VITIS_LOOP_{i}>\n"
+        xml_txt += _element("Name", f"VITIS_LOOP_{i}", 8)
+        xml_txt += _element("TripCount", 16, 8)
+        xml_txt += _element("Latency", 34, 8)
+        xml_txt += _element("AbsoluteTimeLatency", "1.7e-07 s", 8)
+        xml_txt += _element("PipelineII", 2, 8)
+        xml_txt += _element("PipelineDepth", 4, 8)
+        xml_txt += f"      </VITIS_LOOP_{i}>\n"
+    xml_txt += "    </SummaryOfLoopLatency>\n"
+    xml_txt += "  </PerformanceEstimates>\n"
+
+    xml_txt += "  <AreaEstimates>\n"
+    xml_txt += _resources_xml(
+        "Resources",
+        r.resources_lut_used,
+        r.resources_ff_used,
+        r.resources_dsp_used,
+        r.resources_bram_used,
+        r.resources_uram_used,
+        4,
+    )
+    xml_txt += _resources_xml(
+        "AvailableResources",
+        r.resources_lut_available,
+        r.resources_ff_available,
+        r.resources_dsp_available,
+        r.resources_bram_available,
+        r.resources_uram_available,
+        4,
+    )
+    xml_txt += "  </AreaEstimates>\n"
+
+    xml_txt += "  <InterfaceSummary>\n"
+    xml_txt += "    <RtlPorts>\n"
+    for i in range(n_ports):
+        xml_txt += "      <RtlPort>\n"
+        xml_txt += _element("name", f"port_{i}", 8)
+        xml_txt += _element("Object", f"arg_{i // 4}", 8)
+        xml_txt += _element("Type", "array", 8)
+        xml_txt += _element("Scope", r.module_name, 8)
+        xml_txt += _element("IOProtocol", "ap_memory", 8)
+        xml_txt += _element("Dir", "out" if i % 2 else "in", 8)
+        xml_txt += _element("Bits", 32, 8)
+        xml_txt += "      </RtlPort>\n"
+    xml_txt += "    </RtlPorts>\n"
+    xml_txt += "  </InterfaceSummary>\n"
+    xml_txt += "</profile>\n"
+    return xml_txt
+
+
+def top_report_xml(
+    report: SynthReport, n_ports: int = 0, children: Sequence[SynthReport] = ()
+) -> str:
+    """
+    A top-level `csynth.xml` for the scaffold wrapping `report`'s module,
+    with the module as the first instance of the design hierarchy, which
+    comes between the area estimates and the interface summary. The modules
+    of `children` are instances under `report`'s module.
+    """
+    top_report = SynthReport(**{**report.to_dict(), "module_name": TOP_MODULE_NAME})
+    xml_txt = module_report_xml(top_report, n_ports=n_ports)
+    hierarchy_txt = "  <RTLDesignHierarchy>\n"
+    hierarchy_txt += "    <TopModule>\n"
+    hierarchy_txt += _element("ModuleName", TOP_MODULE_NAME, 6)
+    hierarchy_txt += "      <InstancesList>\n"
+    hierarchy_txt += "        <Instance>\n"
+    hierarchy_txt += _element("InstName", f"grp_{report.module_name}_fu_0", 10)
+    hierarchy_txt += _element("ModuleName", report.module_name, 10)
+    hierarchy_txt += _element("BindInstances", "", 10)
+    if children:
+        hierarchy_txt += "          <InstancesList>\n"
+        for i, child in enumerate(children):
+            hierarchy_txt += "            <Instance>\n"
+            hierarchy_txt += _element(
+                "InstName", f"grp_{child.module_name}_fu_{i + 1}", 14
+            )
+            hierarchy_txt += _element("ModuleName", child.module_name, 14)
+            hierarchy_txt += _element("BindInstances", "", 14)
+            hierarchy_txt += "            </Instance>\n"
+        hierarchy_txt += "          </InstancesList>\n"
+    hierarchy_txt += "        </Instance>\n"
+    hierarchy_txt += "      </InstancesList>\n"
+    hierarchy_txt += "    </TopModule>\n"
+    hierarchy_txt += "  </RTLDesignHierarchy>\n"
+    return xml_txt.replace(
+        "  </AreaEstimates>\n", "  </AreaEstimates>\n" + hierarchy_txt, 1
+    )
+
+
+def write_report_dir(
+    report_dir: Path,
+    report: SynthReport,
+    n_loops: int = 0,
+    n_ports: int = 0,
+    children: Sequence[SynthReport] = (),
+) -> Path:
+    """
+    Stands in for Vitis HLS in tests and benchmarks: writes `csynth.xml` and
+    `<module>_csynth.xml` for `report` into `report_dir` so that
+    `SynthReport.from_report_dir(report_dir)` returns a report equal to
+    `report`. The reports in `children` are written as modules called by
+    `report`'s module.
+    """
+    report_dir.mkdir(parents=True, exist_ok=True)
+    (report_dir / "csynth.xml").write_text(
+        top_report_xml(report, n_ports=n_ports, children=children)
+    )
+    for r in (report, *children):
+        (report_dir / f"{r.module_name}_csynth.xml").write_text(
+            module_report_xml(r, n_loops=n_loops, n_ports=n_ports)
+        )
+    return report_dir
@@ -0,0 +1,299 @@
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from .batch import RE_BATCH_MARKER, job_tcl_commands
+from .monitor import RUN_TIMEOUT
+from .resources import RssSampler, kill_process_group, process_tree_rss
+from .synth_scaffold import RunInfo, SynthReport, SynthScaffold, unwrap
+
+
+@dataclass
+class WorkerStats:
+    worker_id: int
+    pid: int | None = None
+    busy: bool = False
+    jobs_done: int = 0
+    jobs_failed: int = 0
+    jobs_since_start: int = 0
+    crashes: int = 0
+    timeouts: int = 0
+    restarts: int = 0
+    uptime_s: float = 0.0
+    rss_bytes: int | None = None
+    last_job_s: float | None = None
+
+    def text_summary(self) -> str:
+        txt = ""
+        txt += f"Worker {self.worker_id} (pid {self.pid}): "
+        txt += "busy" if self.busy else "idle"
+        txt += f", {self.jobs_done} jobs done, {self.jobs_failed} failed"
+        txt += f", {self.crashes} crashes, {self.timeouts} timeouts"
+        txt += f", {self.restarts} restarts"
+        txt += f", up {self.uptime_s:.1f} s"
+        if self.rss_bytes is not None:
+            txt += f", RSS {self.rss_bytes / 1024**2:.1f} MiB"
+        return txt
+
+
+class HlsWorker:
+    """
+    A long-lived `vitis_hls -i` process that synthesizes scaffolds sent to it
+    over stdin, so the tool starts once rather than once per job.
+
+    Each job is the TCL of `job_tcl_commands()`; the worker reads the tool's
+    output until the job's marker line and then collects the report from the
+    scaffold's `output_dir` exactly like `SynthScaffold.run()`; a scaffold
+    with a `scratch_dir` is synthesized there, as in `run()`. The tool is
+    (re)started lazily: after a crash, after `max_jobs` jobs, and when its
+    RSS grows past `max_rss_bytes`, to contain leaks in long sessions.
+
+    A job that runs longer than `timeout_s` has the tool's whole process
+    group killed, fails with `last_run.timed_out` set, and the next job
+    starts a fresh tool.
+    """
+
+    def __init__(
+        self,
+        worker_id: int,
+        work_dir: Path,
+        max_jobs: int | None = 50,
+        max_rss_bytes: int | None = None,
+        timeout_s: float | None = None,
+    ) -> None:
+        self.worker_id = worker_id
+        self.work_dir = work_dir
+        self.max_jobs = max_jobs
+        self.max_rss_bytes = max_rss_bytes
+        self.timeout_s = timeout_s
+        self.stats = WorkerStats(worker_id=worker_id)
+
+        self._p: subprocess.Popen | None = None
+        self._t_started = 0.0
+        self._job_index = 0
+
+    def is_alive(self) -> bool:
+        return self._p is not None and self._p.poll() is None
+
+    def start(self) -> None:
+        bin_match = shutil.which("vitis_hls")
+        if bin_match is None:
+            raise FileNotFoundError("Could not find the Vitis HLS binary")
+
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._p = subprocess.Popen(
+            [bin_match, "-i", "-l", "worker.log"],
+            cwd=self.work_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            start_new_session=True,
+        )
+        self._t_started = time.monotonic()
+        self.stats.pid = self._p.pid
+        self.stats.jobs_since_start = 0
+
+    def stop(self, timeout_s: float = 10.0) -> None:
+        p = self._p
+        self._p = None
+        if p is None:
+            return
+        if p.poll() is None:
+            try:
+                unwrap(p.stdin).write("exit\n")
+                unwrap(p.stdin).flush()
+                p.wait(timeout=timeout_s)
+            except (OSError, subprocess.TimeoutExpired):
+                kill_process_group(p.pid)
+                p.wait()
+        for stream in (p.stdin, p.stdout):
+            if stream is not None:
+                stream.close()
+
+    def needs_restart(self) -> bool:
+        if self.max_jobs is not None and self.stats.jobs_since_start >= self.max_jobs:
+            return True
+        if self.max_rss_bytes is not None and self._p is not None:
+            rss = process_tree_rss(self._p.pid)
+            if rss is not None and rss > self.max_rss_bytes:
+                return True
+        return False
+
+    def refresh_stats(self) -> WorkerStats:
+        if self.is_alive():
+            self.stats.uptime_s = time.monotonic() - self._t_started
+            self.stats.rss_bytes = process_tree_rss(unwrap(self._p).pid)
+        else:
+            self.stats.uptime_s = 0.0
+            self.stats.rss_bytes = None
+        return self.stats
+
+    def _read_job_output(self, job_index: int) -> tuple[list[str], int | None, float]:
+        """
+        Reads the tool's output up to the marker of `job_index`. Returns the
+        lines, the job's return code and its runtime, or a `None` return code
+        if the tool exited first.
+        """
+        p = unwrap(self._p)
+        lines: list[str] = []
+        for line in unwrap(p.stdout):
+            m = RE_BATCH_MARKER.search(line)
+            if m is not None and int(m.group("index")) == job_index:
+                returncode = 0 if m.group("status") == "ok" else 1
+                return lines, returncode, int(m.group("runtime_ms")) / 1000
+            lines.append(line)
+        return lines, None, 0.0
+
+    def run(self, s: SynthScaffold, verbose: bool = False) -> SynthReport | None:
+        cache_key, cached_report = s._reuse_result(verbose=verbose)
+        if cached_report is not None:
+            return cached_report
+        if not s._passes_precheck():
+            return None
+
+        if not self.is_alive():
+            if self._p is not None:
+                self.stop()
+            self.start()
+        elif self.needs_restart():
+            self.stop()
+            self.start()
+            self.stats.restarts += 1
+
+        s._clear_project()
+        job_index = self._job_index
+        self._job_index += 1
+
+        p = unwrap(self._p)
+        self.stats.busy = True
+        t_start = time.monotonic()
+        # a hung tool never prints the job's marker; killing it ends its
+        # output, so the job is read to the end like a crash
+        deadline_passed = threading.Event()
+        watchdog = None
+        if self.timeout_s is not None:
+
+            def kill() -> None:
+                deadline_passed.set()
+                kill_process_group(p.pid)
+
+            watchdog = threading.Timer(self.timeout_s, kill)
+            watchdog.start()
+        try:
+            with s._work_dir() as work_dir, RssSampler(p.pid) as rss_sampler:
+                try:
+                    unwrap(p.stdin).write(job_tcl_commands(s, job_index, work_dir))
+                    unwrap(p.stdin).flush()
+                except BrokenPipeError:
+                    pass
+                lines, returncode, runtime_s = self._read_job_output(job_index)
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            self.stats.busy = False
+
+        timed_out = None
+        if returncode is None:
+            # the tool died during the job; report its exit status and let the
+            # next job start a fresh process
+            returncode = p.wait()
+            runtime_s = time.monotonic() - t_start
+            if deadline_passed.is_set():
+                timed_out = RUN_TIMEOUT
+                self.stats.timeouts += 1
+            else:
+                self.stats.crashes += 1
+            self.stop()
+
+        (s.output_dir / "csynth.log").write_text("".join(lines))
+
+        self.stats.jobs_since_start += 1
+        self.stats.last_job_s = runtime_s
+        if returncode == 0:
+            self.stats.jobs_done += 1
+        else:
+            self.stats.jobs_failed += 1
+
+        s.last_run = RunInfo(
+            returncode=returncode,
+            runtime_s=runtime_s,
+            peak_rss_bytes=rss_sampler.peak_rss_bytes,
+            timed_out=timed_out,
+        )
+        return s._collect_report(cache_key, verbose=verbose)
+
+
+class HlsWorkerPool:
+    """
+    A fixed set of warm `HlsWorker`s fed from a queue. `submit()` returns a
+    future for each scaffold, so configs can be streamed in as they are
+    generated. Use as a context manager to shut the tools down afterwards.
+    Each job is limited to `timeout_s`, as in `SynthScaffold.run()`.
+    """
+
+    def __init__(
+        self,
+        n_workers: int,
+        work_dir: Path,
+        max_jobs_per_worker: int | None = 50,
+        max_rss_bytes: int | None = None,
+        timeout_s: float | None = None,
+        verbose: bool = False,
+    ) -> None:
+        self.verbose = verbose
+        self.workers = [
+            HlsWorker(
+                i,
+                work_dir / f"worker_{i}",
+                max_jobs=max_jobs_per_worker,
+                max_rss_bytes=max_rss_bytes,
+                timeout_s=timeout_s,
+            )
+            for i in range(n_workers)
+        ]
+        self._idle: queue.SimpleQueue[HlsWorker] = queue.SimpleQueue()
+        for worker in self.workers:
+            self._idle.put(worker)
+        self._executor = ThreadPoolExecutor(
+            max_workers=n_workers, thread_name_prefix="hls-worker"
+        )
+
+    def _run(self, s: SynthScaffold) -> SynthReport | None:
+        worker = self._idle.get()
+        try:
+            return worker.run(s, verbose=self.verbose)
+        finally:
+            self._idle.put(worker)
+
+    def submit(self, s: SynthScaffold) -> Future[SynthReport | None]:
+        """
+        Queues a generated scaffold for synthesis on the next idle worker.
+        """
+        return self._executor.submit(self._run, s)
+
+    def map(self, scaffolds: list[SynthScaffold]) -> list[SynthReport | None]:
+        futures = [self.submit(s) for s in scaffolds]
+        return [future.result() for future in futures]
+
+    def stats(self) -> list[WorkerStats]:
+        return [worker.refresh_stats() for worker in self.workers]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for worker in self.workers:
+            worker.stop()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
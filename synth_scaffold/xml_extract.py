@@ -0,0 +1,120 @@
+import xml.etree.ElementTree as ET
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+from .archive import open_path
+
+XmlPattern = Sequence[str]
+
+
+def pattern_matches(pattern: XmlPattern, stack: list[str]) -> bool:
+    """
+    Whether the element at the top of `stack` (its tag path from the root)
+    matches `pattern`. The last two tags of the pattern are the element and
+    its parent; any tags before them are ancestors that must appear, in
+    order, somewhere above the parent. E.g. ("AreaEstimates", "Resources",
+    "LUT") is the ElementTree path `.//AreaEstimates//Resources/LUT`.
+    """
+    if len(stack) < len(pattern) or stack[-1] != pattern[-1]:
+        return False
+    if len(pattern) >= 2 and stack[-2] != pattern[-2]:
+        return False
+    i = len(stack) - 2
+    for anchor in reversed(pattern[:-2]):
+        i -= 1
+        while i >= 0 and stack[i] != anchor:
+            i -= 1
+        if i < 0:
+            return False
+    return True
+
+
+def extract_texts(fp: Path, patterns: Mapping[str, XmlPattern]) -> dict[str, str]:
+    """
+    Text of the first element in document order matching each pattern (see
+    `pattern_matches()`), keyed like `patterns`. Keys with no match are
+    missing from the result.
+
+    The file is streamed with `iterparse`, elements are cleared as soon as
+    they have been looked at, and parsing stops once every pattern has
+    matched, so only the part of the document up to the last wanted element
+    is ever read and no full tree is built.
+    """
+    by_leaf: dict[str, list[tuple[str, XmlPattern]]] = {}
+    for key, pattern in patterns.items():
+        by_leaf.setdefault(pattern[-1], []).append((key, pattern))
+
+    texts: dict[str, str] = {}
+    stack: list[str] = []
+    with open_path(fp) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                stack.append(elem.tag)
+                continue
+            for key, pattern in by_leaf.get(elem.tag, ()):
+                if key not in texts and pattern_matches(pattern, stack):
+                    texts[key] = elem.text or ""
+            stack.pop()
+            elem.clear()
+            if len(texts) == len(patterns):
+                break
+    return texts
+
+
+def extract_subtrees(
+    fp: Path,
+    patterns: Mapping[str, XmlPattern],
+    subtree_patterns: Mapping[str, XmlPattern],
+) -> tuple[dict[str, str], dict[str, ET.Element | None]]:
+    """
+    Like `extract_texts()`, but also returns the first element matching each
+    of `subtree_patterns` with all of its descendants, keyed like
+    `subtree_patterns`. A subtree is `None` once the parent it is looked for
+    in (the next-to-last tag of its pattern) has ended without containing
+    it, so an absent subtree does not make the rest of the file be read.
+    """
+    by_leaf: dict[str, list[tuple[str, XmlPattern]]] = {}
+    for key, pattern in patterns.items():
+        by_leaf.setdefault(pattern[-1], []).append((key, pattern))
+    subtrees_by_leaf: dict[str, list[tuple[str, XmlPattern]]] = {}
+    subtrees_by_parent: dict[str, list[tuple[str, XmlPattern]]] = {}
+    for key, pattern in subtree_patterns.items():
+        subtrees_by_leaf.setdefault(pattern[-1], []).append((key, pattern))
+        if len(pattern) >= 2:
+            subtrees_by_parent.setdefault(pattern[-2], []).append((key, pattern))
+
+    texts: dict[str, str] = {}
+    subtrees: dict[str, ET.Element | None] = {}
+    stack: list[str] = []
+    # depth and key of the subtree being kept, whose elements are not cleared
+    keep_depth = 0
+    keep_key = ""
+    with open_path(fp) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                stack.append(elem.tag)
+                if keep_depth:
+                    continue
+                for key, pattern in subtrees_by_leaf.get(elem.tag, ()):
+                    if key not in subtrees and pattern_matches(pattern, stack):
+                        keep_depth = len(stack)
+                        keep_key = key
+                        break
+                continue
+            for key, pattern in by_leaf.get(elem.tag, ()):
+                if key not in texts and pattern_matches(pattern, stack):
+                    texts[key] = elem.text or ""
+            if keep_depth:
+                if len(stack) == keep_depth:
+                    subtrees[keep_key] = elem
+                    keep_depth = 0
+                stack.pop()
+            else:
+                for key, pattern in subtrees_by_parent.get(elem.tag, ()):
+                    if key not in subtrees and pattern_matches(pattern[:-1], stack):
+                        subtrees[key] = None
+                stack.pop()
+                elem.clear()
+            if len(texts) == len(patterns) and len(subtrees) == len(subtree_patterns):
+                break
+    return texts, subtrees
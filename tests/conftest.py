@@ -0,0 +1,153 @@
+import os
+import stat
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from synth_scaffold import fake_vitis_hls
+from synth_scaffold.synth_scaffold import SynthReport, SynthScaffold
+
+
+def build_report(**overrides) -> SynthReport:
+    data = {
+        "part": "xczu9eg-ffvb1156-2-e",
+        "flow_target": "vivado",
+        "module_name": "activation_tanh_ap_fixed_16_8_5_3_0_s",
+        "clock_unit": "ns",
+        "target_clock_period": 5.0,
+        "target_clock_uncertainty": 1.35,
+        "achieved_clock_period": 3.421,
+        "latency_worst_case": 59,
+        "latency_average_case": 59,
+        "latency_best_case": 59,
+        "latency_t_worst_case": 2.95e-07,
+        "latency_t_average_case": 2.95e-07,
+        "latency_t_best_case": 2.95e-07,
+        "resources_lut_used": 6297,
+        "resources_ff_used": 5778,
+        "resources_dsp_used": 2,
+        "resources_bram_used": 0,
+        "resources_uram_used": 0,
+        "resources_lut_available": 274080,
+        "resources_ff_available": 548160,
+        "resources_dsp_available": 2520,
+        "resources_bram_available": 1824,
+        "resources_uram_available": 0,
+    }
+    data.update(overrides)
+    return SynthReport(**data)
+
+
+@pytest.fixture
+def make_report():
+    return build_report
+
+
+LINALG_H = """#pragma once
+
+template <const int in_size, const int out_size, const int BLOCK_SIZE_IN_ = 1,
+          const int BLOCK_SIZE_OUT_ = 1, typename T>
+void linear(T input[in_size], T output[out_size], T weight[out_size][in_size],
+            T bias[out_size]) {
+#pragma HLS INLINE off
+    static_assert(in_size % BLOCK_SIZE_IN_ == 0,
+                  "in_size must be divisible by BLOCK_SIZE_IN");
+    for (int i = 0; i < out_size; i++) {
+        T acc = bias[i];
+        for (int j = 0; j < in_size; j++) {
+            acc += weight[i][j] * input[j];
+        }
+        output[i] = acc;
+    }
+}
+
+template <typename T>
+T activation_relu(T x) {
+#pragma HLS INLINE off
+    return x > T(0) ? x : T(0);
+}
+"""
+
+
+@pytest.fixture
+def linalg_source(tmp_path: Path) -> Path:
+    fp = tmp_path / "sources" / "linalg.h"
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    fp.write_text(LINALG_H)
+    return fp
+
+
+@pytest.fixture
+def make_scaffold(linalg_source: Path):
+    """
+    Builds a scaffold of `activation_relu<float>` from `linalg_source` in
+    `output_dir` and generates it unless `generate=False`. Keyword arguments
+    override the `SynthScaffold` options.
+    """
+
+    def make(output_dir: Path, generate: bool = True, **options: Any) -> SynthScaffold:
+        s = SynthScaffold(
+            **{
+                "input_source_files": [linalg_source],
+                "output_dir": output_dir,
+                "target_fn": "activation_relu",
+                "includes": ['"linalg.h"'],
+                "template_args": {"T": "float"},
+                **options,
+            }
+        )
+        if generate:
+            s.generate()
+        return s
+
+    return make
+
+
+@pytest.fixture
+def install_fake_vitis_hls(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Puts a shell script named `vitis_hls` with the given contents first on
+    PATH.
+    """
+
+    def install(script_txt: str) -> Path:
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir(exist_ok=True)
+        fp = bin_dir / "vitis_hls"
+        fp.write_text(script_txt)
+        fp.chmod(fp.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        return fp
+
+    return install
+
+
+@pytest.fixture
+def fake_tool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    Puts `synth_scaffold.fake_vitis_hls` first on PATH as `vitis_hls`, with
+    small reports, and returns its directory.
+    """
+    bin_dir = tmp_path / "bin"
+    fake_vitis_hls.install(bin_dir)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_VITIS_HLS_LOOPS", "3")
+    monkeypatch.setenv("FAKE_VITIS_HLS_PORTS", "10")
+    return bin_dir
+
+
+@pytest.fixture
+def failing_tool(install_fake_vitis_hls) -> Path:
+    """
+    Puts a `vitis_hls` first on PATH that fails right away, for runs that must
+    not start the tool. Returns the file it creates next to itself when it is
+    invoked.
+    """
+    fp = install_fake_vitis_hls(
+        """#!/bin/sh
+touch "$(dirname "$0")/invoked"
+exit 1
+"""
+    )
+    return fp.parent / "invoked"
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.synth_scaffold import SynthScaffold
+
+FAKE_VITIS_HLS = """#!/bin/sh
+echo "INFO: [HLS 200-10] Running 'vitis_hls $*'"
+sleep 30 &
+echo $! > child.pid
+echo "INFO: [HLS 200-10] Analyzing design file 'scaffold.cpp' ..."
+wait
+"""
+
+
+@pytest.fixture
+def fake_vitis_hls(install_fake_vitis_hls) -> Path:
+    return install_fake_vitis_hls(FAKE_VITIS_HLS)
+
+
+def is_alive(pid: int) -> bool:
+    try:
+        stat_txt = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat_txt[stat_txt.rfind(")") + 2] != "Z"
+
+
+def test_run_async_streams_and_cancels(
+    tmp_path: Path, linalg_source: Path, fake_vitis_hls: Path
+):
+    s = SynthScaffold(
+        input_source_files=[linalg_source],
+        output_dir=tmp_path / "run",
+        target_fn="activation_relu",
+        includes=['"linalg.h"'],
+        template_args={"T": "float"},
+    )
+
+    async def main() -> list[str]:
+        lines: list[str] = []
+        analyzing = asyncio.Event()
+
+        async def on_output(line: str) -> None:
+            lines.append(line)
+            if "Analyzing" in line:
+                analyzing.set()
+
+        task = asyncio.create_task(s.generate_and_run_async(on_output=on_output))
+        await asyncio.wait_for(analyzing.wait(), timeout=10)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return lines
+
+    lines = asyncio.run(main())
+    assert any("Running" in line for line in lines)
+
+    child_pid = int((tmp_path / "run" / "child.pid").read_text())
+    deadline = time.monotonic() + 5
+    while is_alive(child_pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not is_alive(child_pid)
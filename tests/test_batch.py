@@ -0,0 +1,116 @@
+import signal
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.batch import batch_tcl_script, run_batch
+from synth_scaffold.resources import process_exists
+from synth_scaffold.synth_scaffold import SynthReport
+
+# reports the first config as done and the second as failed, then exits
+# without reaching the third, as if the tool crashed
+FAKE_VITIS_HLS = """#!/bin/sh
+test "$1" = batch.tcl || exit 2
+echo "SYNTH_SCAFFOLD_BATCH 0 ok 1500"
+echo "SYNTH_SCAFFOLD_BATCH 1 error 20"
+exit 139
+"""
+
+# leaves its pid next to itself and hangs
+HANGING_VITIS_HLS = """#!/bin/sh
+echo "$$" > "$(dirname "$0")/pid"
+exec sleep 600
+"""
+
+
+CLOCK_PERIODS = (5.0, 4.0, 3.0)
+
+
+def test_batch_tcl_script(tmp_path: Path, make_scaffold):
+    scaffolds = [
+        make_scaffold(tmp_path / f"run_{c}", clock_period=c) for c in CLOCK_PERIODS
+    ]
+    tcl_script_txt = batch_tcl_script(scaffolds)
+
+    assert tcl_script_txt.count("csynth_design") == 3
+    assert tcl_script_txt.count("\nexit\n") == 1
+    assert tcl_script_txt.endswith("exit\n")
+    for i, s in enumerate(scaffolds):
+        assert f"cd {{{s.output_dir.resolve()}}}" in tcl_script_txt
+        assert f"create_clock -period {s.clock_period}" in tcl_script_txt
+        assert f"SYNTH_SCAFFOLD_BATCH {i} $status" in tcl_script_txt
+
+
+def test_run_batch(tmp_path: Path, make_scaffold, install_fake_vitis_hls):
+    install_fake_vitis_hls(FAKE_VITIS_HLS)
+    scaffolds = [
+        make_scaffold(tmp_path / f"run_{c}", clock_period=c) for c in CLOCK_PERIODS
+    ]
+
+    reports = run_batch(scaffolds, tmp_path / "batch")
+
+    assert reports == [None, None, None]
+    assert (tmp_path / "batch" / "batch.tcl").exists()
+    run_infos = [s.last_run for s in scaffolds]
+    assert [r.returncode for r in run_infos] == [0, 1, 139]
+    assert [r.runtime_s for r in run_infos] == [1.5, 0.02, 0.0]
+
+
+def test_run_batch_reports(tmp_path: Path, make_scaffold, fake_tool: Path):
+    scaffolds = [
+        make_scaffold(tmp_path / f"run_{c}", clock_period=c) for c in CLOCK_PERIODS
+    ]
+    # the tool cannot find the second scaffold's source, so its config fails
+    # inside the batch while the others are synthesized
+    (scaffolds[1].output_dir / "scaffold.cpp").unlink()
+
+    reports = run_batch(scaffolds, tmp_path / "batch")
+
+    assert [r.returncode for r in (s.last_run for s in scaffolds)] == [0, 1, 0]
+    assert reports[1] is None
+    assert not scaffolds[1].report_dir.exists()
+    for i in (0, 2):
+        assert reports[i] is not None
+        assert reports[i].target_clock_period == scaffolds[i].clock_period
+        assert reports[i] == SynthReport.from_report_dir(scaffolds[i].report_dir)
+    assert reports[0] != reports[2]
+
+
+def test_run_batch_in_scratch_dir(tmp_path: Path, make_scaffold, fake_tool: Path):
+    scaffolds = [
+        make_scaffold(
+            tmp_path / f"run_{c}", clock_period=c, scratch_dir=tmp_path / "scratch"
+        )
+        for c in CLOCK_PERIODS
+    ]
+
+    reports = run_batch(scaffolds, tmp_path / "batch")
+
+    assert all(r is not None for r in reports)
+    batch_tcl_txt = (tmp_path / "batch" / "batch.tcl").read_text()
+    assert batch_tcl_txt.count(f"cd {{{(tmp_path / 'scratch').resolve()}/") == 3
+    # only the reports came back, and nothing is left behind
+    assert list((tmp_path / "scratch").iterdir()) == []
+    for s, report in zip(scaffolds, reports):
+        assert report == SynthReport.from_report_dir(s.report_dir)
+
+
+def test_run_batch_interrupted(tmp_path: Path, make_scaffold, install_fake_vitis_hls):
+    pid_fp = install_fake_vitis_hls(HANGING_VITIS_HLS).parent / "pid"
+    scaffolds = [make_scaffold(tmp_path / "run")]
+
+    def interrupt(signum, frame) -> None:
+        raise KeyboardInterrupt
+
+    # Ctrl-C while the tool runs
+    previous_handler = signal.signal(signal.SIGALRM, interrupt)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 1.0)
+        with pytest.raises(KeyboardInterrupt):
+            run_batch(scaffolds, tmp_path / "batch")
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+    # the tool runs in its own session and was killed with the batch
+    assert not process_exists(int(pid_fp.read_text()))
@@ -0,0 +1,90 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.cache import SynthCache
+
+
+def test_cache_hit_miss_stats(tmp_path: Path, make_report):
+    cache = SynthCache(tmp_path / "cache")
+    report = make_report()
+
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, report, runtime_s=120.0)
+    assert cache.get("ab" * 32) == report
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.seconds_saved == 120.0
+    assert stats.entries == 1
+
+
+def test_cache_evict_by_size(
+    tmp_path: Path, make_report, monkeypatch: pytest.MonkeyPatch
+):
+    # a fixed creation time, whose repr would otherwise vary in length, so
+    # that all entries have the same size and the budget fits exactly two
+    now = 1_700_000_000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache = SynthCache(tmp_path / "cache")
+    for i in range(4):
+        key = f"{i:02d}" * 32
+        cache.put(key, make_report(latency_average_case=i), runtime_s=1.0)
+        os.utime(cache.entry_fp(key), (now - 100 + i, now - 100 + i))
+
+    entry_sizes = {fp.stat().st_size for fp in cache.entries_dir.glob("*/*.json")}
+    assert len(entry_sizes) == 1
+    cache.max_size_bytes = entry_sizes.pop() * 2
+    assert cache.evict() == 2
+    assert cache.get("00" * 32) is None
+    assert cache.get("03" * 32) is not None
+
+
+def test_cache_evict_by_age(tmp_path: Path, make_report):
+    cache = SynthCache(tmp_path / "cache", max_age_s=60.0)
+    cache.put("ab" * 32, make_report(), runtime_s=1.0)
+    old = time.time() - 3600
+    os.utime(cache.entry_fp("ab" * 32), (old, old))
+    assert cache.evict() == 1
+    assert cache.stats().entries == 0
+
+
+def test_run_uses_cache(tmp_path: Path, make_scaffold, make_report, failing_tool: Path):
+    cache = SynthCache(tmp_path / "cache")
+    s = make_scaffold(tmp_path / "out", cache=cache)
+    report = make_report()
+    cache.put(s.cache_key(), report, runtime_s=60.0)
+
+    assert s.run() == report
+    assert s.last_run.cache_hit
+    assert not failing_tool.exists()
+
+
+def test_cache_key(
+    tmp_path: Path, linalg_source: Path, make_scaffold, failing_tool: Path
+):
+    key = make_scaffold(tmp_path / "a").cache_key()
+    # where a config runs does not matter
+    assert make_scaffold(tmp_path / "b").cache_key() == key
+
+    # what its sources say does
+    linalg_source.write_text(linalg_source.read_text() + "\n// changed\n")
+    assert make_scaffold(tmp_path / "a").cache_key() != key
+
+
+def test_cache_get_concurrent_eviction(
+    tmp_path: Path, make_report, monkeypatch: pytest.MonkeyPatch
+):
+    cache = SynthCache(tmp_path / "cache")
+    report = make_report()
+    cache.put("ab" * 32, report, runtime_s=1.0)
+
+    # another process evicts the entry between the read and the refresh
+    def utime_evicted(fp: Path, *args) -> None:
+        raise FileNotFoundError(fp)
+
+    monkeypatch.setattr(os, "utime", utime_evicted)
+    assert cache.get("ab" * 32) == report
@@ -0,0 +1,66 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold import fake_vitis_hls
+from synth_scaffold.batch import run_batch
+from synth_scaffold.workers import HlsWorkerPool
+
+
+def test_sample_runtime_s():
+    rng = random.Random(0)
+    assert fake_vitis_hls.sample_runtime_s("0.5", rng) == 0.5
+    assert 1.0 <= fake_vitis_hls.sample_runtime_s("uniform:1,2", rng) <= 2.0
+    assert fake_vitis_hls.sample_runtime_s("lognormal:3,0.5", rng) > 0
+    with pytest.raises(ValueError):
+        fake_vitis_hls.sample_runtime_s("gamma:1,2", rng)
+
+
+def test_run(tmp_path: Path, make_scaffold, fake_tool: Path):
+    s = make_scaffold(tmp_path / "a", clock_period=4.0)
+    report = s.run()
+    assert report is not None
+    assert report.module_name == "activation_relu"
+    assert report.target_clock_period == 4.0
+    assert s.last_run.returncode == 0
+    assert list(s.last_run.phase_times_s) == [
+        "elaboration",
+        "transformation",
+        "scheduling",
+        "binding",
+        "rtl_generation",
+    ]
+    assert s.last_run.metrics.flow_log_times_s["csynth_design"] == 0.0
+    assert "Starting scheduling" in (s.output_dir / "csynth.log").read_text()
+
+    # the same config gets the same report, another one a different report
+    assert make_scaffold(tmp_path / "b", clock_period=4.0).run() == report
+    assert make_scaffold(tmp_path / "c", clock_period=3.0).run() != report
+
+
+def test_fail_rate(tmp_path: Path, make_scaffold, fake_tool: Path, monkeypatch):
+    monkeypatch.setenv("FAKE_VITIS_HLS_FAIL_RATE", "1")
+    s = make_scaffold(tmp_path / "a", clock_period=4.0)
+    assert s.run() is None
+    assert s.last_run.returncode == 1
+
+
+def test_batch_and_workers(tmp_path: Path, make_scaffold, fake_tool: Path):
+    clock_periods = [5.0, 4.0, 3.0]
+    expected = [
+        make_scaffold(tmp_path / f"single_{c}", clock_period=c).run()
+        for c in clock_periods
+    ]
+
+    scaffolds = [
+        make_scaffold(tmp_path / f"batch_{c}", clock_period=c) for c in clock_periods
+    ]
+    assert run_batch(scaffolds, tmp_path / "batch") == expected
+    assert [s.last_run.returncode for s in scaffolds] == [0, 0, 0]
+
+    scaffolds = [
+        make_scaffold(tmp_path / f"worker_{c}", clock_period=c) for c in clock_periods
+    ]
+    with HlsWorkerPool(1, tmp_path / "workers") as pool:
+        assert pool.map(scaffolds) == expected
@@ -0,0 +1,123 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.hierarchy import ReportTree, parse_loops
+from synth_scaffold.synth_scaffold import SynthReport
+from synth_scaffold.testing import TOP_MODULE_NAME, write_report_dir
+
+LOOPS_XML = """
+<SummaryOfLoopLatency>
+  <VITIS_LOOP_10_1>
+    <Name>VITIS_LOOP_10_1</Name>
+    <TripCount>8</TripCount>
+    <Latency>
+      <range><min>16</min><max>136</max></range>
+    </Latency>
+    <PipelineII>-</PipelineII>
+    <PipelineDepth>17</PipelineDepth>
+    <InstanceList/>
+    <VITIS_LOOP_11_2>
+      <Name>VITIS_LOOP_11_2</Name>
+      <TripCount>undef</TripCount>
+      <Latency>15</Latency>
+      <PipelineII>1</PipelineII>
+      <PipelineDepth>3</PipelineDepth>
+    </VITIS_LOOP_11_2>
+  </VITIS_LOOP_10_1>
+</SummaryOfLoopLatency>
+"""
+
+
+def test_parse_loops():
+    (outer,) = parse_loops(ET.fromstring(LOOPS_XML))
+    assert outer.name == "VITIS_LOOP_10_1"
+    assert outer.trip_count == 8
+    assert outer.latency == 136
+    assert outer.pipeline_ii is None
+    assert outer.pipeline_depth == 17
+
+    (inner,) = outer.loops
+    assert inner.name == "VITIS_LOOP_11_2"
+    assert inner.trip_count is None
+    assert inner.latency == 15
+    assert inner.pipeline_ii == 1
+    assert inner.loops == []
+
+
+def test_report_tree(tmp_path: Path, make_report):
+    report = make_report(module_name="pe_message_transformation")
+    children = [
+        make_report(module_name="compute_messages", latency_best_case=9),
+        make_report(module_name="aggregate", resources_lut_used=321),
+    ]
+    report_dir = write_report_dir(
+        tmp_path / "report", report, n_loops=3, children=children
+    )
+
+    tree = ReportTree.from_report_dir(report_dir)
+    assert tree.root.module_name == TOP_MODULE_NAME
+    assert tree.target.module_name == "pe_message_transformation"
+    assert tree.target.report == SynthReport.from_report_dir(report_dir)
+    assert [c.module_name for c in tree.target.children] == [
+        "compute_messages",
+        "aggregate",
+    ]
+    assert tree.reports() == {r.module_name: r for r in (report, *children)}
+
+    node = tree.target.find("aggregate")
+    assert node is not None
+    assert node.instance_name == "grp_aggregate_fu_2"
+    assert node.module.interval_min == children[1].latency_best_case + 1
+    assert node.module.interval_max == children[1].latency_worst_case + 1
+    assert [loop.name for loop in node.module.loops] == [
+        "VITIS_LOOP_0",
+        "VITIS_LOOP_1",
+        "VITIS_LOOP_2",
+    ]
+    assert node.module.loops[0].pipeline_ii == 2
+
+    summary = tree.text_summary()
+    assert "  grp_compute_messages_fu_1 (compute_messages)" in summary
+    assert "Loop VITIS_LOOP_2: trip count 16, latency 34, II 2" in summary
+
+
+def test_report_tree_is_lazy(tmp_path: Path, make_report):
+    report = make_report()
+    child = make_report(module_name="callee")
+    report_dir = write_report_dir(tmp_path / "report", report, children=[child])
+    (report_dir / "callee_csynth.xml").unlink()
+
+    # the hierarchy and the target's report do not need the callee's report
+    tree = ReportTree.from_report_dir(report_dir)
+    assert tree.target.report == report
+    with pytest.raises(FileNotFoundError):
+        _ = tree.target.children[0].report
+
+
+def test_report_tree_without_hierarchy(tmp_path: Path):
+    report_dir = tmp_path / "report"
+    report_dir.mkdir()
+    (report_dir / "csynth.xml").write_text("<profile><AreaEstimates/></profile>")
+    with pytest.raises(ValueError):
+        ReportTree.from_report_dir(report_dir)
+
+
+def test_module_report_without_loops(tmp_path: Path, make_report):
+    report = make_report()
+    report_dir = write_report_dir(tmp_path / "report", report)
+
+    # a module with no loop summary is read up to the area estimates only,
+    # so a truncated file still parses
+    module_fp = report_dir / f"{report.module_name}_csynth.xml"
+    module_txt = module_fp.read_text()
+    module_txt = module_txt.replace(
+        "    <SummaryOfLoopLatency>\n    </SummaryOfLoopLatency>\n", ""
+    )
+    cut = module_txt.index("</AreaEstimates>") + len("</AreaEstimates>")
+    module_fp.write_text(module_txt[:cut] + "\n  <InterfaceSummary><RtlPorts")
+
+    module = ReportTree.from_report_dir(report_dir).target.module
+    assert module.report == report
+    assert module.loops == []
@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+
+from synth_scaffold.synth_scaffold import SynthScaffold
+from synth_scaffold.testing import write_report_dir
+
+
+def fake_report(s: SynthScaffold) -> None:
+    s.report_dir.mkdir(parents=True)
+    (s.report_dir / "csynth.xml").write_text("<profile/>")
+
+
+def test_generate_is_incremental(tmp_path: Path, linalg_source: Path, make_scaffold):
+    output_dir = tmp_path / "run"
+    s = make_scaffold(output_dir, generate=False)
+    assert s.generate()
+
+    generated = [output_dir / n for n in ("scaffold.cpp", "csynth.tcl", "linalg.h")]
+    mtimes = [fp.stat().st_mtime_ns for fp in generated]
+
+    # without a report there is nothing to reuse yet
+    assert s.generate()
+    assert [fp.stat().st_mtime_ns for fp in generated] == mtimes
+
+    fake_report(s)
+    assert s.is_up_to_date()
+    assert not s.generate()
+    assert (s.report_dir / "csynth.xml").exists()
+
+    st = linalg_source.stat()
+    os.utime(linalg_source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert not s.is_up_to_date()
+    assert s.generate()
+
+    s.clock_period = 4.0
+    assert s.generate()
+    assert "create_clock -period 4.0" in (output_dir / "csynth.tcl").read_text()
+
+
+def test_generate_removes_stale_sources(
+    tmp_path: Path, linalg_source: Path, make_scaffold
+):
+    extra_source = linalg_source.parent / "extra.h"
+    extra_source.write_text("#pragma once\n")
+
+    output_dir = tmp_path / "run"
+    make_scaffold(output_dir, input_source_files=[linalg_source, extra_source])
+    assert (output_dir / "extra.h").exists()
+
+    (output_dir / "notes.txt").write_text("kept")
+    make_scaffold(output_dir)
+    assert not (output_dir / "extra.h").exists()
+    assert (output_dir / "notes.txt").exists()
+
+
+def test_run_reuses_up_to_date_report(
+    tmp_path: Path, make_scaffold, make_report, failing_tool: Path
+):
+    s = make_scaffold(tmp_path / "run")
+    report = make_report()
+    write_report_dir(s.report_dir, report)
+
+    assert s.run() == report
+    assert s.last_run.up_to_date
+    assert not failing_tool.exists()
+
+
+def test_run_reruns_damaged_report(
+    tmp_path: Path, make_scaffold, make_report, failing_tool: Path
+):
+    s = make_scaffold(tmp_path / "run")
+    write_report_dir(s.report_dir, make_report())
+    # e.g. cut short by an interrupted run
+    csynth_xml_fp = s.report_dir / "csynth.xml"
+    csynth_xml_fp.write_text(csynth_xml_fp.read_text()[:100])
+    assert s.is_up_to_date()
+
+    assert s.run() is None
+    assert not s.last_run.up_to_date
+    assert failing_tool.exists()
@@ -0,0 +1,248 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import synth_scaffold
+from synth_scaffold.job_queue import JobQueue, run_job
+from synth_scaffold.synth_scaffold import RunInfo, config_key
+
+
+def make_configs(tmp_path: Path, n: int) -> list[dict]:
+    return [
+        {
+            "input_source_files": [str(tmp_path / "linalg.h")],
+            "output_dir": str(tmp_path / "runs" / str(i)),
+            "target_fn": "activation_relu",
+            "template_args": {"T": "float"},
+            "clock_period": 2.0 + i,
+        }
+        for i in range(n)
+    ]
+
+
+def expire(fp: Path) -> None:
+    t = time.time() - 1000
+    os.utime(fp, (t, t))
+
+
+def test_submit_claim_complete(tmp_path: Path, make_report):
+    queue = JobQueue(tmp_path / "queue")
+    configs = make_configs(tmp_path, 3)
+    job_ids = queue.submit(configs)
+    assert job_ids == [config_key(c) for c in configs]
+    # the same configs in other output directories are the same jobs
+    assert queue.submit([{**configs[0], "output_dir": "elsewhere"}]) == []
+    assert queue.status() == {"pending": 3, "running": 0, "done": 0, "failed": 0}
+
+    job = queue.claim()
+    assert job is not None
+    assert job.attempt == 1
+    assert job.fp.parent == queue.state_dir("running")
+    assert queue.status()["running"] == 1
+
+    report = make_report()
+    run_info = RunInfo(returncode=0, runtime_s=1.5)
+    queue.complete(job, report, run_info)
+    assert queue.status() == {"pending": 2, "running": 0, "done": 1, "failed": 0}
+    [(config, result)] = list(queue.results())
+    assert config == job.config
+    assert result == report
+    record = json.loads((queue.state_dir("done") / f"{job.job_id}.json").read_text())
+    assert record["run_info"]["runtime_s"] == 1.5
+
+    failed_job = queue.claim()
+    queue.complete(failed_job, None, None, error="boom")
+    assert queue.status()["failed"] == 1
+    assert queue.submit(configs) == []
+
+
+def test_lease_expiry(tmp_path: Path):
+    queue = JobQueue(tmp_path / "queue", lease_s=60, max_attempts=2)
+    [job_id] = queue.submit(make_configs(tmp_path, 1))
+
+    job = queue.claim()
+    assert queue.requeue_expired() == []
+    assert queue.renew(job)
+
+    # the worker died: its lease runs out and the job gets a second attempt
+    expire(job.fp)
+    assert queue.requeue_expired() == [job_id]
+    assert not queue.renew(job)
+    assert job.lease_lost
+    retry = queue.claim()
+    assert retry.job_id == job_id
+    assert retry.attempt == 2
+
+    # after the last attempt the job fails
+    expire(retry.fp)
+    assert queue.requeue_expired() == [job_id]
+    assert queue.status() == {"pending": 0, "running": 0, "done": 0, "failed": 1}
+    record = json.loads((queue.state_dir("failed") / f"{job_id}.json").read_text())
+    assert "Lease expired" in record["error"]
+
+
+def test_run_job_error(tmp_path: Path):
+    queue = JobQueue(tmp_path / "queue")
+    [config] = make_configs(tmp_path, 1)
+    del config["target_fn"]
+    queue.submit([config])
+
+    # a job whose config raises fails; it is not handed back to the queue
+    # as if the worker had been stopped
+    job = queue.claim()
+    assert run_job(queue, job, stop=threading.Event()) is None
+    assert queue.status() == {"pending": 0, "running": 0, "done": 0, "failed": 1}
+    record = json.loads((queue.state_dir("failed") / f"{job.job_id}.json").read_text())
+    assert "target_fn" in record["error"]
+
+
+def test_workers_share_queue(tmp_path: Path, linalg_source: Path, fake_tool: Path):
+    repo_dir = Path(synth_scaffold.__file__).parents[1]
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(repo_dir),
+        "FAKE_VITIS_HLS_RUNTIME": "0.2",
+    }
+
+    base_config = {
+        "input_source_files": [str(linalg_source)],
+        "includes": ['"linalg.h"'],
+        "output_dir": str(tmp_path / "runs"),
+        "target_fn": "activation_relu",
+        "template_args": {"T": "float"},
+    }
+    config_fp = tmp_path / "config.json"
+    config_fp.write_text(json.dumps(base_config))
+    design_space_fp = tmp_path / "design_space.json"
+    design_space_fp.write_text(json.dumps({"clock_period": [2.0, 3.0, 4.0, 5.0, 6.0]}))
+    queue_dir = tmp_path / "queue"
+
+    def synth_scaffold_cli(*args: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "from synth_scaffold.synth_scaffold import cli; cli()",
+                *args,
+            ],
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+
+    p = synth_scaffold_cli(
+        "submit",
+        "--queue",
+        str(queue_dir),
+        "--config",
+        str(config_fp),
+        "--design-space",
+        str(design_space_fp),
+    )
+    assert "Submitted 5 of 5 jobs" in p.communicate()[0]
+
+    # a job claimed by a worker that died long ago
+    queue = JobQueue(queue_dir)
+    dead_job = queue.claim()
+    expire(dead_job.fp)
+
+    workers = [
+        synth_scaffold_cli(
+            "worker",
+            "--queue",
+            str(queue_dir),
+            "--poll",
+            "0.1",
+            "--lease",
+            "30",
+            "--exit-when-empty",
+            *extra,
+        )
+        for extra in [(), (), ("--jobs", "2")]
+    ]
+    for worker in workers:
+        worker.communicate(timeout=120)
+        assert worker.returncode == 0
+
+    assert queue.status() == {"pending": 0, "running": 0, "done": 5, "failed": 0}
+    attempts = {}
+    for fp in queue.state_dir("done").glob("*.json"):
+        record = json.loads(fp.read_text())
+        assert (
+            record["report"]["target_clock_period"] == record["config"]["clock_period"]
+        )
+        attempts[fp.stem] = record["attempt"]
+    assert attempts.pop(dead_job.job_id) == 2
+    assert set(attempts.values()) == {1}
+
+
+def test_worker_stops_on_interrupt(
+    tmp_path: Path, linalg_source: Path, fake_tool: Path
+):
+    repo_dir = Path(synth_scaffold.__file__).parents[1]
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(repo_dir),
+        "FAKE_VITIS_HLS_RUNTIME": "60",
+    }
+    configs = [
+        {
+            "input_source_files": [str(linalg_source)],
+            "includes": ['"linalg.h"'],
+            "output_dir": str(tmp_path / "runs" / str(i)),
+            "target_fn": "activation_relu",
+            "template_args": {"T": "float"},
+            "clock_period": 5.0 + i,
+        }
+        for i in range(3)
+    ]
+    queue = JobQueue(tmp_path / "queue")
+    queue.submit(configs)
+
+    worker = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "from synth_scaffold.synth_scaffold import cli; cli()",
+            "worker",
+            "--queue",
+            str(queue.queue_dir),
+            "--jobs",
+            "2",
+            "--poll",
+            "0.1",
+        ],
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    status_fps = [Path(c["output_dir"]) / "run_status.json" for c in configs]
+    deadline = time.time() + 30
+    while sum(fp.exists() for fp in status_fps) < 2:
+        assert time.time() < deadline
+        time.sleep(0.1)
+
+    # the running tools are killed and their jobs go back to the queue
+    worker.send_signal(signal.SIGINT)
+    out = worker.communicate(timeout=30)[0]
+    assert worker.returncode != 0
+    assert out.count("stopped, requeued") == 2
+    assert queue.status() == {"pending": 3, "running": 0, "done": 0, "failed": 0}
+    assert sorted(
+        fp.name.split(".")[1] for fp in queue.state_dir("pending").iterdir()
+    ) == [
+        "1",
+        "1",
+        "1",
+    ]
+    for proc_dir in Path("/proc").iterdir():
+        try:
+            cmdline = (proc_dir / "cmdline").read_bytes()
+        except OSError:
+            continue
+        assert str(fake_tool).encode() not in cmdline
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from synth_scaffold.lexer import find_function_signature, find_function_signatures
+
+TRICKY_H = r"""
+#pragma once
+#define MAKE_ARRAY(name, n) \
+    int name[n] = {0};
+
+/* template <typename Unused> void commented_out(int x); */
+// template <typename AlsoUnused>
+
+namespace ops {
+
+template <typename T, int N = (4 > 2 ? 8 : 2), typename Acc = std::vector<std::vector<T>>>
+static inline T reduce_sum(const T in[N] /* input */, Acc &acc) {
+#pragma HLS INLINE off
+    T total = helper_call(in[0]);
+    if (total > T(0)) {
+        total = other_call(total, "{ not a brace");
+    }
+    return total;
+}
+
+struct Accum {
+  public:
+    void push(int x) { data = x; }
+    int data;
+};
+
+void Accum_reset(Accum &a);
+
+}  // namespace ops
+
+int table[4] = {1, 2, 3, 4};
+
+template <int W>
+void ops_top(ap_uint<W> x, int y = compute_default(3)) {}
+
+#ifdef FAST_SPLIT
+void split_header(int x) {
+#else
+void split_header(int x, int y) {
+#endif
+    helper_call(x);
+}
+
+template <typename T> void after(T z);
+"""
+
+
+def test_find_signatures_in_tricky_header():
+    fp = Path("tricky.h")
+    names = [sig.name for sig in find_function_signatures(TRICKY_H, fp)]
+    assert names == [
+        "reduce_sum",
+        "push",
+        "Accum_reset",
+        "ops_top",
+        "split_header",
+        "split_header",
+        "after",
+    ]
+
+    sig = find_function_signature(TRICKY_H, "reduce_sum", fp)
+    assert sig is not None
+    assert sig.ret_type == "T"
+    assert sig.template_args is not None
+    assert "typename Acc = std::vector<std::vector<T>>" in sig.template_args
+    assert " ".join(sig.args.split()) == "const T in[N] , Acc &acc"
+    assert TRICKY_H[sig.offset :].startswith("template <typename T, int N")
+
+    sig = find_function_signature(TRICKY_H, "ops_top", fp)
+    assert sig is not None
+    assert sig.template_args == "int W"
+    assert sig.args == "ap_uint<W> x, int y = compute_default(3)"
+
+    # a header split across preprocessor branches does not hide the code
+    # after it; its first branch is the one found
+    sig = find_function_signature(TRICKY_H, "split_header", fp)
+    assert sig is not None
+    assert sig.args == "int x"
+    sig = find_function_signature(TRICKY_H, "after", fp)
+    assert sig is not None
+    assert sig.template_args == "typename T"
+    assert sig.args == "T z"
+
+    assert find_function_signature(TRICKY_H, "commented_out", fp) is None
+    assert find_function_signature(TRICKY_H, "helper_call", fp) is None
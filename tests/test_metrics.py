@@ -0,0 +1,130 @@
+import json
+import sys
+from pathlib import Path
+
+import synth_scaffold
+from synth_scaffold.metrics import (
+    RunMetrics,
+    Span,
+    chrome_trace_events,
+    parse_flow_log,
+)
+from synth_scaffold.monitor import ProgressEvent
+from synth_scaffold.sweep import sweep
+
+FLOW_LOG = """\
+Execute       csynth_design
+Execute         elaborate -effort=medium
+Command         elaborate done; 2.5 sec.
+Execute         transform -optimize
+Command         transform done; 1.25 sec.
+Execute         autosched -p scaffold_fn
+Command         autosched done; 0.5 sec.
+Execute         autosched -p scaffold_fn
+Command         autosched done; 0.25 sec.
+Command       csynth_design done; error code: 0; 5 sec.
+"""
+
+# prints phase markers like vitis_hls and writes a report and a flow log
+FAKE_VITIS_HLS = """#!{python}
+import sys
+from pathlib import Path
+
+sys.path.insert(0, {repo_dir!r})
+from synth_scaffold.testing import write_report_dir
+sys.path.insert(0, {tests_dir!r})
+from conftest import build_report
+
+print("INFO: [HLS 200-10] Analyzing design file 'scaffold.cpp' ...", flush=True)
+print("INFO: [HLS 200-111] Starting scheduling ...", flush=True)
+solution_dir = Path("synth_scaffold_project/solution_csynth")
+write_report_dir(solution_dir / "syn" / "report", build_report())
+flow_log_fp = solution_dir / ".autopilot" / "db" / "autopilot.flow.log"
+flow_log_fp.parent.mkdir(parents=True)
+flow_log_fp.write_text({flow_log!r})
+"""
+
+
+def test_parse_flow_log():
+    assert parse_flow_log(FLOW_LOG) == {
+        "elaborate": 2.5,
+        "transform": 1.25,
+        "autosched": 0.75,
+        "csynth_design": 5.0,
+    }
+
+
+def test_phase_spans():
+    metrics = RunMetrics()
+    tool_span = Span(name="vitis_hls", category="tool", start_s=100.0, wall_s=10.0)
+    events = [
+        ProgressEvent(phase="elaboration", elapsed_s=2.0, line=""),
+        ProgressEvent(phase="scheduling", elapsed_s=6.0, line=""),
+    ]
+    metrics.add_phase_spans(tool_span, events)
+    assert [(s.name, s.start_s, s.wall_s) for s in metrics.spans] == [
+        ("startup", 100.0, 2.0),
+        ("elaboration", 102.0, 4.0),
+        ("scheduling", 106.0, 4.0),
+    ]
+    assert RunMetrics.from_dict(metrics.to_dict()) == metrics
+
+
+def test_chrome_trace_events():
+    metrics = RunMetrics(
+        spans=[
+            Span(name="generate", category="python", start_s=1.5, wall_s=0.5),
+            Span(name="job", category="job", start_s=1.5, wall_s=2.0, cpu_s=0.25),
+        ],
+        bytes_staged=42,
+        pid=7,
+    )
+    events = chrome_trace_events([("key_a", metrics), ("key_b", RunMetrics())])
+    job, generate, process_name = events
+    assert job["name"] == "job"
+    assert job["ph"] == "X"
+    assert job["ts"] == 1.5e6
+    assert job["dur"] == 2e6
+    assert job["pid"] == 7
+    assert job["args"]["cpu_s"] == 0.25
+    assert job["args"]["bytes_staged"] == 42
+    assert generate["args"] == {"job": "key_a"}
+    assert process_name["ph"] == "M"
+    assert process_name["args"]["name"] == "worker 7"
+
+
+def test_sweep_trace(tmp_path: Path, linalg_source: Path, install_fake_vitis_hls):
+    install_fake_vitis_hls(
+        FAKE_VITIS_HLS.format(
+            python=sys.executable,
+            repo_dir=str(Path(synth_scaffold.__file__).parents[1]),
+            tests_dir=str(Path(__file__).parent),
+            flow_log=FLOW_LOG,
+        )
+    )
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "out_size": "32", "BLOCK_SIZE_OUT_": 1},
+    }
+    design_space = {"BLOCK_SIZE_IN_": [1, 2], "T": ["float"]}
+    trace_fp = tmp_path / "trace.json"
+
+    results = list(sweep(base_config, design_space, max_workers=2, trace_fp=trace_fp))
+    assert all(report is not None for _, report in results)
+
+    events = json.loads(trace_fp.read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert len({e["args"]["job"] for e in spans}) == 2
+    names = {e["name"] for e in spans}
+    assert {"job", "generate", "find_target_fn", "stage_sources"} <= names
+    assert {"vitis_hls", "startup", "scheduling", "read_report"} <= names
+
+    jobs = [e for e in spans if e["name"] == "job"]
+    for job in jobs:
+        assert job["args"]["bytes_staged"] == linalg_source.stat().st_size
+        assert job["args"]["flow_log_times_s"]["csynth_design"] == 5.0
+    workers = {e["pid"] for e in events if e["ph"] == "M"}
+    assert workers == {e["pid"] for e in jobs}
@@ -0,0 +1,61 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.monitor import PhaseMonitor
+from synth_scaffold.scheduler import is_oom_kill
+from synth_scaffold.synth_scaffold import SynthScaffold
+
+# goes through elaboration and then hangs in scheduling, like a fully
+# unrolled loop nest
+FAKE_VITIS_HLS = """#!/bin/sh
+echo "INFO: [HLS 200-10] Analyzing design file 'scaffold.cpp' ..."
+sleep 0.2
+echo "INFO: [HLS 200-111] Finished Compiling Optimization and Transform"
+echo "INFO: [HLS 200-10] Starting code transformations ..."
+echo "INFO: [SCHED 204-11] Starting scheduling ..." 1>&2
+sleep 30 &
+echo $! > child.pid
+wait
+"""
+
+
+def test_run_phase_timeout(tmp_path: Path, linalg_source: Path, install_fake_vitis_hls):
+    install_fake_vitis_hls(FAKE_VITIS_HLS)
+    s = SynthScaffold(
+        input_source_files=[linalg_source],
+        output_dir=tmp_path / "run",
+        target_fn="activation_relu",
+        includes=['"linalg.h"'],
+        template_args={"T": "float"},
+    )
+    phases = []
+
+    t_start = time.monotonic()
+    report = s.generate_and_run(
+        timeout_s=20,
+        phase_timeouts_s={"scheduling": 1.0},
+        on_progress=lambda event: phases.append(event.phase),
+    )
+
+    assert time.monotonic() - t_start < 10
+    assert report is None
+    assert phases == ["elaboration", "transformation", "scheduling"]
+
+    run_info = s.last_run
+    assert run_info.timed_out == "scheduling"
+    assert run_info.returncode == -9
+    assert not is_oom_kill(run_info)
+    assert run_info.phase_times_s["elaboration"] >= 0.2
+    assert run_info.phase_times_s["scheduling"] >= 1.0
+
+    status = json.loads((s.output_dir / "run_status.json").read_text())
+    assert status["state"] == "timed_out"
+    assert status["phase"] == "scheduling"
+
+
+def test_unknown_phase_timeout():
+    with pytest.raises(ValueError):
+        PhaseMonitor(phase_timeouts_s={"placement": 1.0})
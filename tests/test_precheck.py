@@ -0,0 +1,133 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.batch import run_batch
+from synth_scaffold.precheck import PRECHECK_LOG_NAME, Precheck
+from synth_scaffold.store import STATUS_PRECHECK_FAILED, ResultStore
+from synth_scaffold.sweep import sweep
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("g++") is None, reason="needs a host C++ compiler"
+)
+
+
+def base_config(tmp_path: Path, source: Path) -> dict:
+    return {
+        "input_source_files": [source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {"in_size": 8, "out_size": 4, "BLOCK_SIZE_OUT_": 1},
+    }
+
+
+# like the real ap_int.h, its synthesis branch needs the HLS compiler
+AP_INT_H = """#pragma once
+
+template <int W>
+struct ap_uint {
+#ifdef __SYNTHESIS__
+    typedef unsigned _ExtInt(W) Base;
+#else
+    typedef unsigned long long Base;
+#endif
+    Base V;
+    ap_uint(int v = 0) : V(v) {}
+    bool operator>(const ap_uint& other) const { return V > other.V; }
+};
+"""
+
+
+def linear_options(block_size: int) -> dict:
+    return {
+        "target_fn": "linear",
+        "template_args": {
+            "in_size": 8,
+            "out_size": 4,
+            "BLOCK_SIZE_IN_": block_size,
+            "BLOCK_SIZE_OUT_": 1,
+            "T": "float",
+        },
+    }
+
+
+def test_check(tmp_path: Path, make_scaffold):
+    precheck = Precheck(include_dirs=[])
+    result = precheck.check(
+        make_scaffold(tmp_path / "block_2", precheck=precheck, **linear_options(2))
+    )
+    assert result.passed
+    result = precheck.check(
+        make_scaffold(tmp_path / "block_3", precheck=precheck, **linear_options(3))
+    )
+    assert not result.passed
+    assert "in_size must be divisible by BLOCK_SIZE_IN" in result.diagnostics
+
+    # without the HLS headers, a scaffold that needs them cannot be judged
+    s = make_scaffold(tmp_path / "block_2", precheck=precheck, **linear_options(2))
+    s.includes = ['"ap_fixed.h"', *s.includes]
+    s.generate()
+    assert precheck.check(s).passed
+    assert not Precheck(include_dirs=[tmp_path]).check(s).passed
+
+    with pytest.raises(FileNotFoundError):
+        Precheck(compiler="no-such-compiler++")
+
+
+def test_check_with_hls_headers(tmp_path: Path, make_scaffold):
+    include_dir = tmp_path / "hls_include"
+    include_dir.mkdir()
+    (include_dir / "ap_int.h").write_text(AP_INT_H)
+    s = make_scaffold(
+        tmp_path / "relu",
+        includes=['"ap_int.h"', '"linalg.h"'],
+        template_args={"T": "ap_uint<8>"},
+    )
+
+    result = Precheck(include_dirs=[include_dir]).check(s)
+    assert result.passed, result.diagnostics
+    flags = ["-std=c++14", "-D__SYNTHESIS__"]
+    assert not Precheck(include_dirs=[include_dir], flags=flags).check(s).passed
+
+
+def test_run_and_batch(tmp_path: Path, make_scaffold, fake_tool: Path):
+    precheck = Precheck(include_dirs=[])
+    s = make_scaffold(tmp_path / "block_3", precheck=precheck, **linear_options(3))
+    assert s.run() is None
+    assert s.last_run.returncode is None
+    assert "static assertion failed" in s.last_run.precheck_diagnostics
+    assert (s.output_dir / PRECHECK_LOG_NAME).exists()
+    # the tool never started
+    assert not (s.output_dir / "csynth.log").exists()
+
+    scaffolds = [
+        make_scaffold(
+            tmp_path / "batch" / f"block_{b}", precheck=precheck, **linear_options(b)
+        )
+        for b in [1, 3, 2]
+    ]
+    reports = run_batch(scaffolds, tmp_path / "batch")
+    assert [r is not None for r in reports] == [True, False, True]
+    assert scaffolds[1].last_run.precheck_diagnostics
+    batch_tcl_txt = (tmp_path / "batch" / "batch.tcl").read_text()
+    assert str(scaffolds[1].output_dir) not in batch_tcl_txt
+    assert str(scaffolds[2].output_dir) in batch_tcl_txt
+
+
+def test_sweep(tmp_path: Path, linalg_source: Path, fake_tool: Path):
+    store = ResultStore(tmp_path / "results.db")
+    results = list(
+        sweep(
+            base_config(tmp_path, linalg_source),
+            {"BLOCK_SIZE_IN_": [1, 2, 3], "T": ["float"]},
+            max_workers=2,
+            store=store,
+            precheck=Precheck(include_dirs=[]),
+        )
+    )
+    failed = [config for config, report in results if report is None]
+    assert [config["template_args"]["BLOCK_SIZE_IN_"] for config in failed] == [3]
+    assert (failed[0]["output_dir"] / PRECHECK_LOG_NAME).exists()
+    assert len(store.query(status=STATUS_PRECHECK_FAILED)) == 1
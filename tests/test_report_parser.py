@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from synth_scaffold.synth_scaffold import SynthReport, find_report_dirs
+from synth_scaffold.testing import write_report_dir
+from synth_scaffold.xml_extract import pattern_matches
+
+
+def test_pattern_matches():
+    pattern = ("AreaEstimates", "Resources", "LUT")
+    assert pattern_matches(pattern, ["profile", "AreaEstimates", "Resources", "LUT"])
+    assert pattern_matches(
+        pattern, ["profile", "AreaEstimates", "Module", "Resources", "LUT"]
+    )
+    assert not pattern_matches(
+        pattern, ["profile", "AreaEstimates", "AvailableResources", "LUT"]
+    )
+    assert not pattern_matches(pattern, ["profile", "Resources", "LUT"])
+
+
+def test_from_report_dir_round_trip(tmp_path: Path, make_report):
+    report = make_report()
+    report_dir = write_report_dir(tmp_path / "report", report, n_loops=5, n_ports=20)
+    assert SynthReport.from_report_dir(report_dir) == report
+
+
+def test_from_report_dir_stops_early(tmp_path: Path, make_report):
+    report = make_report()
+    report_dir = write_report_dir(tmp_path / "report", report)
+
+    # everything after the area estimates is never read, so a truncated
+    # file still parses
+    module_fp = report_dir / f"{report.module_name}_csynth.xml"
+    module_txt = module_fp.read_text()
+    cut = module_txt.index("</AreaEstimates>") + len("</AreaEstimates>")
+    module_fp.write_text(module_txt[:cut] + "\n  <InterfaceSummary><RtlPorts")
+
+    assert SynthReport.from_report_dir(report_dir) == report
+
+
+def test_scan(tmp_path: Path, make_report):
+    runs_dir = tmp_path / "runs"
+    expected = {}
+    for i in range(4):
+        report = make_report(resources_lut_used=1000 + i)
+        report_dir = (
+            runs_dir / f"run_{i}" / "proj" / "solution_csynth" / "syn" / "report"
+        )
+        expected[write_report_dir(report_dir, report)] = report
+    broken_dir = runs_dir / "broken" / "syn" / "report"
+    broken_dir.mkdir(parents=True)
+    (broken_dir / "csynth.xml").write_text("<profile>")
+    expected[broken_dir] = None
+    (runs_dir / "run_0" / "report").mkdir()
+
+    assert find_report_dirs(runs_dir) == sorted(expected)
+    assert SynthReport.scan(runs_dir, workers=1) == expected
+    assert SynthReport.scan(runs_dir, workers=2) == expected
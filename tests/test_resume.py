@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+
+import synth_scaffold
+from synth_scaffold.manifest import MANIFEST_NAME, SweepManifest
+from synth_scaffold.sweep import sweep
+
+# writes a report whose latency encodes the block size, and fails for the
+# block size in $FAKE_FAIL_BLOCK
+FAKE_VITIS_HLS = """#!{python}
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, {repo_dir!r})
+from synth_scaffold.synth_scaffold import SynthReport
+from synth_scaffold.testing import write_report_dir
+
+with open({log_fp!r}, "a") as f:
+    f.write(os.getcwd() + "\\n")
+scaffold_txt = Path("scaffold.cpp").read_text()
+block = int(re.search(r"#define BLOCK_SIZE_IN_ (\\d+)", scaffold_txt).group(1))
+if str(block) == os.environ.get("FAKE_FAIL_BLOCK"):
+    sys.exit(1)
+report = SynthReport(
+    part="xczu9eg-ffvb1156-2-e", flow_target="vivado", module_name="linear",
+    clock_unit="ns", target_clock_period=5.0, target_clock_uncertainty=1.35,
+    achieved_clock_period=3.5, latency_worst_case=1000 // block,
+    latency_average_case=1000 // block, latency_best_case=1000 // block,
+    latency_t_worst_case=1e-06, latency_t_average_case=1e-06,
+    latency_t_best_case=1e-06, resources_lut_used=100 * block,
+    resources_ff_used=100, resources_dsp_used=1, resources_bram_used=0,
+    resources_uram_used=0, resources_lut_available=274080,
+    resources_ff_available=548160, resources_dsp_available=2520,
+    resources_bram_available=1824, resources_uram_available=0,
+)
+write_report_dir(Path("synth_scaffold_project/solution_csynth/syn/report"), report)
+"""
+
+
+def test_sweep_resume(
+    tmp_path: Path, linalg_source: Path, install_fake_vitis_hls, monkeypatch
+):
+    log_fp = tmp_path / "invocations.log"
+    install_fake_vitis_hls(
+        FAKE_VITIS_HLS.format(
+            python=sys.executable,
+            repo_dir=str(Path(synth_scaffold.__file__).parents[1]),
+            log_fp=str(log_fp),
+        )
+    )
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "out_size": "32", "BLOCK_SIZE_OUT_": 1},
+    }
+    design_space = {"BLOCK_SIZE_IN_": [1, 2, 4, 8], "T": ["float"]}
+
+    def latencies(results):
+        return sorted(
+            (c["template_args"]["BLOCK_SIZE_IN_"], r.latency_average_case)
+            for c, r in results
+            if r is not None
+        )
+
+    def n_invocations():
+        return len(log_fp.read_text().splitlines())
+
+    # the sweep is interrupted after two results and one point fails
+    monkeypatch.setenv("FAKE_FAIL_BLOCK", "2")
+    results = sweep(base_config, design_space, max_workers=1)
+    assert next(results)[1] is not None
+    assert next(results)[1] is None
+    results.close()
+    assert n_invocations() == 2
+
+    records = SweepManifest(tmp_path / "runs" / MANIFEST_NAME).load()
+    assert sorted(r["status"] for r in records.values()) == ["failed", "ok"]
+
+    # resuming runs the failed and the missing points only
+    monkeypatch.delenv("FAKE_FAIL_BLOCK")
+    results = list(sweep(base_config, design_space, max_workers=1, resume=True))
+    assert latencies(results) == [(1, 1000), (2, 500), (4, 250), (8, 125)]
+    assert n_invocations() == 5
+
+    # nothing is left to run, unless a report was damaged or the sources
+    # changed
+    results = list(sweep(base_config, design_space, max_workers=1, resume=True))
+    assert len(latencies(results)) == 4
+    assert n_invocations() == 5
+
+    [report_dir] = [
+        d
+        for d in (tmp_path / "runs").glob("*/synth_scaffold_project/*/syn/report")
+        if "#define BLOCK_SIZE_IN_ 8\n" in (d.parents[3] / "scaffold.cpp").read_text()
+    ]
+    (report_dir / "linear_csynth.xml").unlink()
+    results = list(sweep(base_config, design_space, max_workers=1, resume=True))
+    assert len(latencies(results)) == 4
+    assert n_invocations() == 6
+
+    linalg_source.write_text(linalg_source.read_text() + "\n// changed\n")
+    results = list(sweep(base_config, design_space, max_workers=1, resume=True))
+    assert len(latencies(results)) == 4
+    assert n_invocations() == 10
@@ -0,0 +1,146 @@
+import dataclasses
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.hierarchy import ReportTree
+from synth_scaffold.manifest import report_digest
+from synth_scaffold.retention import (
+    apply_retention,
+    disk_usage_bytes,
+    gc,
+    main,
+    run_retention,
+)
+from synth_scaffold.synth_scaffold import PROJECT_DIR_NAME, SynthReport, SynthScaffold
+from synth_scaffold.testing import write_report_dir
+
+SOLUTION_DIR = Path(PROJECT_DIR_NAME) / "solution_csynth"
+REPORT_DIR = SOLUTION_DIR / "syn" / "report"
+FLOW_LOG = SOLUTION_DIR / ".autopilot" / "db" / "autopilot.flow.log"
+
+
+def make_run_dir(output_dir: Path, report: SynthReport, junk_bytes: int) -> Path:
+    """
+    A finished run as Vitis HLS leaves it: reports, logs and bulky
+    intermediate files.
+    """
+    child = dataclasses.replace(report, module_name="child_fn")
+    write_report_dir(output_dir / REPORT_DIR, report, children=[child])
+    (output_dir / FLOW_LOG).parent.mkdir(parents=True)
+    (output_dir / FLOW_LOG).write_text("Command csynth_design done; 1.00 sec.\n")
+    (output_dir / "csynth.log").write_text("INFO: done\n")
+    for junk_fp in [
+        SOLUTION_DIR / ".autopilot" / "db" / "scaffold_fn.bc",
+        SOLUTION_DIR / "impl" / "verilog" / "scaffold_fn.v",
+        Path(PROJECT_DIR_NAME) / "hls.app",
+    ]:
+        (output_dir / junk_fp).parent.mkdir(parents=True, exist_ok=True)
+        (output_dir / junk_fp).write_bytes(b"\0" * junk_bytes)
+    return output_dir
+
+
+def test_retention_modes(tmp_path: Path, make_report):
+    report = make_report()
+    output_dir = make_run_dir(tmp_path / "run", report, 1000)
+    report_dir = output_dir / REPORT_DIR
+    digest = report_digest(report_dir)
+    assert run_retention(output_dir) == "all"
+
+    apply_retention(output_dir, "archive")
+    assert run_retention(output_dir) == "archive"
+    assert not (output_dir / PROJECT_DIR_NAME).exists()
+    assert (output_dir / f"{PROJECT_DIR_NAME}.zip").is_file()
+    # the reports read the same from the archive
+    assert SynthReport.from_report_dir(report_dir) == report
+    assert report_digest(report_dir) == digest
+    tree = ReportTree.from_report_dir(report_dir)
+    assert len(tree.reports()) == 2
+    assert SynthReport.scan(tmp_path, workers=1) == {report_dir: report}
+
+    apply_retention(output_dir, "reports")
+    assert run_retention(output_dir) == "reports"
+    assert not (output_dir / f"{PROJECT_DIR_NAME}.zip").exists()
+    assert sorted(
+        str(fp.relative_to(output_dir)) for fp in output_dir.rglob("*") if fp.is_file()
+    ) == sorted(
+        [
+            "csynth.log",
+            str(FLOW_LOG),
+            *(str(REPORT_DIR / name) for name in os.listdir(report_dir)),
+        ]
+    )
+    assert SynthReport.from_report_dir(report_dir) == report
+    assert report_digest(report_dir) == digest
+
+    with pytest.raises(ValueError):
+        apply_retention(output_dir, "none")
+
+
+def test_run_with_retention(tmp_path: Path, linalg_source: Path, fake_tool: Path):
+    s = SynthScaffold(
+        input_source_files=[linalg_source],
+        output_dir=tmp_path / "out",
+        target_fn="activation_relu",
+        includes=['"linalg.h"'],
+        template_args={"T": "float"},
+        retention="archive",
+    )
+    s.generate()
+    report = s.run()
+    assert report is not None
+    assert run_retention(s.output_dir) == "archive"
+    assert s.last_run.metrics.flow_log_times_s["csynth_design"] == 0.0
+
+    # an archived run is up to date and its report is reused
+    assert not s.generate()
+    assert s.run() == report
+    assert s.last_run.up_to_date
+
+    # rerunning replaces the archive
+    t = time.time() + 10
+    os.utime(s.output_dir / "csynth.tcl", (t, t))
+    assert s.generate()
+    assert s.run() == report
+    assert s.last_run.returncode == 0
+    assert run_retention(s.output_dir) == "archive"
+
+
+def test_gc(tmp_path: Path, make_report):
+    runs_dir = tmp_path / "runs"
+    output_dirs = []
+    for i in range(4):
+        output_dir = make_run_dir(runs_dir / f"run_{i}", make_report(), 100_000)
+        # run_0 is the oldest
+        t = 1_000_000 + i
+        os.utime(output_dir / "csynth.log", (t, t))
+        output_dirs.append(output_dir)
+    # a run that is still going is left alone, however old
+    (output_dirs[0] / "run_status.json").write_text(json.dumps({"state": "running"}))
+
+    size = sum(disk_usage_bytes(d) for d in output_dirs)
+    assert size > 4 * 300_000
+    budget = size - 400_000
+
+    result = gc(runs_dir, budget)
+    assert result.size_before_bytes == size
+    assert result.reduced == output_dirs[1:3]
+    assert result.size_after_bytes <= budget
+    assert [run_retention(d) for d in output_dirs] == [
+        "all",
+        "archive",
+        "archive",
+        "all",
+    ]
+
+    # a tighter budget than the runs can meet
+    assert not main([str(runs_dir), "--max-size-gb", "0", "--retention", "reports"])
+    assert [run_retention(d) for d in output_dirs] == [
+        "all",
+        "reports",
+        "reports",
+        "reports",
+    ]
@@ -0,0 +1,88 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from synth_scaffold.resources import RssSampler, RssSamplerGroup, process_tree_rss
+from synth_scaffold.scheduler import AdmissionController, MemoryHistory, is_oom_kill
+from synth_scaffold.synth_scaffold import RunInfo
+
+GIB = 1024**3
+
+
+def make_config(**template_args) -> dict:
+    return {"target_fn": "linear", "template_args": template_args}
+
+
+def test_rss_sampler_tracks_child_tree():
+    assert (process_tree_rss(1) or 0) >= 0
+    p = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "x = bytearray(64 * 1024**2); import time; time.sleep(1)",
+        ]
+    )
+    with RssSampler(p.pid, interval_s=0.05) as sampler:
+        p.wait()
+    assert sampler.peak_rss_bytes is not None
+    assert sampler.peak_rss_bytes > 32 * 1024**2
+
+
+def test_rss_sampler_group():
+    group = RssSamplerGroup(interval_s=0.05)
+    procs = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                f"x = bytearray({n} * 1024**2); import time; time.sleep(1)",
+            ]
+        )
+        for n in (64, 128)
+    ]
+    samplers = [RssSampler(p.pid) for p in procs]
+    for sampler in samplers:
+        group.add(sampler)
+    for p, sampler in zip(procs, samplers):
+        p.wait()
+        group.remove(sampler)
+    assert samplers[0].peak_rss_bytes > 32 * 1024**2
+    assert samplers[1].peak_rss_bytes > 96 * 1024**2
+
+
+def test_admission_memory_and_licenses(tmp_path: Path):
+    history = MemoryHistory(tmp_path / "memory_history.json")
+    history.record(make_config(B=16), 6 * GIB)
+    history.record(make_config(B=1), 1 * GIB)
+    history.save()
+
+    scheduler = AdmissionController(
+        max_workers=8,
+        memory_budget_bytes=8 * GIB,
+        licenses=3,
+        history=MemoryHistory(tmp_path / "memory_history.json"),
+        available_memory=lambda: None,
+    )
+    small, big = make_config(B=1), make_config(B=16)
+    assert scheduler.admit(big, [])
+    assert scheduler.admit(small, [big])
+    assert not scheduler.admit(big, [big])
+    # unseen configs are projected from the largest known peak of the target
+    assert scheduler.estimate(make_config(B=8)) == 6 * GIB
+    assert not scheduler.admit(small, [small, small, small])
+
+    # the host has less memory available than the budget allows for
+    scheduler.available_memory = lambda: 4 * GIB
+    assert scheduler.admit(small, [small])
+    assert not scheduler.admit(big, [small])
+    assert scheduler.admit(big, [])
+
+
+def test_oom_halves_concurrency():
+    scheduler = AdmissionController(max_workers=16)
+    assert is_oom_kill(RunInfo(returncode=137, runtime_s=1.0))
+    assert not is_oom_kill(RunInfo(returncode=1, runtime_s=1.0))
+    scheduler.on_oom(n_running=12)
+    assert scheduler.max_concurrency == 6
+    scheduler.on_oom(n_running=1)
+    assert scheduler.max_concurrency == 1
@@ -0,0 +1,92 @@
+import asyncio
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.scratch import (
+    SCRATCH_PREFIX,
+    make_scratch_dir,
+    remove_stale_scratch_dirs,
+)
+from synth_scaffold.synth_scaffold import SynthScaffold, config_key
+
+
+def test_run_in_scratch_dir(tmp_path: Path, make_scaffold, fake_tool: Path):
+    s = make_scaffold(tmp_path / "out", scratch_dir=tmp_path / "scratch")
+    report = s.run()
+    assert report is not None
+    assert s.last_run.metrics.flow_log_times_s["csynth_design"] == 0.0
+    assert "copy_back" in s.last_run.metrics.wall_times_s()
+
+    # only the reports and logs reach output_dir, and nothing is left behind
+    assert list((tmp_path / "scratch").iterdir()) == []
+    assert (s.output_dir / "csynth.log").exists()
+    assert (s.report_dir / "csynth.xml").exists()
+    assert sorted(p.name for p in (s.project_dir / "solution_csynth").iterdir()) == [
+        ".autopilot",
+        "syn",
+    ]
+    assert s.is_up_to_date()
+    assert s.report_tree().target.module.report == report
+
+
+def test_run_async_in_scratch_dir(
+    tmp_path: Path,
+    make_scaffold,
+    fake_tool: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("FAKE_VITIS_HLS_RUNTIME", "0.5")
+    s = make_scaffold(tmp_path / "out", scratch_dir=tmp_path / "scratch")
+    report = asyncio.run(s.run_async())
+    assert report is not None
+    assert s.last_run.peak_rss_bytes is not None
+    assert list((tmp_path / "scratch").iterdir()) == []
+    assert (s.report_dir / "csynth.xml").exists()
+
+    # the scratch dir is where a config runs, not what it is
+    config = s.to_config()
+    assert config["scratch_dir"] == str(tmp_path / "scratch")
+    assert config_key(config) == config_key({**config, "scratch_dir": None})
+    assert SynthScaffold.from_config(config).scratch_dir == tmp_path / "scratch"
+
+
+def test_scratch_dir_cleanup_on_failure(
+    tmp_path: Path,
+    make_scaffold,
+    fake_tool: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    s = make_scaffold(tmp_path / "out", scratch_dir=tmp_path / "scratch")
+    monkeypatch.setenv("FAKE_VITIS_HLS_FAIL_RATE", "1")
+    assert s.run() is None
+    assert "Fake scheduling failure" in (s.output_dir / "csynth.log").read_text()
+    assert list((tmp_path / "scratch").iterdir()) == []
+
+    monkeypatch.setenv("FAKE_VITIS_HLS_FAIL_RATE", "0")
+    monkeypatch.setenv("FAKE_VITIS_HLS_RUNTIME", "30")
+    assert s.run(timeout_s=0.5) is None
+    assert s.last_run.timed_out is not None
+    assert list((tmp_path / "scratch").iterdir()) == []
+
+
+def test_remove_stale_scratch_dirs(tmp_path: Path):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    dead_pid = dead.pid
+
+    live_dir = make_scratch_dir(tmp_path)
+    dead_dir = tmp_path / f"{SCRATCH_PREFIX}.{socket.gethostname()}.{dead_pid}.abc123"
+    other_host_dir = tmp_path / f"{SCRATCH_PREFIX}.other.host.{dead_pid}.abc123"
+    unrelated_dir = tmp_path / "results"
+    for d in [dead_dir, other_host_dir, unrelated_dir]:
+        (d / "synth_scaffold_project").mkdir(parents=True)
+
+    assert remove_stale_scratch_dirs(tmp_path) == [dead_dir]
+    assert sorted(tmp_path.iterdir()) == sorted(
+        [live_dir, other_host_dir, unrelated_dir]
+    )
+    assert remove_stale_scratch_dirs(tmp_path / "missing") == []
@@ -0,0 +1,110 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.search import (
+    Objective,
+    RandomSearch,
+    SearchStrategy,
+    SuccessiveHalving,
+    TPESearch,
+    score_report,
+    search,
+)
+
+DESIGN_SPACE = {"A": list(range(8)), "B": list(range(8)), "T": ["float", "int"]}
+
+
+def bowl(point: dict) -> float:
+    return (point["A"] - 5) ** 2 + (point["B"] - 2) ** 2 + (point["T"] == "int")
+
+
+def drive(strategy: SearchStrategy, budget: int, batch_size: int = 4) -> int:
+    n_runs = 0
+    while n_runs < budget:
+        points = strategy.ask(min(batch_size, budget - n_runs))
+        if not points:
+            break
+        for point in points:
+            strategy.tell(point, bowl(point))
+        n_runs += len(points)
+    return n_runs
+
+
+def test_objective_and_score(make_report):
+    report = make_report(resources_lut_used=1000, resources_ff_used=500)
+    objectives = [
+        Objective("resources_lut_used"),
+        Objective("resources_ff_used", direction="max", weight=2.0),
+    ]
+    assert score_report(report, objectives) == 1000 - 2 * 500
+    assert score_report(None, objectives) is None
+
+    Objective("latency_t_computed_average_case")
+    with pytest.raises(ValueError):
+        Objective("latency_in_furlongs")
+
+
+def test_random_search_exhausts_without_repeats():
+    strategy = RandomSearch(DESIGN_SPACE, seed=0)
+    assert drive(strategy, budget=1000) == 128
+    assert len({str(p) for p, _ in strategy.history}) == 128
+    assert strategy.best()[1] == 0
+
+
+def test_strategy_is_abstract():
+    with pytest.raises(TypeError):
+        SearchStrategy()
+
+    class AskOnly(SearchStrategy):
+        def ask(self, n):
+            return []
+
+    with pytest.raises(TypeError):
+        AskOnly()
+
+
+def test_tpe_converges():
+    tpe = TPESearch(DESIGN_SPACE, n_startup=8, seed=0)
+    drive(tpe, budget=32)
+    assert len({str(p) for p, _ in tpe.history}) == 32
+    assert tpe.best()[1] <= 1
+
+
+def test_successive_halving():
+    points = [{"A": a, "B": b, "T": "float"} for a in range(3, 6) for b in range(3)]
+    strategy = SuccessiveHalving(points, "in_size", [8, 16, 64], eta=3)
+    n_runs = drive(strategy, budget=100)
+
+    # 9 points at in_size=8, the best 3 at 16, the best one at 64
+    assert n_runs == 9 + 3 + 1
+    [(point, score)] = strategy.history
+    assert point == {"A": 5, "B": 2, "T": "float", "in_size": 64}
+    assert score == 0
+
+
+@pytest.mark.skipif(
+    shutil.which("vitis_hls") is not None, reason="expects vitis_hls to be missing"
+)
+def test_search_respects_budget(tmp_path: Path, linalg_source: Path):
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "out_size": "32", "T": "float"},
+    }
+    strategy = RandomSearch({"BLOCK_SIZE_IN_": [1, 2, 4, 8]}, seed=0)
+    results = list(
+        search(
+            base_config,
+            strategy,
+            [Objective("latency_t_computed_average_case")],
+            budget=3,
+            max_workers=2,
+        )
+    )
+    assert len(results) == 3
+    assert all(report is None and score is None for _, report, score in results)
+    assert len(strategy.history) == 3
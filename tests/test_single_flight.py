@@ -0,0 +1,137 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.single_flight import SingleFlight
+from synth_scaffold.sweep import build_job_configs
+from synth_scaffold.synth_scaffold import SynthReport, SynthScaffold, config_key
+
+
+def base_config(source: Path, output_dir: Path) -> dict:
+    return {
+        "input_source_files": [source],
+        "output_dir": output_dir,
+        "target_fn": "linear",
+        "includes": ['"linalg.h"'],
+        "template_args": {
+            "in_size": 8,
+            "out_size": 4,
+            "BLOCK_SIZE_IN_": 1,
+            "BLOCK_SIZE_OUT_": 1,
+            "T": "ap_fixed<32, 16>",
+        },
+    }
+
+
+def test_config_key(tmp_path: Path):
+    config = base_config(tmp_path / "linalg.h", tmp_path / "out")
+    respelled = {
+        "target_fn": "linear",
+        "template_args": {
+            "T": "ap_fixed< 32,16 >",
+            "BLOCK_SIZE_OUT_": "1",
+            "BLOCK_SIZE_IN_": 1,
+            "out_size": "4",
+            "in_size": "8",
+        },
+        "includes": [' "linalg.h" '],
+        "input_source_files": [str(tmp_path / "." / "linalg.h")],
+        "output_dir": str(tmp_path / "elsewhere"),
+        "clock_period": 5,
+        "part": "xczu9eg-ffvb1156-2-e",
+    }
+    assert config_key(config) == config_key(respelled)
+
+    for changed in [
+        {"template_args": {**config["template_args"], "in_size": 16}},
+        {"template_args": {**config["template_args"], "T": "ap_fixed<32,8>"}},
+        {"clock_period": 4.0},
+        {"defines": {"MSG": '"a  b"'}},
+    ]:
+        assert config_key({**config, **changed}) != config_key(config)
+    # whitespace inside string literals is kept
+    assert config_key({**config, "defines": {"MSG": '"a  b"'}}) != config_key(
+        {**config, "defines": {"MSG": '"a b"'}}
+    )
+
+    # points that spell the same config run once
+    job_configs = build_job_configs(config, {"in_size": [8, "8", 16]})
+    assert [c["template_args"]["in_size"] for c in job_configs] == [8, 16]
+
+
+def test_acquire(tmp_path: Path, make_report):
+    single_flight = SingleFlight(tmp_path / "flights")
+    report = make_report()
+
+    # nothing in flight: nothing is shared, even a report published earlier
+    flight = single_flight.acquire("k")
+    assert flight.shared_report is None
+    flight.publish(report)
+    flight.release()
+    flight = single_flight.acquire("k")
+    assert flight.shared_report is None
+
+    acquired = []
+
+    def wait_for_flight() -> None:
+        acquired.append(single_flight.acquire("k"))
+
+    waiters = [threading.Thread(target=wait_for_flight) for _ in range(2)]
+    for waiter in waiters:
+        waiter.start()
+    # the waiters block until the flight is released; a failed run is not
+    # shared and the first waiter runs the config itself
+    waiters[0].join(timeout=0.2)
+    assert not acquired
+    flight.publish(None)
+    flight.release()
+    while not acquired:
+        threading.Event().wait(0.01)
+    assert acquired[0].shared_report is None
+    acquired[0].publish(report)
+    acquired[0].release()
+    for waiter in waiters:
+        waiter.join()
+    assert acquired[1].shared_report == report
+    acquired[1].release()
+
+
+def test_concurrent_runs(
+    tmp_path: Path,
+    linalg_source: Path,
+    fake_tool: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("FAKE_VITIS_HLS_RUNTIME", "1")
+    single_flight = SingleFlight(tmp_path / "flights")
+    configs = []
+    for i, in_size in enumerate([8, "8", " 8 "]):
+        config = base_config(linalg_source, tmp_path / f"out_{i}")
+        config["template_args"] = {**config["template_args"], "in_size": in_size}
+        configs.append(config)
+    scaffolds = [
+        SynthScaffold.from_config(c, single_flight=single_flight) for c in configs
+    ]
+    for s in scaffolds:
+        s.generate()
+
+    reports: list[SynthReport | None] = [None] * len(scaffolds)
+
+    def run(i: int) -> None:
+        reports[i] = scaffolds[i].run()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(scaffolds))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # vitis_hls ran once and the other requesters took its report
+    ran = [s for s in scaffolds if s.last_run.returncode == 0]
+    assert len(ran) == 1
+    assert sum(s.last_run.shared_flight for s in scaffolds) == 2
+    assert reports[0] is not None
+    assert reports.count(reports[0]) == 3
+    assert (ran[0].output_dir / "csynth.log").exists()
+    assert sum((s.output_dir / "csynth.log").exists() for s in scaffolds) == 1
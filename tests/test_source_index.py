@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from synth_scaffold.source_index import SourceIndex
+from synth_scaffold.synth_scaffold import SynthScaffold, find_function_signature
+
+
+def test_index_matches_direct_search(tmp_path: Path, linalg_source: Path):
+    index = SourceIndex(tmp_path / "index.json")
+    for name in ["linear", "activation_relu"]:
+        indexed = index.lookup(name, [linalg_source])
+        direct = find_function_signature(
+            linalg_source.read_text(), name, linalg_source.resolve()
+        )
+        assert indexed == direct
+    assert index.lookup("acc", [linalg_source]) is None
+    assert index.lookup("missing_fn", [linalg_source]) is None
+
+
+def test_index_persists_and_invalidates(tmp_path: Path, linalg_source: Path):
+    index = SourceIndex(tmp_path / "index.json")
+    assert index.update([linalg_source]) == 1
+    assert index.update([linalg_source]) == 0
+
+    index = SourceIndex(tmp_path / "index.json")
+    assert index.update([linalg_source]) == 0
+
+    linalg_source.write_text(
+        linalg_source.read_text() + "\nint add_one(int x) { return x + 1; }\n"
+    )
+    assert index.update([linalg_source]) == 1
+    assert index.lookup("add_one", [linalg_source]) is not None
+
+
+def test_generate_with_index(tmp_path: Path, linalg_source: Path):
+    outputs = []
+    for source_index in [None, SourceIndex()]:
+        output_dir = tmp_path / f"run_{len(outputs)}"
+        s = SynthScaffold(
+            input_source_files=[linalg_source],
+            output_dir=output_dir,
+            target_fn="linear",
+            includes=['"linalg.h"'],
+            template_args={
+                "in_size": "64",
+                "out_size": "32",
+                "BLOCK_SIZE_IN_": 4,
+                "BLOCK_SIZE_OUT_": 2,
+                "T": "float",
+            },
+            source_index=source_index,
+        )
+        s.generate()
+        outputs.append((output_dir / "scaffold.cpp").read_text())
+    assert outputs[0] == outputs[1]
+    assert "linear<" in outputs[0]
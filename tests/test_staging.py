@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.parametrize("staging", ["copy", "symlink", "hardlink"])
+def test_staging_modes(
+    tmp_path: Path, linalg_source: Path, make_scaffold, staging: str
+):
+    output_dir = tmp_path / staging
+    make_scaffold(output_dir, staging=staging)
+
+    staged = output_dir / linalg_source.name
+    assert staged.read_bytes() == linalg_source.read_bytes()
+    assert staged.is_symlink() == (staging == "symlink")
+    if staging == "hardlink":
+        assert staged.stat().st_ino == linalg_source.stat().st_ino
+
+
+def test_staging_include(tmp_path: Path, linalg_source: Path, make_scaffold):
+    output_dir = tmp_path / "include"
+    make_scaffold(output_dir, staging="include")
+
+    assert not (output_dir / linalg_source.name).exists()
+    tcl_script_txt = (output_dir / "csynth.tcl").read_text()
+    assert f'-cflags "-I{linalg_source.resolve().parent}"' in tcl_script_txt
+
+
+def test_staging_unknown(tmp_path: Path, make_scaffold):
+    with pytest.raises(ValueError):
+        make_scaffold(tmp_path, staging="teleport")
+
+
+def test_staging_duplicate_names(tmp_path: Path, linalg_source: Path, make_scaffold):
+    other_source = tmp_path / "other" / linalg_source.name
+    other_source.parent.mkdir()
+    other_source.write_text("// another header of the same name\n")
+
+    # both would be staged as output_dir/linalg.h
+    for staging in ["copy", "symlink", "hardlink"]:
+        with pytest.raises(ValueError, match="same name"):
+            make_scaffold(
+                tmp_path / staging,
+                input_source_files=[linalg_source, other_source],
+                staging=staging,
+            )
+
+    # the same file listed twice, or files included from where they are,
+    # do not clash
+    make_scaffold(
+        tmp_path / "twice",
+        input_source_files=[linalg_source, linalg_source.parent / "." / "linalg.h"],
+    )
+    make_scaffold(
+        tmp_path / "include",
+        input_source_files=[linalg_source, other_source],
+        staging="include",
+    )
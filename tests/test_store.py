@@ -0,0 +1,147 @@
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.store import ResultStore
+from synth_scaffold.sweep import sweep
+from synth_scaffold.synth_scaffold import RunInfo, config_key
+from synth_scaffold.testing import write_report_dir
+
+
+def linear_config(block: int, data_type: str = "float") -> dict:
+    return {
+        "output_dir": f"/runs/{block}_{data_type}",
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "BLOCK": str(block), "T": data_type},
+        "defines": {},
+        "part": "xczu9eg-ffvb1156-2-e",
+        "clock_period": 5,
+        "unsafe_math": False,
+    }
+
+
+def linear_report(make_report, block: int):
+    return make_report(
+        latency_average_case=1000 // block, resources_lut_used=1000 * block
+    )
+
+
+def add_runs(db_fp: Path, runs: list) -> None:
+    store = ResultStore(db_fp)
+    for config, report in runs:
+        store.add(config, report, RunInfo(0, 1.0))
+
+
+def test_store_best_under_budget(tmp_path: Path, make_report):
+    store = ResultStore(tmp_path / "results.db")
+    for block in [1, 2, 4, 8, 16]:
+        store.add(
+            linear_config(block),
+            linear_report(make_report, block),
+            RunInfo(0, 60.0),
+            "2024.1",
+        )
+    store.add(linear_config(32), None, RunInfo(1, 5.0, timed_out="scheduling"))
+
+    best = store.best("linear", max_values={"resources_lut_used": 5000})
+    assert best is not None
+    assert best.report == linear_report(make_report, 4)
+    assert best.config["template_args"]["BLOCK"] == "4"
+    assert best.tool_version == "2024.1"
+    assert best.runtime_s == 60.0
+
+    assert store.best("linear", params={"BLOCK": 2}).report == linear_report(
+        make_report, 2
+    )
+    assert store.best("linear", params={"T": "double"}) is None
+    assert store.best("linear", params={"clock_period": 5}) is not None
+    assert store.best("other") is None
+
+    assert store.count() == 6
+    assert [r.status for r in store.query(status="timed_out")] == ["timed_out"]
+    with pytest.raises(ValueError, match="Unknown metric"):
+        store.query(order_by="id; DROP TABLE runs")
+
+
+def test_store_canonical_params(tmp_path: Path, make_report):
+    db_fp = tmp_path / "results.db"
+    store = ResultStore(db_fp)
+    store.add(linear_config(2, "ap_fixed<32, 16>"), linear_report(make_report, 2))
+
+    # any spelling of a parameter finds the run
+    for data_type in ["ap_fixed<32,16>", "ap_fixed< 32, 16 >"]:
+        assert len(store.query(params={"T": data_type, "BLOCK": 2})) == 1
+    assert len(store.query(params={"clock_period": "5.0"})) == 1
+    assert store.query(params={"T": "ap_fixed<32,8>"}) == []
+
+    # the config key is that of the canonical config
+    keys = store.connection().execute("SELECT config_key FROM runs").fetchall()
+    assert keys[0][0] == config_key(linear_config(2, "ap_fixed<32,16>"))
+
+
+def test_store_concurrent_writers(tmp_path: Path, make_report):
+    db_fp = tmp_path / "results.db"
+    ResultStore(db_fp)
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(
+                add_runs,
+                db_fp,
+                [
+                    (linear_config(block), linear_report(make_report, block))
+                    for block in range(i * 25 + 1, i * 25 + 26)
+                ],
+            )
+            for i in range(4)
+        ]
+        for future in futures:
+            future.result()
+    assert ResultStore(db_fp).count(status="ok") == 100
+
+
+def test_store_ingest(tmp_path: Path, make_report):
+    runs_dir = tmp_path / "runs"
+    for block in [1, 2]:
+        config = linear_config(block)
+        run_dir = runs_dir / f"run_{block}"
+        report_dir = run_dir / "synth_scaffold_project" / "solution_csynth" / "syn"
+        write_report_dir(report_dir / "report", linear_report(make_report, block))
+        (run_dir / "config.json").write_text(json.dumps(config))
+    write_report_dir(
+        runs_dir / "no_config" / "syn" / "report", linear_report(make_report, 4)
+    )
+
+    store = ResultStore(tmp_path / "results.db")
+    # a run a sweep already recorded
+    store.add(
+        {**linear_config(1), "output_dir": str(runs_dir / "run_1")},
+        linear_report(make_report, 1),
+    )
+    assert store.ingest(runs_dir, workers=1) == 1
+    # ingesting again adds nothing
+    assert store.ingest(runs_dir, workers=1) == 0
+    assert store.count() == 2
+    best = store.best("linear")
+    assert best.report == linear_report(make_report, 2)
+    assert best.tool_version == "2024.1"
+
+
+@pytest.mark.skipif(
+    shutil.which("vitis_hls") is not None, reason="expects vitis_hls to be missing"
+)
+def test_sweep_records_runs(tmp_path: Path, linalg_source: Path):
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "out_size": "32"},
+    }
+    store = ResultStore(tmp_path / "results.db")
+    results = list(sweep(base_config, {"BLOCK_SIZE_IN_": [1, 2]}, store=store))
+    assert len(results) == 2
+    assert store.count(status="failed") == 2
+    assert store.query(params={"BLOCK_SIZE_IN_": 2}, status="failed")
@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from synth_scaffold.surrogate import SurrogateModel
+
+
+def synthetic_results(make_report, points):
+    results = []
+    for block_in, block_out, data_type in points:
+        cost = 2.0 if data_type == "double" else 1.0
+        config = {
+            "target_fn": "linear",
+            "template_args": {
+                "in_size": "64",
+                "out_size": "32",
+                "BLOCK_SIZE_IN_": str(block_in),
+                "BLOCK_SIZE_OUT_": str(block_out),
+                "T": data_type,
+            },
+            "clock_period": 5,
+        }
+        latency = int(64 * 32 / (block_in * block_out) * cost) + 10
+        report = make_report(
+            latency_worst_case=latency,
+            latency_average_case=latency,
+            latency_best_case=latency,
+            resources_lut_used=int(400 * block_in * block_out * cost),
+            resources_ff_used=int(300 * block_in * block_out * cost),
+            resources_dsp_used=int(block_in * block_out * cost),
+            resources_bram_used=4,
+        )
+        results.append((config, report))
+    return results
+
+
+BLOCKS = [1, 2, 4, 8, 16]
+
+
+def test_surrogate_predicts_and_validates(make_report):
+    points = [(i, o, "float") for i in BLOCKS for o in BLOCKS]
+    points += [(i, i, "double") for i in BLOCKS]
+    results = synthetic_results(make_report, points)
+
+    model = SurrogateModel()
+    for stats in model.validate(results, holdout_fraction=0.2):
+        assert stats.n_test == 6
+        if stats.metric != "resources_bram_used":
+            assert stats.mean_abs_pct_error < 0.25
+
+    model.fit(results)
+    [unseen] = synthetic_results(make_report, [(2, 8, "double")])
+    [prediction] = model.predict([unseen[0]])
+    actual_lut = unseen[1].resources_lut_used
+    assert prediction["resources_lut_used"].lower <= actual_lut
+    assert prediction["resources_lut_used"].upper >= actual_lut
+    assert abs(prediction["resources_lut_used"].mean / actual_lut - 1) < 0.25
+
+    assert model.predict([{**unseen[0], "target_fn": "conv2d"}]) == [{}]
+
+
+def test_surrogate_partitions_dominated(make_report):
+    points = [(i, o, t) for i in BLOCKS for o in BLOCKS for t in ("float", "double")]
+    results = synthetic_results(make_report, points)
+    train = [r for r in results if r[0]["template_args"]["BLOCK_SIZE_IN_"] != "4"]
+    candidates = [c for c, _ in results if c["template_args"]["BLOCK_SIZE_IN_"] == "4"]
+
+    model = SurrogateModel().fit(train)
+    promising, dominated = model.partition(candidates)
+
+    assert len(promising) + len(dominated) == len(candidates)
+    assert dominated
+    assert all(c["template_args"]["T"] == "double" for c in dominated)
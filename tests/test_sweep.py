@@ -0,0 +1,204 @@
+import os
+import shutil
+import signal
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from synth_scaffold.store import ResultStore
+from synth_scaffold.sweep import (
+    apply_design_point,
+    build_job_configs,
+    expand_design_space,
+    sweep,
+)
+from synth_scaffold.synth_scaffold import REPORT_DIR_PATH, SynthReport, config_key
+
+
+class LockedStore(ResultStore):
+    def add(self, *args: Any, **kwargs: Any) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+
+class UnpicklableStore(ResultStore):
+    def __getstate__(self) -> dict[str, Any]:
+        raise RuntimeError("cannot be sent to a worker")
+
+
+class KillingStore(ResultStore):
+    """
+    Kills its worker process while storing a run of `BLOCK_SIZE_IN_=2`, as
+    the OOM killer would, on its first `kills` attempts. The kill waits for
+    the run of `BLOCK_SIZE_IN_=1` to start, which is held back for a moment
+    on its first attempt so that it is still running when that happens.
+    Attempts are counted in files next to the database.
+    """
+
+    kills = 0
+
+    def add(self, config: dict[str, Any], *args: Any, **kwargs: Any) -> int:
+        block_size = config["template_args"]["BLOCK_SIZE_IN_"]
+        attempts_dir = self.db_fp.parent / "attempts"
+        attempts_dir.mkdir(exist_ok=True)
+        attempt = len(list(attempts_dir.glob(f"{block_size}_*"))) + 1
+        (attempts_dir / f"{block_size}_{attempt}").touch()
+        if block_size == 2 and attempt <= self.kills:
+            deadline = time.time() + 10
+            while not (attempts_dir / "1_1").exists() and time.time() < deadline:
+                time.sleep(0.01)
+            os.kill(os.getpid(), signal.SIGKILL)
+        if block_size != 2 and attempt == 1:
+            time.sleep(1)
+        return super().add(config, *args, **kwargs)
+
+
+class OomOnceStore(KillingStore):
+    kills = 1
+
+
+class OomAlwaysStore(KillingStore):
+    kills = 100
+
+
+def test_expand_design_space():
+    points = expand_design_space(
+        {"BLOCK_SIZE_IN_": [1, 2], "T": ["float", "ap_fixed<32, 16>"]}
+    )
+    assert len(points) == 4
+    assert {"BLOCK_SIZE_IN_": 2, "T": "float"} in points
+
+    points = expand_design_space([{"T": "float"}, {"T": "float"}, {"T": "int"}])
+    assert points == [{"T": "float"}, {"T": "int"}]
+
+
+def test_apply_design_point():
+    base_config = {"template_args": {"in_size": "64"}, "clock_period": 5}
+    config = apply_design_point(
+        base_config, {"T": "float", "defines.N": "4", "clock_period": 3.3}
+    )
+    assert config["template_args"] == {"in_size": "64", "T": "float"}
+    assert config["defines"] == {"N": "4"}
+    assert config["clock_period"] == 3.3
+    assert base_config["template_args"] == {"in_size": "64"}
+
+
+def test_sweep(tmp_path: Path, linalg_source: Path, fake_tool: Path):
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {
+            "in_size": "64",
+            "out_size": "32",
+            "BLOCK_SIZE_OUT_": 1,
+            "T": "float",
+        },
+    }
+    design_space = {"BLOCK_SIZE_IN_": [1, 2], "clock_period": [5.0, 4.0]}
+
+    results = list(sweep(base_config, design_space, max_workers=2))
+    assert len(results) == 4
+    assert {
+        (c["template_args"]["BLOCK_SIZE_IN_"], c["clock_period"]) for c, _ in results
+    } == {(1, 5.0), (1, 4.0), (2, 5.0), (2, 4.0)}
+    for config, report in results:
+        output_dir = Path(config["output_dir"])
+        assert output_dir == tmp_path / "runs" / config_key(config)
+        assert not (output_dir / "sweep_error.txt").exists()
+        assert report is not None
+        assert report.module_name == "linear"
+        assert report.target_clock_period == config["clock_period"]
+        assert report == SynthReport.from_report_dir(output_dir / REPORT_DIR_PATH)
+
+
+@pytest.mark.skipif(
+    shutil.which("vitis_hls") is not None, reason="expects vitis_hls to be missing"
+)
+def test_sweep_isolates_and_survives_failures(tmp_path: Path, linalg_source: Path):
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "out_size": "32"},
+    }
+    design_space = {"BLOCK_SIZE_IN_": [1, 2], "BLOCK_SIZE_OUT_": [1], "T": ["float"]}
+
+    job_configs = build_job_configs(base_config, design_space)
+    assert len({c["output_dir"] for c in job_configs}) == 2
+
+    # no vitis_hls on the test machine, so every job fails, but all are reported
+    results = list(sweep(base_config, design_space, max_workers=2))
+    assert len(results) == 2
+    for config, report in results:
+        assert report is None
+        assert (Path(config["output_dir"]) / "scaffold.cpp").exists()
+        assert (Path(config["output_dir"]) / "sweep_error.txt").exists()
+
+
+@pytest.mark.skipif(
+    shutil.which("vitis_hls") is not None, reason="expects vitis_hls to be missing"
+)
+def test_sweep_survives_worker_errors(tmp_path: Path, linalg_source: Path):
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "output_dir": tmp_path / "runs",
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "out_size": "32", "BLOCK_SIZE_OUT_": 1},
+    }
+    design_space = {"BLOCK_SIZE_IN_": [1, 2], "T": ["float"]}
+
+    # errors after the run and errors of the worker itself fail only the job
+    for store_cls, error in [
+        (LockedStore, "database is locked"),
+        (UnpicklableStore, "cannot be sent to a worker"),
+    ]:
+        store = store_cls(tmp_path / f"{store_cls.__name__}.db")
+        config = {**base_config, "output_dir": tmp_path / store_cls.__name__}
+        results = list(sweep(config, design_space, max_workers=2, store=store))
+        assert len(results) == 2
+        for config, report in results:
+            assert report is None
+            error_txt = (Path(config["output_dir"]) / "sweep_error.txt").read_text()
+            assert error in error_txt
+
+
+def test_sweep_worker_oom(tmp_path: Path, linalg_source: Path, fake_tool: Path):
+    base_config = {
+        "input_source_files": [linalg_source],
+        "includes": ['"linalg.h"'],
+        "target_fn": "linear",
+        "template_args": {"in_size": "64", "out_size": "32", "BLOCK_SIZE_OUT_": 1},
+    }
+    design_space = {"BLOCK_SIZE_IN_": [1, 2], "T": ["float"]}
+
+    # a killed worker takes the job running beside it down too; both run
+    # again without using up an OOM retry
+    store = OomOnceStore(tmp_path / "once" / "runs.db")
+    config = {**base_config, "output_dir": tmp_path / "once" / "runs"}
+    results = list(
+        sweep(config, design_space, max_workers=2, store=store, max_oom_retries=0)
+    )
+    assert len(results) == 2
+    assert all(report is not None for _, report in results)
+    attempts = sorted(fp.name for fp in (tmp_path / "once" / "attempts").iterdir())
+    assert attempts == ["1_1", "1_2", "2_1", "2_2"]
+    assert len(store.query()) == 2
+
+    # a job that was killed while running alone is the one at fault and
+    # fails once it is out of retries
+    store = OomAlwaysStore(tmp_path / "always" / "runs.db")
+    config = {**base_config, "output_dir": tmp_path / "always" / "runs"}
+    results = list(
+        sweep(config, design_space, max_workers=1, store=store, max_oom_retries=1)
+    )
+    reports = {c["template_args"]["BLOCK_SIZE_IN_"]: r for c, r in results}
+    assert reports[1] is not None
+    assert reports[2] is None
+    attempts = sorted(fp.name for fp in (tmp_path / "always" / "attempts").iterdir())
+    assert attempts == ["1_1", "2_1", "2_2"]
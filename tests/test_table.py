@@ -0,0 +1,96 @@
+import csv
+import math
+from pathlib import Path
+
+import pytest
+
+from synth_scaffold.table import ReportTable
+
+
+def results(make_report):
+    return [
+        (
+            {"target_fn": "linear", "template_args": {"BLOCK": 1, "T": "float"}},
+            make_report(latency_average_case=100, resources_lut_used=1000),
+        ),
+        (
+            {"target_fn": "linear", "template_args": {"BLOCK": 2, "T": "float"}},
+            None,
+        ),
+        (
+            {
+                "target_fn": "linear",
+                "template_args": {"BLOCK": 2.5, "T": "double"},
+                "defines": {"UNROLL": 1},
+            },
+            make_report(latency_average_case=50, resources_lut_used=2000),
+        ),
+    ]
+
+
+def test_table_rows(make_report):
+    table = ReportTable.from_results(results(make_report))
+    assert len(table) == 2
+    assert table.n_failed == 1
+    assert table.report(0) == make_report(
+        latency_average_case=100, resources_lut_used=1000
+    )
+
+    # an int column widens to float, a column that appears late is missing
+    # in earlier rows
+    assert table.params["BLOCK"].values.typecode == "d"
+    assert table.row(0)["BLOCK"] == 1.0
+    assert table.row(0)["defines.UNROLL"] is None
+    assert table.row(1)["defines.UNROLL"] == 1
+    assert table.row(1)["resources_lut_used"] == 2000
+
+
+def test_table_rejects_field_names(make_report):
+    table = ReportTable()
+    with pytest.raises(ValueError, match="part"):
+        table.append({"target_fn": "f", "template_args": {"part": 1}}, make_report())
+
+
+def test_table_csv(tmp_path: Path, make_report):
+    table = ReportTable.from_results(results(make_report))
+    table.to_csv(tmp_path / "results.csv")
+    with open(tmp_path / "results.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["T"] for row in rows] == ["float", "double"]
+    assert rows[0]["defines.UNROLL"] == ""
+    assert float(rows[1]["latency_t_computed_average_case"]) == pytest.approx(
+        make_report(latency_average_case=50).latency_t_computed_average_case
+    )
+    assert rows[0]["resources_uram_utilization"] == ""
+
+
+def test_table_numpy(make_report):
+    np = pytest.importorskip("numpy")
+    table = ReportTable.from_results(results(make_report))
+
+    lut = table.column("resources_lut_used")
+    assert lut.dtype == np.int64
+    assert lut.tolist() == [1000, 2000]
+    # numeric columns are views of the table, not copies
+    assert not lut.flags.owndata
+
+    columns = table.to_numpy()
+    for i in range(len(table)):
+        report = table.report(i)
+        assert columns["latency_t_computed_average_case"][i] == pytest.approx(
+            report.latency_t_computed_average_case
+        )
+        assert columns["resources_lut_utilization"][i] == pytest.approx(
+            report.resources_lut_utilization
+        )
+        assert math.isnan(columns["resources_uram_utilization"][i])
+    assert columns["T"].tolist() == ["float", "double"]
+
+
+def test_table_parquet(tmp_path: Path, make_report):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = ReportTable.from_results(results(make_report))
+    table.to_parquet(tmp_path / "results.parquet")
+    data = pq.read_table(tmp_path / "results.parquet").to_pydict()
+    assert data["resources_lut_used"] == [1000, 2000]
+    assert data["T"] == ["float", "double"]
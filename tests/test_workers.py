@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from synth_scaffold.monitor import RUN_TIMEOUT
+from synth_scaffold.synth_scaffold import SynthReport
+from synth_scaffold.workers import HlsWorkerPool
+
+# answers every job marker as soon as the job's TCL arrives; a job with a
+# 1.0 ns clock makes the tool crash and one with a 6.0 ns clock makes it hang
+FAKE_VITIS_HLS = """#!/bin/sh
+test "$1" = -i || exit 2
+echo "$$" >> ../pids
+while IFS= read -r line; do
+    case "$line" in
+        *"-period 1.0 "*) exit 139 ;;
+        *"-period 6.0 "*) sleep 600 ;;
+        *'puts "SYNTH_SCAFFOLD_BATCH '*)
+            i=${line#*SYNTH_SCAFFOLD_BATCH }
+            echo "vitis_hls> SYNTH_SCAFFOLD_BATCH ${i%% *} ok 7" ;;
+        exit) exit 0 ;;
+        *) echo "INFO: $line" ;;
+    esac
+done
+"""
+
+
+def test_worker_pool(tmp_path: Path, make_scaffold, install_fake_vitis_hls):
+    install_fake_vitis_hls(FAKE_VITIS_HLS)
+    work_dir = tmp_path / "workers"
+    clock_periods = [5.0, 4.0, 3.0, 1.0, 2.0]
+    scaffolds = [
+        make_scaffold(tmp_path / f"run_{c}", clock_period=c) for c in clock_periods
+    ]
+
+    with HlsWorkerPool(1, work_dir, max_jobs_per_worker=2) as pool:
+        reports = pool.map(scaffolds)
+        [stats] = pool.stats()
+
+    assert reports == [None] * len(scaffolds)
+    assert [s.last_run.returncode for s in scaffolds] == [0, 0, 0, 139, 0]
+    assert scaffolds[0].last_run.runtime_s == 0.007
+    assert "csynth_design" in (scaffolds[0].output_dir / "csynth.log").read_text()
+
+    assert stats.jobs_done == 4
+    assert stats.jobs_failed == 1
+    assert stats.crashes == 1
+    assert stats.restarts == 1
+    # started once, restarted after two jobs, and started again after the crash
+    assert len((work_dir / "pids").read_text().split()) == 3
+
+
+def test_worker_timeout(tmp_path: Path, make_scaffold, install_fake_vitis_hls):
+    install_fake_vitis_hls(FAKE_VITIS_HLS)
+    work_dir = tmp_path / "workers"
+    clock_periods = [5.0, 6.0, 4.0]
+    scaffolds = [
+        make_scaffold(tmp_path / f"run_{c}", clock_period=c) for c in clock_periods
+    ]
+
+    with HlsWorkerPool(1, work_dir, timeout_s=1.0) as pool:
+        reports = pool.map(scaffolds)
+        [stats] = pool.stats()
+
+    assert reports == [None] * len(scaffolds)
+    assert [s.last_run.returncode for s in scaffolds] == [0, -9, 0]
+    assert [s.last_run.timed_out for s in scaffolds] == [None, RUN_TIMEOUT, None]
+    assert 1.0 <= scaffolds[1].last_run.runtime_s < 10.0
+    assert stats.timeouts == 1
+    assert stats.crashes == 0
+    assert stats.jobs_failed == 1
+    # the hung tool was killed and the next job started a fresh one
+    assert len((work_dir / "pids").read_text().split()) == 2
+
+
+def test_worker_pool_in_scratch_dir(tmp_path: Path, make_scaffold, fake_tool: Path):
+    s = make_scaffold(tmp_path / "run", scratch_dir=tmp_path / "scratch")
+
+    with HlsWorkerPool(1, tmp_path / "workers") as pool:
+        [report] = pool.map([s])
+
+    assert report is not None
+    assert report == SynthReport.from_report_dir(s.report_dir)
+    assert list((tmp_path / "scratch").iterdir()) == []